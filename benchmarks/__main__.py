@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import json
+from functools import partial
+from pathlib import Path
+
+from benchmarks.drivers import (
+    DRIVERS,
+    gunicorn_client,
+    inprocess_client,
+    uvicorn_client,
+)
+from benchmarks.micro import run_micro
+from benchmarks.scenarios import SCENARIOS, Context
+from benchmarks.utils import (
+    create_database,
+    run_load,
+    seed_users,
+    write_results,
+)
+
+
+async def run_scenarios(client, context: Context, concurrency: int):
+    results = {}
+
+    for name, scenario in SCENARIOS.items():
+        results[name] = await run_load(
+            partial(scenario, client, context), context.requests, concurrency
+        )
+        print(f'  {name:<14} {results[name]}')
+
+    return results
+
+
+async def run_driver(driver: str, args):
+    engine = create_database(args.database)
+    seed_users(engine, args.users)
+    context = Context(users=args.users, requests=args.requests)
+
+    if driver == 'uvicorn':
+        connect = uvicorn_client(args.database, args.port, args.workers)
+    elif driver == 'gunicorn':
+        connect = gunicorn_client(args.database, args.port, args.workers)
+    else:
+        connect = inprocess_client(engine)
+
+    async with connect as client:
+        return await run_scenarios(client, context, args.concurrency)
+
+
+def run(args):
+    if args.users < 2 * args.requests:
+        raise SystemExit('--users must be at least twice --requests')
+
+    drivers = DRIVERS if args.driver == 'all' else (args.driver,)
+    results = {}
+
+    for driver in drivers:
+        print(driver)
+        results[driver] = asyncio.run(run_driver(driver, args))
+
+    write_results(
+        args.output,
+        'endpoints',
+        {
+            'parameters': {
+                'users': args.users,
+                'requests': args.requests,
+                'concurrency': args.concurrency,
+                'workers': args.workers,
+            },
+            'results': results,
+        },
+    )
+
+
+def micro(args):
+    results = run_micro(args.number, args.page_size)
+
+    for name, summary in results.items():
+        print(f'{name:<28} {summary}')
+
+    write_results(args.output, 'micro', {'results': results})
+
+
+def compare(args):
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+    candidate = json.loads(args.candidate.read_text(encoding='utf-8'))
+
+    def flatten(results, prefix=''):
+        for key, value in results.items():
+            if isinstance(value, dict) and not any(
+                isinstance(item, (int, float)) for item in value.values()
+            ):
+                yield from flatten(value, f'{prefix}{key}.')
+            else:
+                yield f'{prefix}{key}', value
+
+    before = dict(flatten(baseline['results']))
+
+    for name, summary in flatten(candidate['results']):
+        if name not in before:
+            continue
+
+        deltas = ', '.join(
+            f'{metric} {before[name][metric]} -> {value} '
+            f'({(value - before[name][metric]) / before[name][metric]:+.1%})'
+            for metric, value in summary.items()
+            if before[name].get(metric)
+        )
+        print(f'{name}: {deltas}')
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    commands = parser.add_subparsers(required=True)
+
+    run_parser = commands.add_parser('run', help='load-test every endpoint')
+    run_parser.add_argument('--users', type=int, default=2_000)
+    run_parser.add_argument('--requests', type=int, default=200)
+    run_parser.add_argument('--concurrency', type=int, default=16)
+    run_parser.add_argument(
+        '--driver', choices=(*DRIVERS, 'all'), default='inprocess'
+    )
+    run_parser.add_argument('--port', type=int, default=8765)
+    run_parser.add_argument('--workers', type=int, default=1)
+    run_parser.add_argument(
+        '--database', type=Path, default=Path('bench_endpoints.db')
+    )
+    run_parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/endpoints.json')
+    )
+    run_parser.set_defaults(command=run)
+
+    micro_parser = commands.add_parser('micro', help='run micro-benchmarks')
+    micro_parser.add_argument('--number', type=int, default=10_000)
+    micro_parser.add_argument('--page-size', type=int, default=1000)
+    micro_parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/micro.json')
+    )
+    micro_parser.set_defaults(command=micro)
+
+    compare_parser = commands.add_parser(
+        'compare', help='compare two result files'
+    )
+    compare_parser.add_argument('baseline', type=Path)
+    compare_parser.add_argument('candidate', type=Path)
+    compare_parser.set_defaults(command=compare)
+
+    args = parser.parse_args()
+    args.command(args)
+
+
+if __name__ == '__main__':
+    main()
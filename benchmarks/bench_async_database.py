@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+
+from benchmarks.utils import (
+    create_database,
+    random_user_id,
+    run_load,
+    seed_users,
+    session_overrides,
+    write_results,
+)
+from fast_api_todo.database import get_async_session, get_session
+from fast_api_todo.routers import async_auth, async_users, auth, users
+
+
+def build_app(engine, mode: str):
+    get_session_override, get_async_session_override = session_overrides(
+        engine
+    )
+
+    app = FastAPI()
+
+    if mode == 'async':
+        app.include_router(async_users.router)
+        app.include_router(async_auth.router)
+    else:
+        app.include_router(users.router)
+        app.include_router(auth.router)
+
+    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_async_session] = get_async_session_override
+
+    return app
+
+
+async def bench_mode(engine, mode, args):
+    transport = httpx.ASGITransport(app=build_app(engine, mode))
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://bench'
+    ) as client:
+        get_user = await run_load(
+            lambda _: client.get(f'/users/{random_user_id(args.users)}'),
+            args.requests,
+            args.concurrency,
+        )
+        list_users = await run_load(
+            lambda _: client.get('/users/', params={'limit': 50}),
+            args.requests,
+            args.concurrency,
+        )
+
+    return {'get_user': get_user, 'list_users': list_users}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare sync and async route throughput on SQLite.'
+    )
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--requests', type=int, default=2_000)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument(
+        '--database', type=Path, default=Path('bench_async.db')
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/async.json')
+    )
+    args = parser.parse_args()
+
+    seed_users(create_database(args.database), args.users)
+    engine = create_engine(f'sqlite:///{args.database}', pool_size=40)
+
+    results = {
+        mode: asyncio.run(bench_mode(engine, mode, args))
+        for mode in ('sync', 'async')
+    }
+
+    for mode, routes in results.items():
+        for route, summary in routes.items():
+            print(f'{mode:>5} {route:<11} {summary}')
+
+    write_results(args.output, 'async_database', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+import argparse
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+from zoneinfo import ZoneInfo
+
+from benchmarks.utils import (
+    create_database,
+    seed_users,
+    session_overrides,
+    summarize,
+    write_results,
+)
+from fast_api_todo.app import app
+from fast_api_todo.database import get_read_session, get_session
+from fast_api_todo.models import RevokedToken
+from fast_api_todo.security import (
+    create_access_token,
+    principal_cache,
+    revocations,
+)
+
+
+def seed_revocations(engine, count: int, batch_size: int = 10_000):
+    expires_at = datetime.now(tz=ZoneInfo('UTC')) + timedelta(days=1)
+
+    with Session(engine) as session:
+        for start in range(0, count, batch_size):
+            session.execute(
+                insert(RevokedToken),
+                [
+                    {'jti': uuid4().hex, 'expires_at': expires_at}
+                    for _ in range(min(batch_size, count - start))
+                ],
+            )
+            session.commit()
+
+
+def measure(client, engine, tokens: list[str]):
+    latencies = []
+    statements = 0
+
+    def count_statement(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, 'before_cursor_execute', count_statement)
+
+    for token in tokens:
+        start = time.perf_counter()
+        client.get(
+            '/todos/',
+            headers={'Authorization': f'Bearer {token}'},
+            params={'limit': 1},
+        ).raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+    event.remove(engine, 'before_cursor_execute', count_statement)
+    summary = summarize(latencies, sum(latencies))
+    summary['statements_per_request'] = round(statements / len(tokens), 3)
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure the authenticated request path with revocation.'
+    )
+    parser.add_argument('--users', type=int, default=1_000)
+    parser.add_argument('--revoked', type=int, default=50_000)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--database', type=Path, default=Path('bench_auth.db'))
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/auth.json')
+    )
+    args = parser.parse_args()
+
+    engine = create_database(args.database)
+    seed_users(engine, args.users)
+    seed_revocations(engine, args.revoked)
+
+    get_session_override = session_overrides(engine)[0]
+    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_read_session] = get_session_override
+    cached_token = create_access_token({'sub': 'bench0@bench.com'})
+    might_contain = revocations.might_contain
+    results = {}
+
+    with TestClient(app) as client:
+        for mode in ('bloom', 'db_lookup'):
+            if mode == 'db_lookup':
+                revocations.might_contain = lambda jti: True
+
+            principal_cache.clear()
+            revocations.clear()
+            measure(client, engine, [cached_token])
+            fresh_tokens = [
+                create_access_token({
+                    'sub': f'bench{index % args.users}@bench.com'
+                })
+                for index in range(args.requests)
+            ]
+
+            results[mode] = {
+                'cache_hit': measure(
+                    client, engine, [cached_token] * args.requests
+                ),
+                'cache_miss': measure(client, engine, fresh_tokens),
+            }
+
+            for path, summary in results[mode].items():
+                print(f'{mode:<10} {path:<10} {summary}')
+
+    revocations.might_contain = might_contain
+    app.dependency_overrides.clear()
+    write_results(
+        args.output, 'auth', {'revoked': args.revoked, 'results': results}
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from benchmarks.utils import create_database, write_results
+from fast_api_todo.app import app
+from fast_api_todo.database import get_session
+from fast_api_todo.security import create_access_token
+
+
+def new_user(prefix: str, n: int):
+    return {
+        'username': f'{prefix}{n}',
+        'email': f'{prefix}{n}@bench.com',
+        'password': f'{prefix}{n}-password',
+    }
+
+
+def bench_single(client, count: int):
+    start = time.perf_counter()
+
+    for n in range(count):
+        client.post('/users/', json=new_user('single', n)).raise_for_status()
+
+    return time.perf_counter() - start
+
+
+def bench_bulk(client, count: int):
+    body = '\n'.join(json.dumps(new_user('bulk', n)) for n in range(count))
+
+    # The single signups run first, so their first user can import.
+    token = create_access_token({'sub': new_user('single', 0)['email']})
+
+    start = time.perf_counter()
+    response = client.post(
+        '/users/bulk',
+        content=body,
+        headers={'Authorization': f'Bearer {token}'},
+    )
+    response.raise_for_status()
+    elapsed = time.perf_counter() - start
+
+    assert response.json()['created'] == count
+
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare single-user signups with the bulk import.'
+    )
+    parser.add_argument('--users', type=int, default=1_000)
+    parser.add_argument(
+        '--database', type=Path, default=Path('bench_bulk_import.db')
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/bulk_import.json')
+    )
+    args = parser.parse_args()
+
+    engine = create_database(args.database)
+
+    def get_session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+
+    with TestClient(app) as client:
+        elapsed = {
+            'single': bench_single(client, args.users),
+            'bulk': bench_bulk(client, args.users),
+        }
+
+    app.dependency_overrides.clear()
+
+    results = {
+        mode: {
+            'users': args.users,
+            'seconds': round(seconds, 3),
+            'users_per_second': round(args.users / seconds, 2),
+        }
+        for mode, seconds in elapsed.items()
+    }
+
+    for mode, summary in results.items():
+        print(f'{mode:<6} {summary}')
+
+    write_results(args.output, 'bulk_import', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import asyncio
+import resource
+import time
+from pathlib import Path
+
+from sqlalchemy.orm import Session
+
+from benchmarks.utils import create_database, seed_users, write_results
+from fast_api_todo.export import ExportFormat
+from fast_api_todo.routers.users import export_users
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def consume(response):
+    total = 0
+
+    async for chunk in response.body_iterator:
+        total += len(chunk)
+
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Stream a users export and track peak RSS.'
+    )
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument(
+        '--format', type=ExportFormat, default=ExportFormat.ndjson
+    )
+    parser.add_argument(
+        '--database', type=Path, default=Path('bench_export.db')
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/export.json')
+    )
+    args = parser.parse_args()
+
+    engine = create_database(args.database)
+    seed_users(engine, args.users)
+    rss_before = max_rss_mb()
+
+    with Session(engine) as session:
+        start = time.perf_counter()
+        size = asyncio.run(consume(export_users(session, args.format)))
+        elapsed = time.perf_counter() - start
+
+    results = {
+        'rows': args.users,
+        'format': args.format.value,
+        'bytes': size,
+        'seconds': round(elapsed, 3),
+        'rows_per_second': round(args.users / elapsed, 2),
+        'max_rss_before_mb': round(rss_before, 1),
+        'max_rss_after_mb': round(max_rss_mb(), 1),
+    }
+    print(results)
+
+    write_results(args.output, 'export', results)
+
+
+if __name__ == '__main__':
+    main()
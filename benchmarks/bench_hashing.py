@@ -0,0 +1,60 @@
+import argparse
+import asyncio
+import os
+import time
+from pathlib import Path
+
+from benchmarks.utils import BENCHMARK_PASSWORD, summarize, write_results
+from fast_api_todo.hashing import (
+    PasswordHashingExecutor,
+    check_password,
+    hash_password,
+)
+
+
+async def bench_workers(workers: int, hashed: str, logins: int):
+    executor = PasswordHashingExecutor(workers=workers, max_pending=logins)
+    latencies = []
+
+    async def login():
+        start = time.perf_counter()
+        await executor.run_async(check_password, BENCHMARK_PASSWORD, hashed)
+        latencies.append(time.perf_counter() - start)
+
+    try:
+        await executor.run_async(check_password, BENCHMARK_PASSWORD, hashed)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+    finally:
+        executor.shutdown()
+
+    return summarize(latencies, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure login (Argon2 verify) throughput per worker.'
+    )
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/hashing.json')
+    )
+    args = parser.parse_args()
+
+    hashed = hash_password(BENCHMARK_PASSWORD)
+    results = {}
+
+    for workers in range(0, args.max_workers + 1):
+        results[workers] = asyncio.run(
+            bench_workers(workers, hashed, args.logins)
+        )
+        print(f'workers={workers:<3} {results[workers]}')
+
+    write_results(args.output, 'hashing', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import argparse
+from pathlib import Path
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+)
+from jwt import encode
+
+from benchmarks.micro import measure
+from benchmarks.utils import write_results
+from fast_api_todo.keys import Key, Keyring, load_key
+
+PAYLOAD = {'sub': 'bench0@bench.com', 'exp': 4_102_444_800}
+
+
+def private_keys():
+    return {
+        'RS256': rsa.generate_private_key(
+            public_exponent=65537, key_size=2048
+        ),
+        'ES256': ec.generate_private_key(ec.SECP256R1()),
+        'EdDSA': ed25519.Ed25519PrivateKey.generate(),
+    }
+
+
+def keyrings():
+    secret = 'bench-secret-key-with-at-least-32-bytes'
+    rings = {'HS256': (Keyring([Key(None, 'HS256', secret, secret)]), None)}
+
+    for algorithm, private_key in private_keys().items():
+        pem = private_key.private_bytes(
+            Encoding.PEM, PrivateFormat.PKCS8, NoEncryption()
+        ).decode()
+        rings[algorithm] = (
+            Keyring([load_key(algorithm, pem)], signing_kid=algorithm),
+            pem,
+        )
+
+    return rings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure JWT sign and verify cost per algorithm.'
+    )
+    parser.add_argument('--number', type=int, default=1000)
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/jwt.json')
+    )
+    args = parser.parse_args()
+    results = {}
+
+    for algorithm, (keyring, pem) in keyrings().items():
+        token = keyring.encode(PAYLOAD)
+        results[algorithm] = {
+            'sign': measure(lambda: keyring.encode(PAYLOAD), args.number),
+            'verify': measure(lambda: keyring.decode(token), args.number),
+        }
+
+        if pem is not None:
+            # Signing with the PEM string re-parses the key on every call.
+            results[algorithm]['sign_pem'] = measure(
+                lambda: encode(PAYLOAD, pem, algorithm=algorithm),
+                args.number // 10 or 1,
+            )
+
+        for operation, summary in results[algorithm].items():
+            print(f'{algorithm:<6} {operation:<18} {summary}')
+
+    write_results(args.output, 'jwt', results)
+
+
+if __name__ == '__main__':
+    main()
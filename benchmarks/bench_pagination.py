@@ -0,0 +1,81 @@
+import argparse
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from benchmarks.utils import (
+    create_database,
+    seed_users,
+    summarize,
+    write_results,
+)
+from fast_api_todo.app import app
+from fast_api_todo.database import get_session
+from fast_api_todo.pagination import encode_cursor
+
+
+def measure(client, params: dict, repeat: int):
+    latencies = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get('/users/', params=params).raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+    return summarize(latencies, sum(latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare offset and keyset page latency on deep pages.'
+    )
+    parser.add_argument('--users', type=int, default=1_000_000)
+    parser.add_argument(
+        '--offsets', type=int, nargs='+', default=[10_000, 100_000, 999_900]
+    )
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument(
+        '--database', type=Path, default=Path('bench_pagination.db')
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/pagination.json')
+    )
+    args = parser.parse_args()
+
+    engine = create_database(args.database)
+    seed_users(engine, args.users)
+
+    def get_session_override():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = get_session_override
+    results = {}
+
+    with TestClient(app) as client:
+        for offset in args.offsets:
+            results[offset] = {
+                'offset': measure(
+                    client,
+                    {'limit': args.limit, 'offset': offset},
+                    args.repeat,
+                ),
+                'cursor': measure(
+                    client,
+                    {'limit': args.limit, 'cursor': encode_cursor(offset)},
+                    args.repeat,
+                ),
+            }
+
+            for mode, summary in results[offset].items():
+                print(f'offset={offset:<8} {mode:<6} {summary}')
+
+    app.dependency_overrides.clear()
+    write_results(args.output, 'pagination', results)
+
+
+if __name__ == '__main__':
+    main()
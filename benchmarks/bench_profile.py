@@ -0,0 +1,78 @@
+import argparse
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from benchmarks.utils import (
+    BENCHMARK_PASSWORD,
+    create_database,
+    seed_users,
+    session_overrides,
+    summarize,
+    write_results,
+)
+from fast_api_todo.app import app
+from fast_api_todo.database import get_read_session, get_session
+from fast_api_todo.security import create_access_token
+
+
+def measure(client, method: str, requests: int, password: bool):
+    latencies = []
+
+    for n in range(requests):
+        user_id = n + 1
+        body = {'username': f'edited{n}', 'email': f'bench{n}@bench.com'}
+
+        if password or method == 'put':
+            body['password'] = BENCHMARK_PASSWORD
+
+        token = create_access_token({'sub': f'bench{n}@bench.com'})
+        start = time.perf_counter()
+        client.request(
+            method,
+            f'/users/{user_id}',
+            headers={'Authorization': f'Bearer {token}'},
+            json=body,
+        ).raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+    return summarize(latencies, sum(latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure profile edit latency for PUT and PATCH.'
+    )
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument(
+        '--database', type=Path, default=Path('bench_profile.db')
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/profile.json')
+    )
+    args = parser.parse_args()
+    results = {}
+
+    for name, method, password in (
+        ('put', 'put', True),
+        ('patch_profile', 'patch', False),
+        ('patch_password', 'patch', True),
+    ):
+        engine = create_database(args.database)
+        seed_users(engine, args.requests)
+        get_session_override = session_overrides(engine)[0]
+        app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_read_session] = get_session_override
+
+        with TestClient(app) as client:
+            results[name] = measure(client, method, args.requests, password)
+
+        print(f'{name:<15} {results[name]}')
+
+    app.dependency_overrides.clear()
+    write_results(args.output, 'profile', results)
+
+
+if __name__ == '__main__':
+    main()
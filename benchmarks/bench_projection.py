@@ -0,0 +1,97 @@
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only, undefer
+
+from benchmarks.utils import (
+    create_database,
+    seed_users,
+    summarize,
+    write_results,
+)
+from fast_api_todo.models import User
+
+QUERIES = {
+    'entities': lambda limit: (
+        select(User).options(undefer(User.password)).limit(limit)
+    ),
+    'load_only': lambda limit: (
+        select(User)
+        .options(load_only(User.id, User.username, User.email))
+        .limit(limit)
+    ),
+    'columns': lambda limit: select(User.id, User.username, User.email).limit(
+        limit
+    ),
+}
+
+
+def fetch(engine, query):
+    with Session(engine) as session:
+        return session.execute(query).all()
+
+
+def peak_memory(engine, query):
+    tracemalloc.start()
+
+    try:
+        rows = fetch(engine, query)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del rows
+
+    return round(peak / 1024, 1)
+
+
+def measure(engine, query, repeat: int):
+    latencies = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fetch(engine, query)
+        latencies.append(time.perf_counter() - start)
+
+    return summarize(latencies, sum(latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare full entity loads with projected user queries.'
+    )
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument(
+        '--limits', type=int, nargs='+', default=[100, 1_000, 10_000]
+    )
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument(
+        '--database', type=Path, default=Path('bench_projection.db')
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/projection.json')
+    )
+    args = parser.parse_args()
+
+    engine = create_database(args.database)
+    seed_users(engine, args.users)
+    results = {}
+
+    for limit in args.limits:
+        results[limit] = {}
+
+        for name, build in QUERIES.items():
+            query = build(limit)
+            summary = measure(engine, query, args.repeat)
+            summary['peak_kib'] = peak_memory(engine, query)
+            results[limit][name] = summary
+            print(f'limit={limit:<6} {name:<10} {summary}')
+
+    write_results(args.output, 'projection', results)
+
+
+if __name__ == '__main__':
+    main()
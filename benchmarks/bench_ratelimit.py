@@ -0,0 +1,95 @@
+import argparse
+import itertools
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from benchmarks.micro import measure as measure_call
+from benchmarks.utils import (
+    create_database,
+    seed_users,
+    session_overrides,
+    summarize,
+    write_results,
+)
+from fast_api_todo.app import app
+from fast_api_todo.database import get_read_session, get_session
+from fast_api_todo.ratelimit import (
+    MemoryRateLimitBackend,
+    login_ip_limit,
+    login_username_limit,
+    rate_limit_backend,
+)
+
+
+def measure(client, requests: int, data: dict, status_code: int):
+    latencies = []
+
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.post('/auth/token', data=data)
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == status_code
+
+    return summarize(latencies, sum(latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure rate limiting overhead on the login path.'
+    )
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--keys', type=int, default=100_000)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument(
+        '--database', type=Path, default=Path('bench_ratelimit.db')
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/ratelimit.json')
+    )
+    args = parser.parse_args()
+
+    backend = MemoryRateLimitBackend(maxsize=args.keys)
+    keys = itertools.cycle([f'key{n}' for n in range(args.keys)])
+    results = {
+        'backend_hit': measure_call(
+            lambda: backend.hit(next(keys), 10**9, 60), args.keys
+        ),
+        'backend_keys': len(backend),
+    }
+    print(f'backend    {results["backend_hit"]}')
+
+    engine = create_database(args.database)
+    seed_users(engine, args.users)
+    get_session_override = session_overrides(engine)[0]
+    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_read_session] = get_session_override
+    data = {'username': 'bench0@bench.com', 'password': 'wrong'}
+    limits = login_ip_limit.limit, login_username_limit.limit
+
+    with TestClient(app) as client:
+        for mode in ('disabled', 'enabled'):
+            login_ip_limit.limit = login_username_limit.limit = (
+                0 if mode == 'disabled' else 10**9
+            )
+            rate_limit_backend.clear()
+            results[f'login_{mode}'] = measure(
+                client, args.requests, data, 400
+            )
+            print(f'login      {mode:<9} {results[f"login_{mode}"]}')
+
+        login_ip_limit.limit = login_username_limit.limit = 1
+        rate_limit_backend.clear()
+        client.post('/auth/token', data=data)
+        results['login_rejected'] = measure(client, args.requests, data, 429)
+        print(f'login      rejected  {results["login_rejected"]}')
+
+    login_ip_limit.limit, login_username_limit.limit = limits
+    rate_limit_backend.clear()
+    app.dependency_overrides.clear()
+    write_results(args.output, 'ratelimit', results)
+
+
+if __name__ == '__main__':
+    main()
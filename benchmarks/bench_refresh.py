@@ -0,0 +1,96 @@
+import argparse
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from benchmarks.utils import (
+    BENCHMARK_PASSWORD,
+    create_database,
+    seed_users,
+    session_overrides,
+    summarize,
+    write_results,
+)
+from fast_api_todo.app import app
+from fast_api_todo.database import get_read_session, get_session
+from fast_api_todo.ratelimit import login_ip_limit, login_username_limit
+
+
+def measure(send, requests: int):
+    latencies = []
+    cpu_start = time.process_time()
+
+    for n in range(requests):
+        start = time.perf_counter()
+        send(n).raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+    summary = summarize(latencies, sum(latencies))
+    summary['cpu_ms'] = round(
+        (time.process_time() - cpu_start) / requests * 1000, 3
+    )
+
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare password logins with refresh token renewals.'
+    )
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument(
+        '--database', type=Path, default=Path('bench_refresh.db')
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/refresh.json')
+    )
+    args = parser.parse_args()
+
+    engine = create_database(args.database)
+    seed_users(engine, args.users)
+    get_session_override = session_overrides(engine)[0]
+    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_read_session] = get_session_override
+    limits = login_ip_limit.limit, login_username_limit.limit
+    login_ip_limit.limit = login_username_limit.limit = 0
+    refresh_tokens = {}
+
+    def login(n: int):
+        response = client.post(
+            '/auth/token',
+            data={
+                'username': f'bench{n % args.users}@bench.com',
+                'password': BENCHMARK_PASSWORD,
+            },
+        )
+        refresh_tokens[n % args.users] = response.json()['refresh_token']
+
+        return response
+
+    def renew(n: int):
+        response = client.post(
+            '/auth/refresh',
+            json={'refresh_token': refresh_tokens[n % args.users]},
+        )
+        refresh_tokens[n % args.users] = response.json()['refresh_token']
+
+        return response
+
+    with TestClient(app) as client:
+        results = {
+            'password_login': measure(login, args.requests),
+            'refresh': measure(renew, args.requests),
+        }
+
+    for name, summary in results.items():
+        print(f'{name:<15} {summary}')
+
+    login_ip_limit.limit, login_username_limit.limit = limits
+    app.dependency_overrides.clear()
+    write_results(args.output, 'refresh', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import random
+import time
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from benchmarks.utils import (
+    create_database,
+    seed_users,
+    summarize,
+    write_results,
+)
+from fast_api_todo.models import Todo, TodoState
+from fast_api_todo.search import SearchScope, search_query
+
+WORDS = [f'word{index}' for index in range(5_000)]
+
+
+def seed_todos(engine, count: int, users: int, batch_size: int = 10_000):
+    rng = random.Random(0)
+
+    with Session(engine) as session:
+        for start in range(0, count, batch_size):
+            session.execute(
+                insert(Todo),
+                [
+                    {
+                        'title': ' '.join(rng.choices(WORDS, k=3)),
+                        'description': ' '.join(rng.choices(WORDS, k=12)),
+                        'state': TodoState.todo,
+                        'user_id': index % users + 1,
+                    }
+                    for index in range(start, min(start + batch_size, count))
+                ],
+            )
+            session.commit()
+
+
+def measure(call, repeat: int):
+    latencies = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+
+    return summarize(latencies, sum(latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare full-text search with a LIKE scan.'
+    )
+    parser.add_argument('--todos', type=int, default=1_000_000)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument(
+        '--terms', nargs='+', default=['word42', 'word4242', 'missing']
+    )
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument(
+        '--database', type=Path, default=Path('bench_search.db')
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/search.json')
+    )
+    args = parser.parse_args()
+
+    engine = create_database(args.database)
+    seed_users(engine, args.users)
+    seed_todos(engine, args.todos, args.users)
+
+    results = {}
+
+    with Session(engine) as session:
+        for term in args.terms:
+            pattern = f'%{term}%'
+            like_query = (
+                select(Todo.id, Todo.title)
+                .where(
+                    Todo.user_id == 1,
+                    Todo.title.like(pattern) | Todo.description.like(pattern),
+                )
+                .order_by(Todo.created_at, Todo.id)
+                .limit(args.limit)
+            )
+            fts_query = search_query(
+                engine.dialect.name, SearchScope.todos, term, 1
+            ).limit(args.limit)
+
+            results[term] = {
+                mode: measure(
+                    lambda query=query: session.execute(query).all(),
+                    args.repeat,
+                )
+                for mode, query in (('like', like_query), ('fts', fts_query))
+            }
+
+            for mode, summary in results[term].items():
+                print(f'{term:<10} {mode:<6} {summary}')
+
+    write_results(
+        args.output, 'search', {'todos': args.todos, 'results': results}
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from benchmarks.utils import (
+    create_database,
+    seed_users,
+    summarize,
+    write_results,
+)
+from fast_api_todo.models import User
+from fast_api_todo.responses import USER_PUBLIC_COLUMNS, public_users_page
+from fast_api_todo.schemas import UserListSchema
+
+page_adapter = TypeAdapter(UserListSchema)
+
+
+def response_model_path(session: Session, limit: int):
+    users = session.scalars(select(User).order_by(User.id).limit(limit)).all()
+    page = page_adapter.validate_python({'users': users, 'next_cursor': None})
+    content = jsonable_encoder(
+        page_adapter.dump_python(page, mode='json', exclude_none=True)
+    )
+
+    return json.dumps(content, separators=(',', ':')).encode()
+
+
+def fast_path(session: Session, limit: int):
+    rows = session.execute(
+        select(*USER_PUBLIC_COLUMNS).order_by(User.id).limit(limit)
+    ).all()
+
+    return (
+        public_users_page(rows, None)
+        .model_dump_json(exclude_none=True)
+        .encode()
+    )
+
+
+def measure(render, session: Session, limit: int, repeat: int):
+    latencies = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render(session, limit)
+        latencies.append(time.perf_counter() - start)
+
+    return summarize(latencies, sum(latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare response_model serialization with the fast path.'
+    )
+    parser.add_argument('--users', type=int, default=1_000)
+    parser.add_argument('--limit', type=int, default=1_000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument(
+        '--database', type=Path, default=Path('bench_serialization.db')
+    )
+    parser.add_argument(
+        '--output',
+        type=Path,
+        default=Path('.benchmarks/serialization.json'),
+    )
+    args = parser.parse_args()
+
+    engine = create_database(args.database)
+    seed_users(engine, args.users)
+    results = {}
+
+    with Session(engine) as session:
+        assert json.loads(response_model_path(session, args.limit)) == (
+            json.loads(fast_path(session, args.limit))
+        )
+
+        for name, render in (
+            ('response_model', response_model_path),
+            ('fast_path', fast_path),
+        ):
+            session.expunge_all()
+            results[name] = measure(render, session, args.limit, args.repeat)
+            print(f'{name:<15} {results[name]}')
+
+    write_results(
+        args.output, 'serialization', {'limit': args.limit, **results}
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from benchmarks.utils import (
+    create_database,
+    seed_users,
+    session_overrides,
+    summarize,
+    write_results,
+)
+from fast_api_todo.database import (
+    get_async_session,
+    get_read_session,
+    get_session,
+)
+from fast_api_todo.response_cache import async_flight, flight, response_cache
+from fast_api_todo.routers import async_users, users
+
+
+def build_app(mode: str, engine):
+    get_session_override, get_async_session_override = session_overrides(
+        engine
+    )
+    app = FastAPI()
+
+    if mode == 'async':
+        app.include_router(async_users.router)
+        app.dependency_overrides[get_async_session] = (
+            get_async_session_override
+        )
+    else:
+        app.include_router(users.router)
+        app.dependency_overrides[get_session] = get_session_override
+        app.dependency_overrides[get_read_session] = get_session_override
+
+    return app
+
+
+async def bursts(app, urls: list[str], rounds: int, burst: int):
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://bench'
+    ) as client:
+
+        async def get(url: str):
+            start = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+        start = time.perf_counter()
+
+        for n in range(rounds):
+            # Every round starts cold so the burst reaches the database.
+            response_cache.clear()
+            url = urls[n % len(urls)]
+            await asyncio.gather(*(get(url) for _ in range(burst)))
+
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Count database reads saved by single-flight.'
+    )
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=50)
+    parser.add_argument('--burst', type=int, default=50)
+    parser.add_argument(
+        '--database', type=Path, default=Path('bench_singleflight.db')
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/singleflight.json')
+    )
+    args = parser.parse_args()
+
+    engine = create_database(args.database)
+    seed_users(engine, args.users)
+    urls = ['/users/1', '/users/?limit=20', '/users/?limit=20&offset=20']
+    selects = []
+
+    def count_selects(conn, cursor, statement, *args):
+        if statement.startswith('SELECT'):
+            selects.append(statement)
+
+    event.listen(Engine, 'before_cursor_execute', count_selects)
+    results = {}
+
+    for mode in ('sync', 'async'):
+        app = build_app(mode, engine)
+
+        for enabled in (False, True):
+            flight.enabled = async_flight.enabled = enabled
+            name = f'{mode}_{"single_flight" if enabled else "baseline"}'
+            selects.clear()
+            results[name] = {
+                **asyncio.run(bursts(app, urls, args.rounds, args.burst)),
+                'selects': len(selects),
+            }
+            print(f'{name:<19} {results[name]}')
+
+    event.remove(Engine, 'before_cursor_execute', count_selects)
+    flight.enabled = async_flight.enabled = True
+    response_cache.clear()
+    write_results(args.output, 'singleflight', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import itertools
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from benchmarks.utils import summarize, write_results
+from fast_api_todo.models import Todo, User, table_registry
+from fast_api_todo.settings import Settings
+from fast_api_todo.sqlite import (
+    WriterSession,
+    apply_pragmas,
+    sqlite_pragmas,
+    use_immediate_transactions,
+)
+
+
+def baseline_sessions(url: str):
+    engine = create_engine(url)
+
+    return engine, lambda: Session(engine)
+
+
+def profile_sessions(url: str):
+    pragmas = sqlite_pragmas(Settings())  # type: ignore
+    reader = create_engine(url)
+    writer = create_engine(url, pool_size=1, max_overflow=0, pool_timeout=30)
+    use_immediate_transactions(writer)
+
+    for engine in (reader, writer):
+        apply_pragmas(engine, pragmas)
+
+    return writer, lambda: WriterSession(writer, reader)
+
+
+def transact(session, n: int, write: bool):
+    if not write:
+        return session.scalar(
+            select(func.count(Todo.id)).where(Todo.user_id == 1)
+        )
+
+    session.execute(
+        insert(Todo).values(
+            title=f'todo{n}', description='bench', state='todo', user_id=1
+        )
+    )
+    session.commit()
+
+
+def run(sessions, operations: int, threads: int, write_ratio: float):
+    counter = itertools.count()
+    latencies = []
+    errors = 0
+
+    def operation(_):
+        nonlocal errors
+        n = next(counter)
+        start = time.perf_counter()
+
+        try:
+            with sessions() as session:
+                transact(session, n, random.random() < write_ratio)
+        except OperationalError:
+            errors += 1
+            return
+
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(operation, range(operations)))
+
+    return {
+        **summarize(latencies, time.perf_counter() - start),
+        'errors': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare SQLite with and without the WAL profile.'
+    )
+    parser.add_argument('--operations', type=int, default=5000)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument(
+        '--database', type=Path, default=Path('bench_sqlite.db')
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/sqlite.json')
+    )
+    args = parser.parse_args()
+
+    results = {}
+
+    for mode, factory in (
+        ('baseline', baseline_sessions),
+        ('profile', profile_sessions),
+    ):
+        for suffix in ('', '-wal', '-shm'):
+            Path(f'{args.database}{suffix}').unlink(missing_ok=True)
+
+        engine, sessions = factory(f'sqlite:///{args.database}')
+        table_registry.metadata.create_all(engine)
+
+        with Session(engine) as session:
+            session.execute(
+                insert(User).values(
+                    username='bench', email='bench@bench.com', password='x'
+                )
+            )
+            session.commit()
+
+        results[mode] = run(
+            sessions, args.operations, args.threads, args.write_ratio
+        )
+        print(f'{mode:<9} {results[mode]}')
+
+    write_results(args.output, 'sqlite', results)
+
+
+if __name__ == '__main__':
+    main()
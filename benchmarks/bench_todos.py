@@ -0,0 +1,119 @@
+import argparse
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from benchmarks.utils import (
+    create_database,
+    seed_users,
+    session_overrides,
+    summarize,
+    write_results,
+)
+from fast_api_todo.app import app
+from fast_api_todo.database import get_session
+from fast_api_todo.models import Todo, TodoState
+from fast_api_todo.pagination import encode_cursor
+from fast_api_todo.security import create_access_token
+
+STATES = list(TodoState)
+
+
+def seed_todos(engine, user_id: int, count: int, batch_size: int = 10_000):
+    base = datetime(2024, 1, 1)
+
+    with Session(engine) as session:
+        for start in range(0, count, batch_size):
+            session.execute(
+                insert(Todo),
+                [
+                    {
+                        'title': f'task {index}',
+                        'description': f'description {index}',
+                        'state': STATES[index % len(STATES)],
+                        'user_id': user_id,
+                        'created_at': base + timedelta(seconds=index),
+                    }
+                    for index in range(start, min(start + batch_size, count))
+                ],
+            )
+            session.commit()
+
+
+def measure(client, headers: dict, params: dict, repeat: int):
+    latencies = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get('/todos/', headers=headers, params=params)
+        latencies.append(time.perf_counter() - start)
+
+    return summarize(latencies, sum(latencies))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure todo list latency for a single heavy user.'
+    )
+    parser.add_argument('--todos', type=int, default=100_000)
+    parser.add_argument('--other-users', type=int, default=1_000)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument(
+        '--database', type=Path, default=Path('bench_todos.db')
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/todos.json')
+    )
+    args = parser.parse_args()
+
+    engine = create_database(args.database)
+    seed_users(engine, args.other_users + 1)
+
+    for user_id in range(2, args.other_users + 2):
+        seed_todos(engine, user_id, 10)
+
+    seed_todos(engine, 1, args.todos)
+
+    headers = {
+        'Authorization': (
+            f'Bearer {create_access_token({"sub": "bench0@bench.com"})}'
+        )
+    }
+    middle = datetime(2024, 1, 1) + timedelta(seconds=args.todos // 2)
+    deep_cursor = encode_cursor(middle.isoformat(), args.todos // 2 + 1)
+    scenarios = {
+        'first_page': {'limit': args.limit},
+        'deep_cursor': {'limit': args.limit, 'cursor': deep_cursor},
+        'state': {'limit': args.limit, 'state': 'doing'},
+        'state_deep_cursor': {
+            'limit': args.limit,
+            'state': 'doing',
+            'cursor': deep_cursor,
+        },
+        'title_prefix': {'limit': args.limit, 'title': 'task 99'},
+    }
+
+    app.dependency_overrides[get_session] = session_overrides(engine)[0]
+    results = {}
+
+    with TestClient(app) as client:
+        for name, params in scenarios.items():
+            client.get(
+                '/todos/', headers=headers, params=params
+            ).raise_for_status()
+            results[name] = measure(client, headers, params, args.repeat)
+            print(f'{name:<18} {results[name]}')
+
+    app.dependency_overrides.clear()
+    write_results(
+        args.output, 'todos', {'todos': args.todos, 'results': results}
+    )
+
+
+if __name__ == '__main__':
+    main()
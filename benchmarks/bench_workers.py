@@ -0,0 +1,78 @@
+import argparse
+import asyncio
+import os
+import time
+from functools import partial
+from pathlib import Path
+
+from benchmarks.drivers import gunicorn_client, uvicorn_client
+from benchmarks.scenarios import Context, get_user, list_users
+from benchmarks.utils import (
+    create_database,
+    run_load,
+    seed_users,
+    write_results,
+)
+
+SERVERS = {'uvicorn': uvicorn_client, 'gunicorn': gunicorn_client}
+
+
+async def measure(connect, context: Context, concurrency: int):
+    start = time.perf_counter()
+
+    async with connect as client:
+        results = {'startup_seconds': round(time.perf_counter() - start, 3)}
+
+        for name, scenario in (('get_user', get_user), ('list', list_users)):
+            results[name] = await run_load(
+                partial(scenario, client, context),
+                context.requests,
+                concurrency,
+            )
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Measure startup time and throughput per worker count.'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        nargs='+',
+        default=sorted({1, 2, os.cpu_count() or 1}),
+    )
+    parser.add_argument('--users', type=int, default=1_000)
+    parser.add_argument('--requests', type=int, default=2_000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument(
+        '--database', type=Path, default=Path('bench_workers.db')
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('.benchmarks/workers.json')
+    )
+    args = parser.parse_args()
+
+    engine = create_database(args.database)
+    seed_users(engine, args.users)
+    context = Context(users=args.users, requests=args.requests)
+    results = {}
+
+    for server, client in SERVERS.items():
+        for workers in args.workers:
+            connect = client(args.database, args.port, workers)
+            summary = asyncio.run(measure(connect, context, args.concurrency))
+            results[f'{server}.{workers}'] = summary
+            print(f'{server:<9} workers={workers:<3} {summary}')
+
+    write_results(
+        args.output,
+        'workers',
+        {'cpus': os.cpu_count(), 'results': results},
+    )
+
+
+if __name__ == '__main__':
+    main()
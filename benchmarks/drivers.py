@@ -0,0 +1,92 @@
+import asyncio
+import os
+import subprocess
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import httpx
+
+from benchmarks.utils import session_overrides
+from fast_api_todo.app import app
+from fast_api_todo.database import get_async_session, get_session
+
+
+@asynccontextmanager
+async def inprocess_client(engine):
+    get_session_override, get_async_session_override = session_overrides(
+        engine
+    )
+    app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_async_session] = get_async_session_override
+
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url='http://bench'
+        ) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+
+
+async def wait_until_ready(client, timeout: float = 15.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+
+    while True:
+        try:
+            (await client.get('/')).raise_for_status()
+            return
+        except httpx.TransportError:
+            if asyncio.get_running_loop().time() > deadline:
+                raise
+
+            await asyncio.sleep(0.1)
+
+
+@asynccontextmanager
+async def process_client(command: list[str], env: dict, port: int):
+    process = subprocess.Popen(command, env={**os.environ, **env})
+
+    try:
+        async with httpx.AsyncClient(
+            base_url=f'http://127.0.0.1:{port}', timeout=60
+        ) as client:
+            await wait_until_ready(client)
+            yield client
+    finally:
+        process.terminate()
+        process.wait(timeout=15)
+
+
+def uvicorn_client(database: Path, port: int = 8765, workers: int = 1):
+    return process_client(
+        [
+            sys.executable,
+            '-m',
+            'uvicorn',
+            'fast_api_todo.app:app',
+            '--port',
+            str(port),
+            '--workers',
+            str(workers),
+            '--log-level',
+            'warning',
+        ],
+        {'DATABASE_URL': f'sqlite:///{database}'},
+        port,
+    )
+
+
+def gunicorn_client(database: Path, port: int = 8765, workers: int = 1):
+    return process_client(
+        [sys.executable, '-m', 'fast_api_todo.server'],
+        {
+            'DATABASE_URL': f'sqlite:///{database}',
+            'SERVER_BIND': f'127.0.0.1:{port}',
+            'SERVER_WORKERS': str(workers),
+        },
+        port,
+    )
+
+
+DRIVERS = ('inprocess', 'uvicorn', 'gunicorn')
@@ -0,0 +1,46 @@
+import timeit
+
+from benchmarks.utils import BenchmarkUserFactory
+from fast_api_todo.schemas import UserListSchema
+from fast_api_todo.security import create_access_token, decode_access_token
+
+
+def measure(func, number: int):
+    seconds = min(timeit.repeat(func, number=number, repeat=5))
+
+    return {
+        'ops_per_second': round(number / seconds, 2),
+        'mean_us': round(seconds / number * 1_000_000, 3),
+    }
+
+
+def user_page(size: int):
+    BenchmarkUserFactory.reset_sequence()
+
+    return {
+        'users': [
+            {'id': n + 1, **user}
+            for n, user in enumerate(BenchmarkUserFactory.build_batch(size))
+        ]
+    }
+
+
+def run_micro(number: int = 1000, page_size: int = 1000):
+    token = create_access_token({'sub': 'bench0@bench.com'})
+    page = user_page(page_size)
+    model = UserListSchema.model_validate(page)
+
+    return {
+        'create_access_token': measure(
+            lambda: create_access_token({'sub': 'bench0@bench.com'}), number
+        ),
+        'decode_access_token': measure(
+            lambda: decode_access_token(token), number
+        ),
+        f'user_list_validate_{page_size}': measure(
+            lambda: UserListSchema.model_validate(page), number // 100 or 1
+        ),
+        f'user_list_dump_json_{page_size}': measure(
+            model.model_dump_json, number // 100 or 1
+        ),
+    }
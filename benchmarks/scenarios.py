@@ -0,0 +1,80 @@
+from dataclasses import dataclass, field
+
+from fast_api_todo.security import create_access_token
+
+
+@dataclass
+class Context:
+    users: int
+    requests: int
+    tokens: list[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.tokens = [
+            create_access_token({'sub': f'bench{n}@bench.com'})
+            for n in range(self.users)
+        ]
+
+    def auth(self, n: int):
+        return {'Authorization': f'Bearer {self.tokens[n]}'}
+
+
+def new_user(prefix: str, n: int):
+    return {
+        'username': f'{prefix}{n}',
+        'email': f'{prefix}{n}@bench.com',
+        'password': f'{prefix}{n}-password',
+    }
+
+
+async def get_user(client, context: Context, n: int):
+    return await client.get(f'/users/{n % context.users + 1}')
+
+
+async def list_users(client, context: Context, n: int):
+    return await client.get('/users/', params={'limit': 100})
+
+
+async def login(client, context: Context, n: int):
+    return await client.post(
+        '/auth/token',
+        data={
+            'username': f'bench{n % context.users}@bench.com',
+            'password': 'benchmark',
+        },
+    )
+
+
+async def refresh_token(client, context: Context, n: int):
+    return await client.post(
+        '/auth/refresh_token', headers=context.auth(n % context.users)
+    )
+
+
+async def create_user(client, context: Context, n: int):
+    return await client.post('/users/', json=new_user('created', n))
+
+
+async def update_user(client, context: Context, n: int):
+    return await client.put(
+        f'/users/{n + 1}',
+        headers=context.auth(n),
+        json=new_user('updated', n),
+    )
+
+
+async def delete_user(client, context: Context, n: int):
+    n = context.users - n - 1
+
+    return await client.delete(f'/users/{n + 1}', headers=context.auth(n))
+
+
+SCENARIOS = {
+    'get_user': get_user,
+    'list_users': list_users,
+    'login': login,
+    'refresh_token': refresh_token,
+    'create_user': create_user,
+    'update_user': update_user,
+    'delete_user': delete_user,
+}
@@ -0,0 +1,143 @@
+import asyncio
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+
+import factory
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from fast_api_todo.database import get_async_url
+from fast_api_todo.models import User, table_registry
+from fast_api_todo.security import get_password_hash
+
+BENCHMARK_PASSWORD = 'benchmark'
+
+
+class BenchmarkUserFactory(factory.Factory):
+    class Meta:
+        model = dict
+
+    username = factory.Sequence(lambda n: f'bench{n}')
+    email = factory.LazyAttribute(lambda obj: f'{obj.username}@bench.com')
+    password = BENCHMARK_PASSWORD
+
+
+def percentile(samples: list[float], pct: float):
+    if not samples:
+        return 0.0
+
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+
+    return ordered[index]
+
+
+def summarize(latencies: list[float], elapsed: float):
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p90_ms': round(percentile(latencies, 90) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+async def run_load(send, total: int, concurrency: int):
+    latencies = []
+    queue = iter(range(total))
+
+    async def worker():
+        for index in queue:
+            start = time.perf_counter()
+            response = await send(index)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def create_database(path: Path):
+    path.unlink(missing_ok=True)
+    database_url = f'sqlite:///{path}'
+    engine = create_engine(database_url, poolclass=NullPool)
+    table_registry.metadata.create_all(engine)
+
+    return engine
+
+
+def seed_users(engine, count: int, batch_size: int = 10_000):
+    password = get_password_hash(BENCHMARK_PASSWORD)
+    BenchmarkUserFactory.reset_sequence()
+
+    with Session(engine) as session:
+        for start in range(0, count, batch_size):
+            session.execute(
+                insert(User),
+                BenchmarkUserFactory.build_batch(
+                    min(batch_size, count - start), password=password
+                ),
+            )
+            session.commit()
+
+
+def random_user_id(count: int):
+    return random.randint(1, count)
+
+
+def session_overrides(engine):
+    async_engine = create_async_engine(get_async_url(engine.url))
+
+    def get_session_override():
+        with Session(engine) as session:
+            yield session
+
+    async def get_async_session_override():
+        async with AsyncSession(
+            async_engine, expire_on_commit=False
+        ) as session:
+            yield session
+
+    return get_session_override, get_async_session_override
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata():
+    return {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': datetime.now().astimezone().isoformat(),
+    }
+
+
+def write_results(path: Path, name: str, results: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {'benchmark': name, 'metadata': metadata(), **results}, indent=2
+        ),
+        encoding='utf-8',
+    )
@@ -1,16 +1,81 @@
+import os
 from http import HTTPStatus
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 
-from fast_api_todo.routers import auth, users
+from fast_api_todo.database import engine, replicas
+from fast_api_todo.instrumentation import MetricsMiddleware
+from fast_api_todo.metrics import registry
+from fast_api_todo.replicas import ReadYourWritesMiddleware, ping
+from fast_api_todo.routers import (
+    async_auth,
+    async_users,
+    auth,
+    search,
+    todos,
+    users,
+)
 from fast_api_todo.schemas import Message
+from fast_api_todo.security import keyring
+from fast_api_todo.settings import Settings
+
+settings = Settings()  # type: ignore
 
 app = FastAPI()
+app.add_middleware(MetricsMiddleware)
+
+if settings.READ_REPLICA_URLS:
+    app.add_middleware(
+        ReadYourWritesMiddleware, window=settings.READ_YOUR_WRITES_SECONDS
+    )
+
+if settings.ASYNC_MODE:
+    app.include_router(async_users.router)
+    app.include_router(async_auth.router)
+else:
+    app.include_router(users.router)
+    app.include_router(auth.router)
 
-app.include_router(users.router)
-app.include_router(auth.router)
+app.include_router(todos.router)
+app.include_router(search.router)
 
 
 @app.get('/', status_code=HTTPStatus.OK, response_model=Message)
 def read_root():
     return {'message': 'Hello World'}
+
+
+@app.get('/metrics', response_class=PlainTextResponse, include_in_schema=False)
+def read_metrics():
+    return PlainTextResponse(
+        registry.render(), media_type='text/plain; version=0.0.4'
+    )
+
+
+@app.get('/health', include_in_schema=False)
+def read_health():
+    database = ping(engine)
+    status_code = HTTPStatus.OK
+
+    if not database:
+        status_code = HTTPStatus.SERVICE_UNAVAILABLE
+
+    return JSONResponse(
+        {
+            'status': 'ok' if database else 'unavailable',
+            'worker': os.getpid(),
+            'database': database,
+            'replicas': len(replicas.healthy),
+        },
+        status_code=status_code,
+    )
+
+
+@app.get('/.well-known/jwks.json', include_in_schema=False)
+def read_jwks():
+    return Response(
+        keyring.jwks_body,
+        media_type='application/json',
+        headers={'Cache-Control': 'public, max-age=300'},
+    )
@@ -0,0 +1,146 @@
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from fast_api_todo.models import User
+from fast_api_todo.schemas import UserSchema
+from fast_api_todo.security import get_password_hashes
+
+
+async def iter_ndjson_lines(stream):
+    buffer = b''
+    line_number = 0
+
+    async for chunk in stream:
+        *lines, buffer = (buffer + chunk).split(b'\n')
+
+        for line in lines:
+            line_number += 1
+
+            if line.strip():
+                yield line_number, line
+
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+def failed(line: int, detail: str):
+    return {'line': line, 'status': 'failed', 'detail': detail}
+
+
+def parse_users(lines):
+    users = {}
+    results = {}
+
+    for line, raw in lines:
+        try:
+            users[line] = UserSchema.model_validate_json(raw)
+        except ValidationError:
+            results[line] = failed(line, 'Invalid user')
+
+    return users, results
+
+
+def drop_duplicate_users(users: dict, results: dict):
+    usernames = set()
+    emails = set()
+
+    for line, user in list(users.items()):
+        if user.username in usernames:
+            results[line] = failed(line, 'Username already existis')
+        elif user.email in emails:
+            results[line] = failed(line, 'Email already existis')
+        else:
+            usernames.add(user.username)
+            emails.add(user.email)
+            continue
+
+        del users[line]
+
+
+def drop_existing_users(session: Session, users: dict, results: dict):
+    existing = session.execute(
+        select(User.username, User.email).where(
+            User.username.in_([user.username for user in users.values()])
+            | User.email.in_([user.email for user in users.values()])
+        )
+    ).all()
+    usernames = {row.username for row in existing}
+    emails = {row.email for row in existing}
+
+    for line, user in list(users.items()):
+        if user.username in usernames:
+            results[line] = failed(line, 'Username already existis')
+        elif user.email in emails:
+            results[line] = failed(line, 'Email already existis')
+        else:
+            continue
+
+        del users[line]
+
+
+def insert_users(session: Session, values: list[dict]):
+    try:
+        ids = session.scalars(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            values,
+        ).all()
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+    else:
+        return ids
+
+    ids = []
+
+    for row in values:
+        try:
+            with session.begin_nested():
+                ids.append(
+                    session.scalar(insert(User).returning(User.id), row)
+                )
+        except IntegrityError:
+            ids.append(None)
+
+    session.commit()
+
+    return ids
+
+
+def import_users_batch(session: Session, lines: list[tuple[int, bytes]]):
+    users, results = parse_users(lines)
+
+    if users:
+        # Only rows that survive the database check claim their names.
+        drop_existing_users(session, users, results)
+        drop_duplicate_users(users, results)
+
+    if users:
+        passwords = get_password_hashes([
+            user.password for user in users.values()
+        ])
+        ids = insert_users(
+            session,
+            [
+                {
+                    'username': user.username,
+                    'email': user.email,
+                    'password': password,
+                }
+                for user, password in zip(users.values(), passwords)
+            ],
+        )
+
+        for (line, user), user_id in zip(users.items(), ids):
+            if user_id is None:
+                results[line] = failed(line, 'User already existis')
+            else:
+                results[line] = {
+                    'line': line,
+                    'status': 'created',
+                    'id': user_id,
+                    'username': user.username,
+                }
+
+    return [results[line] for line, _ in lines]
@@ -0,0 +1,149 @@
+import threading
+import time
+from collections import OrderedDict
+
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+
+class TTLCache:
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._tags: dict = {}
+        self._generations: dict = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                return default
+
+            value, expires_at, _ = entry
+
+            if expires_at is not None and expires_at <= time.time():
+                self._remove(key)
+                return default
+
+            self._entries.move_to_end(key)
+
+            return value
+
+    def set(self, key, value, expires_at: float | None = None, tag=None):
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, expires_at, tag)
+
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_tag(self, tag):
+        with self._lock:
+            for key in self._tags.pop(tag, set()):
+                self._entries.pop(key, None)
+
+    def generation(self, tag):
+        return self._generations.get(tag, 0)
+
+    def bump_generation(self, tag):
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key):
+        _, _, tag = self._entries.pop(key)
+        keys = self._tags.get(tag)
+
+        if keys is not None:
+            keys.discard(key)
+
+            if not keys:
+                del self._tags[tag]
+
+
+class RedisCache:
+    def __init__(self, client, prefix: str = 'fast_api_todo:'):
+        self.client = client
+        self.prefix = prefix
+
+    def _tag_key(self, tag):
+        return f'{self.prefix}tag:{tag}'
+
+    def _generation_key(self, tag):
+        return f'{self.prefix}generation:{tag}'
+
+    def get(self, key, default=None):
+        value = self.client.get(self.prefix + key)
+
+        return default if value is None else value
+
+    def set(self, key, value, expires_at: float | None = None, tag=None):
+        expires_at_ms = None if expires_at is None else int(expires_at * 1000)
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.set(self.prefix + key, value, pxat=expires_at_ms)
+
+        if tag is not None:
+            pipeline.sadd(self._tag_key(tag), key)
+
+            if expires_at_ms is not None:
+                pipeline.pexpireat(self._tag_key(tag), expires_at_ms)
+
+        pipeline.execute()
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def invalidate_tag(self, tag):
+        keys = self.client.smembers(self._tag_key(tag))
+        self.client.delete(
+            self._tag_key(tag),
+            *(self.prefix + key.decode() for key in keys),
+        )
+
+    def generation(self, tag):
+        return int(self.client.get(self._generation_key(tag)) or 0)
+
+    def bump_generation(self, tag):
+        self.client.incr(self._generation_key(tag))
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f'{self.prefix}*'))
+
+        if keys:
+            self.client.delete(*keys)
+
+
+def create_cache(url: str | None = None, maxsize: int = 1024):
+    if not url:
+        return TTLCache(maxsize=maxsize)
+
+    if redis is None:
+        raise RuntimeError(
+            'The redis package is required for a Redis cache backend'
+        )
+
+    return RedisCache(redis.Redis.from_url(url))
@@ -0,0 +1,116 @@
+import argparse
+import os
+import statistics
+from time import perf_counter
+
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+# OWASP's minimum Argon2id pairings of memory cost (KiB) and passes.
+OWASP_MINIMUMS = (
+    (47_104, 1),
+    (19_456, 2),
+    (12_288, 3),
+    (9_216, 4),
+    (7_168, 5),
+)
+MIN_MEMORY_COST = 19_456
+
+
+def min_time_cost(memory_cost: int):
+    for floor, time_cost in OWASP_MINIMUMS:
+        if memory_cost >= floor:
+            return time_cost
+
+    raise ValueError(f'Memory cost {memory_cost} is below the OWASP minimum')
+
+
+def lower_memory_cost(memory_cost: int):
+    first_floor = OWASP_MINIMUMS[0][0]
+
+    if memory_cost > first_floor:
+        return max(memory_cost // 2, first_floor)
+
+    # Below the first floor, halving only trades memory for passes.
+    return MIN_MEMORY_COST
+
+
+def measure_hash(
+    time_cost: int, memory_cost: int, parallelism: int, samples: int = 5
+):
+    hasher = Argon2Hasher(
+        time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+    )
+    hasher.hash('calibration')
+    timings = []
+
+    for _ in range(samples):
+        start = perf_counter()
+        hasher.hash('calibration')
+        timings.append(perf_counter() - start)
+
+    return statistics.median(timings)
+
+
+def calibrate(
+    target: float,
+    parallelism: int,
+    max_memory_cost: int = 65_536,
+    measure=measure_hash,
+):
+    memory_cost = max_memory_cost
+    time_cost = min_time_cost(memory_cost)
+    elapsed = measure(time_cost, memory_cost, parallelism)
+
+    while elapsed > target and memory_cost > MIN_MEMORY_COST:
+        memory_cost = lower_memory_cost(memory_cost)
+        time_cost = min_time_cost(memory_cost)
+        elapsed = measure(time_cost, memory_cost, parallelism)
+
+    while True:
+        candidate = measure(time_cost + 1, memory_cost, parallelism)
+
+        if candidate > target:
+            break
+
+        time_cost += 1
+        elapsed = candidate
+
+    return {
+        'ARGON2_TIME_COST': time_cost,
+        'ARGON2_MEMORY_COST': memory_cost,
+        'ARGON2_PARALLELISM': parallelism,
+    }, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m fast_api_todo.calibrate',
+        description='Pick Argon2 parameters for a hash time target.',
+    )
+    parser.add_argument('--target-ms', type=float, default=50)
+    parser.add_argument(
+        '--parallelism', type=int, default=min(4, os.cpu_count() or 1)
+    )
+    parser.add_argument('--max-memory-cost', type=int, default=65_536)
+    args = parser.parse_args()
+
+    if args.max_memory_cost < OWASP_MINIMUMS[-1][0]:
+        parser.error(
+            f'--max-memory-cost must be at least {OWASP_MINIMUMS[-1][0]}'
+        )
+
+    parameters, elapsed = calibrate(
+        args.target_ms / 1000, args.parallelism, args.max_memory_cost
+    )
+
+    for name, value in parameters.items():
+        print(f'{name}={value}')
+
+    print(f'# median hash time {elapsed * 1000:.1f}ms')
+
+    if elapsed * 1000 > args.target_ms:
+        print('# the target is below the minimum cost on this machine')
+
+
+if __name__ == '__main__':
+    main()
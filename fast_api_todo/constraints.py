@@ -0,0 +1,26 @@
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from fast_api_todo.models import User
+
+
+def user_conflicts_query(username: str, email: str, user_id=None):
+    query = select(User.username).where(
+        (User.username == username) | (User.email == email)
+    )
+
+    if user_id is not None:
+        query = query.where(User.id != user_id)
+
+    return query
+
+
+def user_conflict_exception(usernames, username: str):
+    if username in usernames:
+        detail = 'Username already existis'
+    else:
+        detail = 'Email already existis'
+
+    return HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=detail)
@@ -1,11 +1,139 @@
+from fastapi import Depends, Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
 
+from fast_api_todo.instrumentation import instrument_engine
+from fast_api_todo.replicas import (
+    ReplicaSet,
+    RoutingSession,
+    reads_from_primary,
+)
 from fast_api_todo.settings import Settings
+from fast_api_todo.sqlite import (
+    WriterSession,
+    apply_pragmas,
+    enable_foreign_keys,
+    is_sqlite_file,
+    sqlite_pragmas,
+    use_immediate_transactions,
+)
 
-engine = create_engine(Settings().DATABASE_URL)
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+psycopg',
+    'postgresql+psycopg': 'postgresql+psycopg',
+    'postgresql+psycopg2': 'postgresql+psycopg',
+}
+
+settings = Settings()  # type: ignore
+
+
+def get_async_url(url: str):
+    url = make_url(url)
+
+    return url.set(
+        drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    )
+
+
+def get_engine_options(url: str):
+    url = make_url(url)
+
+    if url.get_backend_name() == 'sqlite' and url.database in {
+        None,
+        '',
+        ':memory:',
+    }:
+        return {}
+
+    return {
+        'pool_size': settings.DATABASE_POOL_SIZE,
+        'max_overflow': settings.DATABASE_MAX_OVERFLOW,
+        'pool_pre_ping': settings.DATABASE_POOL_PRE_PING,
+        'pool_recycle': settings.DATABASE_POOL_RECYCLE,
+    }
+
+
+engine = create_engine(
+    settings.DATABASE_URL, **get_engine_options(settings.DATABASE_URL)
+)
+
+async_database_url = settings.ASYNC_DATABASE_URL or get_async_url(
+    settings.DATABASE_URL
+)
+async_engine = create_async_engine(
+    async_database_url, **get_engine_options(async_database_url)
+)
+
+writer_engine = None
+
+if settings.SQLITE_PROFILE and is_sqlite_file(settings.DATABASE_URL):
+    # A single-connection pool queues writers in-process instead of
+    # letting them contend for SQLite's file lock.
+    writer_engine = create_engine(
+        settings.DATABASE_URL,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.SQLITE_WRITER_TIMEOUT_SECONDS,
+    )
+    use_immediate_transactions(writer_engine)
+
+    for profiled in (engine, writer_engine):
+        apply_pragmas(profiled, sqlite_pragmas(settings))
+
+if settings.SQLITE_PROFILE and is_sqlite_file(async_database_url):
+    apply_pragmas(async_engine.sync_engine, sqlite_pragmas(settings))
+
+replicas = ReplicaSet(
+    [
+        create_engine(url, **get_engine_options(url))
+        for url in settings.READ_REPLICA_URLS
+    ],
+    strategy=settings.READ_REPLICA_STRATEGY,
+    health_check_interval=settings.READ_REPLICA_HEALTH_CHECK_SECONDS,
+)
+
+primary_engines = [engine, async_engine.sync_engine]
+
+if writer_engine is not None:
+    primary_engines.append(writer_engine)
+
+for instrumented in (*primary_engines, *replicas.engines):
+    instrument_engine(instrumented, settings.SLOW_QUERY_THRESHOLD_MS / 1000)
+
+    if instrumented.dialect.name == 'sqlite':
+        enable_foreign_keys(instrumented)
 
 
 def get_session():  # pragma: no cover
-    with Session(engine) as session:
+    if writer_engine is None:
+        with Session(engine) as session:
+            yield session
+        return
+
+    with WriterSession(writer_engine, engine) as session:
+        yield session
+
+
+def get_read_session(
+    request: Request, session: Session = Depends(get_session)
+):
+    replica = None
+
+    if not reads_from_primary(request.cookies):
+        replica = replicas.choose()
+
+    if replica is None:
+        yield session
+        return
+
+    with RoutingSession(session.get_bind(), replica) as read_session:
+        yield read_session
+
+
+async def get_async_session():  # pragma: no cover
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
         yield session
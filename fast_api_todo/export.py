@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+from enum import Enum
+
+from sqlalchemy import select
+
+from fast_api_todo.models import User
+
+EXPORT_COLUMNS = ('id', 'username', 'email', 'created_at')
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportFormat(str, Enum):
+    ndjson = 'ndjson'
+    csv = 'csv'
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: 'application/x-ndjson',
+    ExportFormat.csv: 'text/csv',
+}
+
+
+def export_users_query():
+    return (
+        select(*(getattr(User, column) for column in EXPORT_COLUMNS))
+        .order_by(User.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def format_ndjson(rows):
+    return ''.join(
+        json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str) + '\n'
+        for row in rows
+    )
+
+
+def format_csv(rows, header: bool = False):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+
+    writer.writerows(rows)
+
+    return buffer.getvalue()
+
+
+def export_header(export_format: ExportFormat):
+    if export_format == ExportFormat.csv:
+        return format_csv((), header=True)
+
+    return ''
+
+
+def format_rows(rows, export_format: ExportFormat):
+    if export_format == ExportFormat.csv:
+        return format_csv(rows)
+
+    return format_ndjson(rows)
@@ -0,0 +1,217 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from time import perf_counter
+
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from fast_api_todo.instrumentation import record
+from fast_api_todo.metrics import registry
+from fast_api_todo.settings import Settings
+
+settings = Settings()  # type: ignore
+pwd_context = PasswordHash((
+    Argon2Hasher(
+        time_cost=settings.ARGON2_TIME_COST,
+        memory_cost=settings.ARGON2_MEMORY_COST,
+        parallelism=settings.ARGON2_PARALLELISM,
+    ),
+))
+
+hashing_wait_seconds = registry.histogram(
+    'password_hashing_wait_seconds',
+    'Time a password hashing job waited for a free worker.',
+    labelnames=('operation',),
+)
+hashing_seconds = registry.histogram(
+    'password_hashing_seconds',
+    'Time spent computing a password hash or verification.',
+    labelnames=('operation',),
+)
+hashing_rejected_total = registry.counter(
+    'password_hashing_rejected_total',
+    'Password hashing jobs rejected because the queue was full.',
+    labelnames=('operation',),
+)
+
+
+class HashingPoolSaturatedError(Exception):
+    pass
+
+
+def hash_password(password: str):
+    return pwd_context.hash(password)
+
+
+def check_password(plain_password: str, hashed_password: str):
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def check_and_update_password(plain_password: str, hashed_password: str):
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _timed_call(func, *args):
+    start = perf_counter()
+    result = func(*args)
+
+    return result, perf_counter() - start
+
+
+def _record_timings(operation: str, queued_at: float, elapsed: float):
+    hashing_seconds.observe(elapsed, operation=operation)
+    hashing_wait_seconds.observe(
+        max(0.0, perf_counter() - queued_at - elapsed),
+        operation=operation,
+    )
+
+
+class PasswordHashingExecutor:
+    def __init__(self, workers: int = 0, max_pending: int = 64):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._pool = None
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+
+        return self._pool
+
+    def _acquire(self, operation: str, jobs: int = 1):
+        with self._lock:
+            if self._pending + jobs > self.max_pending:
+                hashing_rejected_total.inc(jobs, operation=operation)
+                raise HashingPoolSaturatedError(
+                    f'{self._pending} password hashing jobs pending'
+                )
+
+            self._pending += jobs
+
+    def _release(self, jobs: int = 1):
+        with self._lock:
+            self._pending -= jobs
+
+    def submit(self, func, *args) -> Future:
+        operation = func.__name__
+        self._acquire(operation)
+        queued_at = perf_counter()
+        future = Future()
+
+        def done(pool_future: Future):
+            self._release()
+
+            try:
+                result, elapsed = pool_future.result()
+            except BaseException as exc:
+                future.set_exception(exc)
+                return
+
+            _record_timings(operation, queued_at, elapsed)
+            future.set_result(result)
+
+        try:
+            self._get_pool().submit(
+                _timed_call, func, *args
+            ).add_done_callback(done)
+        except BaseException:
+            self._release()
+            raise
+
+        return future
+
+    def run(self, func, *args):
+        start = perf_counter()
+
+        try:
+            return self._run(func, *args)
+        finally:
+            record('hash_seconds', perf_counter() - start)
+
+    def _run(self, func, *args):
+        if self.workers:
+            return self.submit(func, *args).result()
+
+        operation = func.__name__
+        self._acquire(operation)
+        queued_at = perf_counter()
+
+        try:
+            result, elapsed = _timed_call(func, *args)
+        finally:
+            self._release()
+
+        _record_timings(operation, queued_at, elapsed)
+
+        return result
+
+    async def run_async(self, func, *args):
+        start = perf_counter()
+
+        try:
+            if self.workers:
+                return await asyncio.wrap_future(self.submit(func, *args))
+
+            loop = asyncio.get_running_loop()
+
+            return await loop.run_in_executor(None, self._run, func, *args)
+        finally:
+            record('hash_seconds', perf_counter() - start)
+
+    def map(self, func, *iterables):
+        operation = func.__name__
+        call = partial(_timed_call, func)
+        jobs = list(zip(*iterables))
+        # Hash in chunks no wider than the pool so every job holds a
+        # pending slot without starving other requests for the batch.
+        size = max(
+            1, min(self.workers or os.cpu_count() or 1, self.max_pending)
+        )
+        pool = (
+            self._get_pool()
+            if self.workers
+            else ThreadPoolExecutor(max_workers=size)
+        )
+        timed = []
+        start = perf_counter()
+
+        try:
+            for index in range(0, len(jobs), size):
+                chunk = jobs[index : index + size]
+                self._acquire(operation, len(chunk))
+
+                try:
+                    timed += pool.map(call, *zip(*chunk))
+                finally:
+                    self._release(len(chunk))
+        finally:
+            if not self.workers:
+                pool.shutdown()
+
+            record('hash_seconds', perf_counter() - start)
+
+        for _, elapsed in timed:
+            hashing_seconds.observe(elapsed, operation=operation)
+
+        return [result for result, _ in timed]
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+
+        if pool is not None:
+            pool.shutdown()
@@ -0,0 +1,152 @@
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+
+from sqlalchemy import event
+
+from fast_api_todo.metrics import registry
+
+logger = logging.getLogger('fast_api_todo.slow_queries')
+
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+request_duration_seconds = registry.histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency by route.',
+    labelnames=('method', 'route', 'status'),
+)
+request_db_seconds = registry.histogram(
+    'http_request_db_seconds',
+    'Time spent executing SQL statements per request.',
+    labelnames=('method', 'route'),
+)
+request_statements = registry.histogram(
+    'http_request_db_statements',
+    'SQL statements executed per request.',
+    labelnames=('method', 'route'),
+    buckets=STATEMENT_BUCKETS,
+)
+request_hash_seconds = registry.histogram(
+    'http_request_password_hash_seconds',
+    'Time spent hashing or verifying passwords per request.',
+    labelnames=('method', 'route'),
+)
+request_jwt_seconds = registry.histogram(
+    'http_request_jwt_decode_seconds',
+    'Time spent decoding access tokens per request.',
+    labelnames=('method', 'route'),
+)
+db_statement_seconds = registry.histogram(
+    'db_statement_seconds', 'SQL statement execution time.'
+)
+route_templates = {}
+
+
+@dataclass(slots=True)
+class RequestStats:
+    db_seconds: float = 0.0
+    statements: int = 0
+    hash_seconds: float = 0.0
+    jwt_seconds: float = 0.0
+
+
+request_stats: ContextVar[RequestStats | None] = ContextVar(
+    'request_stats', default=None
+)
+
+
+def record(field: str, seconds: float):
+    stats = request_stats.get()
+
+    if stats is not None:
+        setattr(stats, field, getattr(stats, field) + seconds)
+
+
+def instrument_engine(engine, slow_query_threshold: float = 0.2):
+    def before_cursor_execute(conn, cursor, statement, *args):
+        conn.info.setdefault('query_start', []).append(perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, *args):
+        elapsed = perf_counter() - conn.info['query_start'].pop()
+        db_statement_seconds.observe(elapsed)
+        stats = request_stats.get()
+
+        if stats is not None:
+            stats.db_seconds += elapsed
+            stats.statements += 1
+
+        if elapsed >= slow_query_threshold:
+            logger.warning(
+                'Slow query (%.1f ms): %s', elapsed * 1000, statement
+            )
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+
+    return engine
+
+
+def get_route_template(scope):
+    app = scope.get('app')
+    endpoint = scope.get('endpoint')
+
+    if app is None or endpoint is None:
+        return 'unmatched'
+
+    if endpoint not in route_templates:
+        route_templates.update({
+            route.endpoint: route.path
+            for route in getattr(app, 'routes', ())
+            if hasattr(route, 'endpoint')
+        })
+
+    return route_templates.get(endpoint, 'unmatched')
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status = 500
+        start = perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+
+            if message['type'] == 'http.response.start':
+                status = message['status']
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_stats.reset(token)
+            method = scope['method']
+            route = get_route_template(scope)
+            request_duration_seconds.observe(
+                perf_counter() - start,
+                method=method,
+                route=route,
+                status=str(status),
+            )
+            request_db_seconds.observe(
+                stats.db_seconds, method=method, route=route
+            )
+            request_statements.observe(
+                stats.statements, method=method, route=route
+            )
+            request_hash_seconds.observe(
+                stats.hash_seconds, method=method, route=route
+            )
+            request_jwt_seconds.observe(
+                stats.jwt_seconds, method=method, route=route
+            )
@@ -0,0 +1,112 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed448, ed25519, rsa
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
+from jwt import decode, encode, get_unverified_header
+from jwt.algorithms import get_default_algorithms
+from jwt.exceptions import InvalidTokenError
+
+EC_ALGORITHMS = {'secp256r1': 'ES256', 'secp384r1': 'ES384'}
+
+
+@dataclass(frozen=True, slots=True)
+class Key:
+    kid: str | None
+    algorithm: str
+    verifying_key: object
+    signing_key: object | None = None
+
+
+def key_algorithm(public_key):
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return 'RS256'
+
+    if isinstance(public_key, ed25519.Ed25519PublicKey | ed448.Ed448PublicKey):
+        return 'EdDSA'
+
+    if (
+        isinstance(public_key, ec.EllipticCurvePublicKey)
+        and public_key.curve.name in EC_ALGORITHMS
+    ):
+        return EC_ALGORITHMS[public_key.curve.name]
+
+    raise ValueError(f'Unsupported key type {type(public_key).__name__}')
+
+
+def load_key(kid: str, pem: str):
+    if not pem.lstrip().startswith('-----BEGIN'):
+        pem = Path(pem).read_text(encoding='utf-8')
+
+    try:
+        private_key = load_pem_private_key(pem.encode(), password=None)
+    except ValueError:
+        public_key = load_pem_public_key(pem.encode())
+
+        return Key(kid, key_algorithm(public_key), public_key)
+
+    public_key = private_key.public_key()
+
+    return Key(kid, key_algorithm(public_key), public_key, private_key)
+
+
+class Keyring:
+    def __init__(self, keys, signing_kid: str | None = None):
+        self.keys = {key.kid: key for key in keys}
+        self.signing = self.keys.get(signing_kid)
+
+        if self.signing is None or self.signing.signing_key is None:
+            raise ValueError(f'No private key for kid {signing_kid!r}')
+
+        self.jwks_body = json.dumps({
+            'keys': [
+                self.public_jwk(key)
+                for key in self.keys.values()
+                if key.kid is not None
+            ]
+        }).encode()
+
+    @staticmethod
+    def public_jwk(key: Key):
+        algorithm = get_default_algorithms()[key.algorithm]
+
+        return {
+            **algorithm.to_jwk(key.verifying_key, as_dict=True),
+            'kid': key.kid,
+            'alg': key.algorithm,
+            'use': 'sig',
+        }
+
+    def encode(self, payload: dict):
+        headers = {'kid': self.signing.kid} if self.signing.kid else None
+
+        return encode(
+            payload,
+            self.signing.signing_key,
+            algorithm=self.signing.algorithm,
+            headers=headers,
+        )
+
+    def decode(self, token: str):
+        key = self.keys.get(get_unverified_header(token).get('kid'))
+
+        if key is None:
+            raise InvalidTokenError('Unknown key id')
+
+        return decode(token, key.verifying_key, algorithms=[key.algorithm])
+
+
+def load_keyring(settings):
+    if not settings.JWT_KEYS:
+        secret = settings.SECRET_KEY
+
+        return Keyring([Key(None, settings.ALGORITHM, secret, secret)])
+
+    return Keyring(
+        [load_key(kid, pem) for kid, pem in settings.JWT_KEYS.items()],
+        signing_kid=settings.JWT_SIGNING_KEY_ID,
+    )
@@ -0,0 +1,183 @@
+import threading
+from bisect import bisect_left
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+
+    if not pairs:
+        return ''
+
+    escaped = (
+        (name, str(value).replace('\\', r'\\').replace('"', r'\"'))
+        for name, value in pairs
+    )
+
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def format_value(value: float):
+    if value == float('inf'):
+        return '+Inf'
+
+    return repr(float(value))
+
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+
+        return self._values.get(key, 0.0)
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+
+        for key, value in values:
+            yield self.name, format_labels(self.labelnames, key), value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    type = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets=DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+
+        with self._lock:
+            entry = self._values.setdefault(
+                key, [[0] * (len(self.buckets) + 1), 0.0]
+            )
+            entry[0][index] += 1
+            entry[1] += value
+
+    def count(self, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        counts, _ = self._values.get(key, ([0], 0.0))
+
+        return sum(counts)
+
+    def sum(self, **labels):
+        key = tuple(labels.get(name, '') for name in self.labelnames)
+        _, total = self._values.get(key, ([0], 0.0))
+
+        return total
+
+    def samples(self):
+        with self._lock:
+            values = [
+                (key, list(counts), total)
+                for key, (counts, total) in self._values.items()
+            ]
+
+        for key, counts, total in values:
+            cumulative = 0
+
+            for bound, count in zip((*self.buckets, float('inf')), counts):
+                cumulative += count
+                labels = format_labels(
+                    self.labelnames, key, (('le', format_value(bound)),)
+                )
+                yield f'{self.name}_bucket', labels, cumulative
+
+            labels = format_labels(self.labelnames, key)
+            yield f'{self.name}_sum', labels, total
+            yield f'{self.name}_count', labels, cumulative
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def register(self, metric):
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames=(),
+        buckets=DEFAULT_BUCKETS,
+    ):
+        return self.register(
+            Histogram(name, documentation, labelnames, buckets)
+        )
+
+    def __iter__(self):
+        return iter(self._metrics.values())
+
+    def clear(self):
+        for metric in self:
+            metric.clear()
+
+    def render(self):
+        lines = []
+
+        for metric in self:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            lines.extend(
+                f'{name}{labels} {format_value(value)}'
+                for name, labels, value in metric.samples()
+            )
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
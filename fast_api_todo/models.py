@@ -1,19 +1,90 @@
 from datetime import datetime
+from enum import Enum
 
-from sqlalchemy import func
+from sqlalchemy import DateTime, ForeignKey, Index, String, func
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import Mapped, mapped_column, registry
 
 table_registry = registry()
 
+# SQLite stores CURRENT_TIMESTAMP with second precision; binding cursor
+# values in the same format keeps keyset comparisons on created_at exact.
+Timestamp = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format=(
+            '%(year)04d-%(month)02d-%(day)02d '
+            '%(hour)02d:%(minute)02d:%(second)02d'
+        )
+    ),
+    'sqlite',
+)
+
+
+class TodoState(str, Enum):
+    draft = 'draft'
+    todo = 'todo'
+    doing = 'doing'
+    done = 'done'
+    trash = 'trash'
+
 
 @table_registry.mapped_as_dataclass
 class User:
     __tablename__ = 'users'
+    __mapper_args__ = {'eager_defaults': True}
 
     id: Mapped[int] = mapped_column(init=False, primary_key=True)
     username: Mapped[str] = mapped_column(unique=True)
     email: Mapped[str] = mapped_column(unique=True)
-    password: Mapped[str]
+    password: Mapped[str] = mapped_column(deferred=True)
+    created_at: Mapped[datetime] = mapped_column(
+        Timestamp, init=False, server_default=func.now()
+    )
+
+
+@table_registry.mapped_as_dataclass
+class Todo:
+    __tablename__ = 'todos'
+    __table_args__ = (
+        Index('ix_todos_user_id_state', 'user_id', 'state', 'created_at'),
+        Index('ix_todos_user_id_created_at', 'user_id', 'created_at'),
+    )
+    __mapper_args__ = {'eager_defaults': True}
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    title: Mapped[str]
+    description: Mapped[str]
+    state: Mapped[TodoState]
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE')
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        Timestamp, init=False, server_default=func.now()
+    )
+
+
+@table_registry.mapped_as_dataclass
+class RevokedToken:
+    __tablename__ = 'revoked_tokens'
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    jti: Mapped[str] = mapped_column(unique=True)
+    expires_at: Mapped[datetime] = mapped_column(index=True)
+    revoked_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
+
+
+@table_registry.mapped_as_dataclass
+class RefreshToken:
+    __tablename__ = 'refresh_tokens'
+
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    token_hash: Mapped[str] = mapped_column(String(64), unique=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE'), index=True
+    )
+    expires_at: Mapped[datetime] = mapped_column(index=True)
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
     )
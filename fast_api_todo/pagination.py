@@ -0,0 +1,29 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+
+def encode_cursor(*values):
+    raw = json.dumps(values, separators=(',', ':'), default=str).encode()
+
+    return urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str, *types):
+    try:
+        padding = '=' * (-len(cursor) % 4)
+        values = json.loads(urlsafe_b64decode(cursor + padding))
+    except (BinasciiError, UnicodeDecodeError, ValueError):
+        values = None
+
+    if not isinstance(values, list) or not (
+        len(values) == len(types) and all(map(isinstance, values, types))
+    ):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail='Invalid cursor'
+        )
+
+    return values
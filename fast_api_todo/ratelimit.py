@@ -0,0 +1,211 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import OAuth2PasswordRequestForm
+
+from fast_api_todo.metrics import registry
+from fast_api_todo.settings import Settings
+
+try:
+    import redis
+except ImportError:  # pragma: no cover
+    redis = None
+
+settings = Settings()  # type: ignore
+
+rate_limit_rejected_total = registry.counter(
+    'rate_limit_rejected_total',
+    'Requests rejected by a rate limit.',
+    labelnames=('scope',),
+)
+
+
+def sliding_window(previous: int, current: int, limit: int, progress: float):
+    estimated = previous * (1 - progress) + current
+
+    if estimated + 1 <= limit:
+        return True, 0.0
+
+    if current + 1 > limit or not previous:
+        return False, 1 - progress
+
+    return False, (estimated + 1 - limit) / previous
+
+
+class MemoryRateLimitBackend:
+    def __init__(self, maxsize: int = 100_000):
+        self.maxsize = maxsize
+        self._windows: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._windows)
+
+    def hit(self, key: str, limit: int, window: float, count: bool = True):
+        now = time.time()
+        bucket, offset = divmod(now, window)
+
+        with self._lock:
+            last_bucket, previous, current = self._windows.get(
+                key, (bucket, 0, 0)
+            )
+
+            if last_bucket == bucket - 1:
+                previous, current = current, 0
+            elif last_bucket < bucket - 1:
+                previous, current = 0, 0
+
+            allowed, wait = sliding_window(
+                previous, current, limit, offset / window
+            )
+
+            # Peeks must not take store slots away from counted keys.
+            if not count:
+                return allowed, math.ceil(wait * window)
+
+            if allowed:
+                current += 1
+
+            self._windows[key] = (bucket, previous, current)
+            self._windows.move_to_end(key)
+
+            while len(self._windows) > self.maxsize:
+                self._windows.popitem(last=False)
+
+        return allowed, math.ceil(wait * window)
+
+    def clear(self):
+        with self._lock:
+            self._windows.clear()
+
+
+class RedisRateLimitBackend:
+    def __init__(self, client, prefix: str = 'fast_api_todo:ratelimit:'):
+        self.client = client
+        self.prefix = prefix
+
+    def hit(self, key: str, limit: int, window: float, count: bool = True):
+        bucket, offset = divmod(time.time(), window)
+        current_key = f'{self.prefix}{key}:{int(bucket)}'
+        previous_key = f'{self.prefix}{key}:{int(bucket) - 1}'
+
+        if not count:
+            allowed, wait = sliding_window(
+                int(self.client.get(previous_key) or 0),
+                int(self.client.get(current_key) or 0),
+                limit,
+                offset / window,
+            )
+
+            return allowed, math.ceil(wait * window)
+
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.incr(current_key)
+        pipeline.pexpire(current_key, math.ceil(window * 2000))
+        pipeline.get(previous_key)
+        current, _, previous = pipeline.execute()
+
+        allowed, wait = sliding_window(
+            int(previous or 0), current - 1, limit, offset / window
+        )
+
+        if not allowed:
+            self.client.decr(current_key)
+
+        return allowed, math.ceil(wait * window)
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f'{self.prefix}*'))
+
+        if keys:
+            self.client.delete(*keys)
+
+
+def create_rate_limit_backend(url: str | None = None, maxsize: int = 100_000):
+    if not url:
+        return MemoryRateLimitBackend(maxsize=maxsize)
+
+    if redis is None:
+        raise RuntimeError(
+            'The redis package is required for a Redis rate limit backend'
+        )
+
+    return RedisRateLimitBackend(redis.Redis.from_url(url))
+
+
+def rate_limit_exception(retry_after: int):
+    return HTTPException(
+        status_code=HTTPStatus.TOO_MANY_REQUESTS,
+        detail='Too many requests, try again later',
+        headers={'Retry-After': str(max(1, retry_after))},
+    )
+
+
+def client_ip(request: Request):
+    return request.client.host if request.client else 'unknown'
+
+
+class RateLimit:
+    def __init__(self, scope: str, limit: int, window: float, backend):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+        self.backend = backend
+
+    def check(self, key: str, count: bool = True):
+        if self.limit <= 0:
+            return
+
+        allowed, retry_after = self.backend.hit(
+            f'{self.scope}:{key}', self.limit, self.window, count
+        )
+
+        if not allowed:
+            rate_limit_rejected_total.inc(scope=self.scope)
+            raise rate_limit_exception(retry_after)
+
+    def hit(self, key: str):
+        if self.limit > 0:
+            self.backend.hit(f'{self.scope}:{key}', self.limit, self.window)
+
+    def __call__(self, request: Request):
+        self.check(client_ip(request))
+
+
+rate_limit_backend = create_rate_limit_backend(
+    settings.RATE_LIMIT_URL, maxsize=settings.RATE_LIMIT_STORE_SIZE
+)
+login_ip_limit = RateLimit(
+    'login_ip',
+    settings.LOGIN_RATE_LIMIT_PER_IP,
+    settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+    rate_limit_backend,
+)
+login_username_limit = RateLimit(
+    'login_username',
+    settings.LOGIN_RATE_LIMIT_PER_USERNAME,
+    settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+    rate_limit_backend,
+)
+
+
+def api_rate_limit(scope: str):
+    return RateLimit(
+        scope,
+        settings.API_RATE_LIMIT,
+        settings.API_RATE_LIMIT_WINDOW_SECONDS,
+        rate_limit_backend,
+    )
+
+
+def login_rate_limit(
+    request: Request, form_data: OAuth2PasswordRequestForm = Depends()
+):
+    login_ip_limit(request)
+    # Only failed attempts count against a username, so its owner can still
+    # log in; they are recorded once the password check fails.
+    login_username_limit.check(form_data.username.lower(), count=False)
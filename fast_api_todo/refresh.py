@@ -0,0 +1,59 @@
+import secrets
+from datetime import datetime, timedelta
+from hashlib import sha256
+
+from sqlalchemy import delete, insert, select
+from zoneinfo import ZoneInfo
+
+from fast_api_todo.models import RefreshToken, User
+
+
+def hash_refresh_token(token: str):
+    # Tokens are random, so a fast unsalted hash is enough to keep the
+    # table useless to whoever reads it.
+    return sha256(token.encode()).hexdigest()
+
+
+def issue_query(user_id: int, expire_days: int):
+    token = secrets.token_urlsafe(32)
+    query = insert(RefreshToken).values(
+        token_hash=hash_refresh_token(token),
+        user_id=user_id,
+        expires_at=datetime.now(tz=ZoneInfo('UTC'))
+        + timedelta(days=expire_days),
+    )
+
+    return token, query
+
+
+def consume_query(token: str):
+    return (
+        delete(RefreshToken)
+        .where(
+            RefreshToken.token_hash == hash_refresh_token(token),
+            RefreshToken.expires_at > datetime.now(tz=ZoneInfo('UTC')),
+        )
+        .returning(
+            RefreshToken.user_id,
+            select(User.email)
+            .where(User.id == RefreshToken.user_id)
+            .scalar_subquery()
+            .label('email'),
+        )
+    )
+
+
+def revoke_query(token: str):
+    return delete(RefreshToken).where(
+        RefreshToken.token_hash == hash_refresh_token(token)
+    )
+
+
+def revoke_user_query(user_id: int):
+    return delete(RefreshToken).where(RefreshToken.user_id == user_id)
+
+
+def prune_query():
+    return delete(RefreshToken).where(
+        RefreshToken.expires_at <= datetime.now(tz=ZoneInfo('UTC'))
+    )
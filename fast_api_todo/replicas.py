@@ -0,0 +1,188 @@
+import itertools
+import logging
+import threading
+import time
+from http import HTTPStatus
+from http.cookies import SimpleCookie
+
+from sqlalchemy import Select, event
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger('fast_api_todo.replicas')
+
+PRIMARY_COOKIE = 'read_primary_until'
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+def ping(engine):
+    try:
+        with engine.connect() as connection:
+            connection.exec_driver_sql('SELECT 1')
+    except SQLAlchemyError:
+        return False
+
+    return True
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        engines,
+        strategy: str = 'round_robin',
+        health_check_interval: float = 30.0,
+    ):
+        self.engines = list(engines)
+        self.strategy = strategy
+        self.health_check_interval = health_check_interval
+        self.healthy = list(self.engines)
+        self.connections = dict.fromkeys(self.engines, 0)
+        self._counter = itertools.count()
+        self._checked_at = time.monotonic()
+        self._lock = threading.Lock()
+
+        for engine in self.engines:
+            event.listen(engine, 'checkout', self._on_checkout(engine))
+            event.listen(engine, 'checkin', self._on_checkin(engine))
+
+    def __bool__(self):
+        return bool(self.engines)
+
+    def _on_checkout(self, engine):
+        def checkout(*args):
+            with self._lock:
+                self.connections[engine] += 1
+
+        return checkout
+
+    def _on_checkin(self, engine):
+        def checkin(*args):
+            with self._lock:
+                self.connections[engine] -= 1
+
+        return checkin
+
+    def check_health(self):
+        healthy = [engine for engine in self.engines if ping(engine)]
+
+        for engine in set(self.healthy) - set(healthy):
+            logger.warning('Dropping unhealthy replica %r', engine.url)
+
+        for engine in set(healthy) - set(self.healthy):
+            logger.info('Restoring replica %r', engine.url)
+
+        self.healthy = healthy
+        self._checked_at = time.monotonic()
+
+        return healthy
+
+    def choose(self):
+        if not self.engines:
+            return None
+
+        with self._lock:
+            now = time.monotonic()
+            due = now - self._checked_at >= self.health_check_interval
+
+            if due:
+                self._checked_at = now
+
+        if due:
+            self.check_health()
+
+        healthy = self.healthy
+
+        if not healthy:
+            return None
+
+        if self.strategy == 'least_connections':
+            return min(healthy, key=self.connections.__getitem__)
+
+        return healthy[next(self._counter) % len(healthy)]
+
+
+class RoutingSession(Session):
+    # Replicas trail the primary, so reads marked primary=True skip them.
+    replica_lag = True
+
+    def __init__(self, primary, replica, **kwargs):
+        super().__init__(bind=primary, **kwargs)
+        self.replica = replica
+        self._wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            not self._wrote
+            and not self._flushing
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and not (
+                self.replica_lag
+                and clause.get_execution_options().get('primary')
+            )
+        ):
+            return self.replica
+
+        if self._flushing or (
+            clause is not None
+            and (
+                not isinstance(clause, Select)
+                or clause._for_update_arg is not None
+            )
+        ):
+            # Reads after a write in the same transaction must see it.
+            self._wrote = True
+
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+    def commit(self):
+        self._wrote = False
+        super().commit()
+
+    def rollback(self):
+        self._wrote = False
+        super().rollback()
+
+    def close(self):
+        self._wrote = False
+        super().close()
+
+
+def reads_from_primary(cookies: dict):
+    try:
+        return float(cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app, window: float = 5.0):
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if (
+                message['type'] == 'http.response.start'
+                and message['status'] < HTTPStatus.BAD_REQUEST
+            ):
+                cookie = SimpleCookie()
+                cookie[PRIMARY_COOKIE] = str(time.time() + self.window)
+                cookie[PRIMARY_COOKIE]['max-age'] = round(self.window)
+                cookie[PRIMARY_COOKIE]['path'] = '/'
+                cookie[PRIMARY_COOKIE]['httponly'] = True
+                message['headers'] = [
+                    *message.get('headers', []),
+                    (
+                        b'set-cookie',
+                        cookie.output(header='').strip().encode(),
+                    ),
+                ]
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
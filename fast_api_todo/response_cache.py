@@ -0,0 +1,93 @@
+import time
+
+from fast_api_todo.cache import create_cache
+from fast_api_todo.metrics import registry
+from fast_api_todo.settings import Settings
+from fast_api_todo.singleflight import AsyncSingleFlight, SingleFlight
+
+settings = Settings()  # type: ignore
+response_cache = create_cache(
+    settings.RESPONSE_CACHE_URL, maxsize=settings.RESPONSE_CACHE_SIZE
+)
+flight = SingleFlight(settings.SINGLE_FLIGHT)
+async_flight = AsyncSingleFlight(settings.SINGLE_FLIGHT)
+
+USERS_TAG = 'users'
+
+response_cache_hits = registry.counter(
+    'response_cache_hits_total', 'Responses served from the response cache.'
+)
+response_cache_misses = registry.counter(
+    'response_cache_misses_total',
+    'Cacheable responses rendered from the database.',
+)
+
+
+def user_key(user_id: int):
+    return f'user:{user_id}'
+
+
+def users_page_key(limit: int, offset: int, cursor: str | None):
+    # Cursor pages ignore the offset, so it must not split their keys.
+    return f'users:{limit}:{0 if cursor else offset}:{cursor or ""}'
+
+
+def get_cached_body(key: str):
+    body = response_cache.get(key)
+
+    if body is None:
+        response_cache_misses.inc()
+    else:
+        response_cache_hits.inc()
+
+    return body
+
+
+def users_generation():
+    return response_cache.generation(USERS_TAG)
+
+
+def cache_ttl(session):
+    # A replica can return rows older than a write its author no longer
+    # sees once the read-your-writes window closes.
+    if getattr(session, 'replica_lag', False):
+        return min(
+            settings.RESPONSE_CACHE_TTL_SECONDS,
+            settings.READ_YOUR_WRITES_SECONDS,
+        )
+
+    return settings.RESPONSE_CACHE_TTL_SECONDS
+
+
+def cache_body(
+    key: str,
+    body: bytes,
+    generation: int,
+    ttl: float = settings.RESPONSE_CACHE_TTL_SECONDS,
+    tag: str | None = None,
+):
+    # A write that committed while the body rendered has bumped the
+    # generation, and storing the body would serve it stale until the TTL.
+    if users_generation() != generation:
+        return body
+
+    response_cache.set(
+        key,
+        body,
+        expires_at=time.time() + ttl,
+        tag=tag,
+    )
+
+    if users_generation() != generation:
+        response_cache.delete(key)
+
+    return body
+
+
+def invalidate_users(user_id: int | None = None):
+    response_cache.bump_generation(USERS_TAG)
+
+    if user_id is not None:
+        response_cache.delete(user_key(user_id))
+
+    response_cache.invalidate_tag(USERS_TAG)
@@ -0,0 +1,57 @@
+from hashlib import blake2b
+from http import HTTPStatus
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from fast_api_todo.models import User
+from fast_api_todo.schemas import UserListSchema, UserPublicSchema
+
+USER_PUBLIC_COLUMNS = (User.id, User.username, User.email)
+
+
+def public_user(row):
+    return UserPublicSchema.model_construct(
+        id=row.id, username=row.username, email=row.email
+    )
+
+
+def public_users_page(rows, next_cursor: str | None):
+    return UserListSchema.model_construct(
+        users=[public_user(row) for row in rows], next_cursor=next_cursor
+    )
+
+
+def model_response(model: BaseModel, status_code: int = HTTPStatus.OK):
+    return Response(
+        model.model_dump_json(exclude_none=True),
+        status_code=status_code,
+        media_type='application/json',
+    )
+
+
+def make_etag(body: bytes):
+    return f'"{blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str):
+    candidates = {
+        candidate.strip().removeprefix('W/')
+        for candidate in if_none_match.split(',')
+    }
+
+    return '*' in candidates or etag in candidates
+
+
+def json_response(request: Request, body: bytes):
+    etag = make_etag(body)
+    if_none_match = request.headers.get('if-none-match')
+
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(
+            status_code=HTTPStatus.NOT_MODIFIED, headers={'ETag': etag}
+        )
+
+    return Response(
+        body, media_type='application/json', headers={'ETag': etag}
+    )
@@ -0,0 +1,155 @@
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from hashlib import blake2b
+
+from sqlalchemy import delete, select
+from zoneinfo import ZoneInfo
+
+from fast_api_todo.models import RevokedToken
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray(self.size // 8 + 1)
+
+    def _positions(self, key: str):
+        digest = blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+
+        for index in range(self.hashes):
+            yield (first + index * second) % self.size
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+        self.count += 1
+
+    def __contains__(self, key: str):
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class RevocationList:
+    def __init__(
+        self,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        sync_interval: float = 5.0,
+        sync_overlap: float = 60.0,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.sync_overlap = timedelta(seconds=sync_overlap)
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.bloom = BloomFilter(self.capacity, self.error_rate)
+            self.synced_until = None
+            self._synced_at = None
+            self._rebuild = None
+
+    def add(self, jti: str):
+        self.bloom.add(jti)
+
+        # Revocations made while the replacement filter is being filled
+        # would otherwise be lost when it is swapped in.
+        if self._rebuild is not None:
+            self._rebuild.append(jti)
+
+    def might_contain(self, jti: str):
+        return jti in self.bloom
+
+    def sync_due(self):
+        with self._lock:
+            now = time.monotonic()
+
+            if (
+                self._synced_at is not None
+                and now - self._synced_at < self.sync_interval
+            ):
+                return False
+
+            self._synced_at = now
+
+            if (
+                self._rebuild is None
+                and self.bloom.count >= self.bloom.capacity
+            ):
+                self._rebuild = []
+
+            return True
+
+    def sync_query(self):
+        rebuild = self._rebuild
+        query = select(RevokedToken.jti, RevokedToken.revoked_at).where(
+            RevokedToken.expires_at > datetime.now(tz=ZoneInfo('UTC'))
+        )
+
+        # Rows can commit out of revoked_at order, so each sync re-reads a
+        # trailing window instead of starting after the newest row seen.
+        if rebuild is None and self.synced_until is not None:
+            query = query.where(
+                RevokedToken.revoked_at
+                >= self.synced_until - self.sync_overlap
+            )
+
+        return query.execution_options(primary=True), rebuild
+
+    def apply(self, rows, rebuild=None):
+        # Bloom filters cannot forget: rebuild from unexpired rows aside and
+        # swap it in once filled, so lookups never see a partial filter.
+        bloom = (
+            self.bloom
+            if rebuild is None
+            else BloomFilter(
+                max(self.capacity, self.bloom.count * 2), self.error_rate
+            )
+        )
+        synced_until = self.synced_until
+
+        for row in rows:
+            if row.jti not in bloom:
+                bloom.add(row.jti)
+
+            if synced_until is None or row.revoked_at > synced_until:
+                synced_until = row.revoked_at
+
+        with self._lock:
+            if rebuild is not None and rebuild is self._rebuild:
+                for jti in rebuild:
+                    bloom.add(jti)
+
+                self.bloom = bloom
+                self._rebuild = None
+
+            self.synced_until = synced_until
+
+    @staticmethod
+    def lookup_query(jti: str):
+        return (
+            select(RevokedToken.id)
+            .where(RevokedToken.jti == jti)
+            .execution_options(primary=True)
+        )
+
+    @staticmethod
+    def prune_query():
+        return delete(RevokedToken).where(
+            RevokedToken.expires_at <= datetime.now(tz=ZoneInfo('UTC'))
+        )
@@ -0,0 +1,327 @@
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from fast_api_todo.constraints import (
+    user_conflict_exception,
+    user_conflicts_query,
+)
+from fast_api_todo.database import get_async_session
+from fast_api_todo.export import (
+    MEDIA_TYPES,
+    ExportFormat,
+    export_header,
+    export_users_query,
+    format_rows,
+)
+from fast_api_todo.models import User
+from fast_api_todo.pagination import decode_cursor, encode_cursor
+from fast_api_todo.ratelimit import api_rate_limit
+from fast_api_todo.refresh import revoke_user_query
+from fast_api_todo.response_cache import (
+    USERS_TAG,
+    async_flight,
+    cache_body,
+    get_cached_body,
+    invalidate_users,
+    user_key,
+    users_generation,
+    users_page_key,
+)
+from fast_api_todo.responses import (
+    USER_PUBLIC_COLUMNS,
+    json_response,
+    model_response,
+    public_user,
+    public_users_page,
+)
+from fast_api_todo.schemas import (
+    Message,
+    UserListSchema,
+    UserPublicSchema,
+    UserSchema,
+    UserUpdateSchema,
+)
+from fast_api_todo.security import (
+    Principal,
+    get_current_user_async,
+    get_password_hash_async,
+    invalidate_principal,
+    oauth2_schema,
+    revoke_token_async,
+)
+from fast_api_todo.settings import Settings
+
+settings = Settings()  # type: ignore
+router = APIRouter(
+    prefix='/users',
+    tags=['users'],
+    dependencies=[Depends(api_rate_limit('users'))],
+)
+T_Session = Annotated[AsyncSession, Depends(get_async_session)]
+T_Token = Annotated[str, Depends(oauth2_schema)]
+T_CurrentUser = Annotated[Principal, Depends(get_current_user_async)]
+
+
+@router.post(
+    '/', status_code=HTTPStatus.CREATED, response_model=UserPublicSchema
+)
+async def create_user(user: UserSchema, session: T_Session):
+    password = await get_password_hash_async(user.password)
+
+    try:
+        result = await session.execute(
+            insert(User)
+            .values(
+                username=user.username, email=user.email, password=password
+            )
+            .returning(*USER_PUBLIC_COLUMNS)
+        )
+        db_user = result.one()
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        usernames = await session.scalars(
+            user_conflicts_query(user.username, user.email)
+        )
+        raise user_conflict_exception(usernames.all(), user.username)
+
+    invalidate_users()
+
+    return model_response(public_user(db_user), HTTPStatus.CREATED)
+
+
+@router.get(
+    '/',
+    status_code=HTTPStatus.OK,
+    response_model=UserListSchema,
+    response_model_exclude_none=True,
+)
+async def get_users(
+    request: Request,
+    session: T_Session,
+    limit: Annotated[int, Query(ge=1, le=settings.MAX_PAGE_SIZE)] = 10,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    cursor: str | None = None,
+):
+    key = users_page_key(limit, offset, cursor)
+    body = get_cached_body(key)
+
+    async def load():
+        generation = users_generation()
+        query = select(*USER_PUBLIC_COLUMNS).order_by(User.id).limit(limit)
+
+        if cursor:
+            (last_id,) = decode_cursor(cursor, int)
+            query = query.where(User.id > last_id)
+        else:
+            query = query.offset(offset)
+
+        # The shared read outlives the leader's request, and with it the
+        # request session, so it reads through a session of its own.
+        async with AsyncSession(session.bind) as flight_session:
+            users = (await flight_session.execute(query)).all()
+
+        next_cursor = (
+            encode_cursor(users[-1].id) if len(users) == limit else None
+        )
+        page = public_users_page(users, next_cursor)
+
+        return cache_body(
+            key,
+            page.model_dump_json(exclude_none=True).encode(),
+            generation,
+            tag=USERS_TAG,
+        )
+
+    if body is None:
+        body = await async_flight.do(key, load)
+
+    return json_response(request, body)
+
+
+@router.get('/export', response_class=StreamingResponse)
+async def export_users(
+    session: T_Session,
+    export_format: Annotated[
+        ExportFormat, Query(alias='format')
+    ] = ExportFormat.ndjson,
+):
+    engine = session.bind
+
+    async def stream():
+        async with engine.connect() as connection:
+            result = await connection.stream(export_users_query())
+
+            yield export_header(export_format)
+
+            async for rows in result.partitions():
+                yield format_rows(rows, export_format)
+
+    return StreamingResponse(stream(), media_type=MEDIA_TYPES[export_format])
+
+
+@router.get('/{user_id}', response_model=UserPublicSchema)
+async def get_user(user_id: int, request: Request, session: T_Session):
+    key = user_key(user_id)
+    body = get_cached_body(key)
+
+    async def load():
+        generation = users_generation()
+        async with AsyncSession(session.bind) as flight_session:
+            db_user = (
+                await flight_session.execute(
+                    select(*USER_PUBLIC_COLUMNS).where(User.id == user_id)
+                )
+            ).one_or_none()
+
+        if not db_user:
+            return None
+
+        return cache_body(
+            key, public_user(db_user).model_dump_json().encode(), generation
+        )
+
+    if body is None:
+        body = await async_flight.do(key, load)
+
+    if body is None:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='User not found'
+        )
+
+    return json_response(request, body)
+
+
+@router.put(
+    '/{user_id}',
+    status_code=HTTPStatus.OK,
+    response_model=UserPublicSchema,
+)
+async def update_user(
+    user_id: int,
+    user: UserSchema,
+    session: T_Session,
+    current_user: T_CurrentUser,
+):
+    if current_user.id != user_id:
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN, detail='Not enough permission'
+        )
+
+    password = await get_password_hash_async(user.password)
+
+    try:
+        result = await session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(
+                username=user.username, email=user.email, password=password
+            )
+            .returning(*USER_PUBLIC_COLUMNS)
+        )
+        db_user = result.one_or_none()
+        # A new password must also end sessions the old one started.
+        await session.execute(revoke_user_query(user_id))
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        usernames = await session.scalars(
+            user_conflicts_query(user.username, user.email, user_id)
+        )
+        raise user_conflict_exception(usernames.all(), user.username)
+
+    if not db_user:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='User not found'
+        )
+
+    invalidate_principal(user_id)
+    invalidate_users(user_id)
+
+    return model_response(public_user(db_user))
+
+
+@router.patch(
+    '/{user_id}',
+    status_code=HTTPStatus.OK,
+    response_model=UserPublicSchema,
+)
+async def patch_user(
+    user_id: int,
+    user: UserUpdateSchema,
+    session: T_Session,
+    current_user: T_CurrentUser,
+):
+    if current_user.id != user_id:
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN, detail='Not enough permission'
+        )
+
+    values = user.model_dump(exclude_unset=True, exclude_none=True)
+
+    if 'password' in values:
+        values['password'] = await get_password_hash_async(values['password'])
+
+    if not values:
+        result = await session.execute(
+            select(*USER_PUBLIC_COLUMNS).where(User.id == user_id)
+        )
+        db_user = result.one_or_none()
+    else:
+        try:
+            result = await session.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(**values)
+                .returning(*USER_PUBLIC_COLUMNS)
+            )
+            db_user = result.one_or_none()
+
+            if 'password' in values:
+                await session.execute(revoke_user_query(user_id))
+
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            usernames = await session.scalars(
+                user_conflicts_query(user.username, user.email, user_id)
+            )
+            raise user_conflict_exception(usernames.all(), user.username)
+
+        invalidate_principal(user_id)
+        invalidate_users(user_id)
+
+    if not db_user:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='User not found'
+        )
+
+    return model_response(public_user(db_user))
+
+
+@router.delete('/{user_id}', response_model=Message)
+async def delete_user(
+    user_id: int,
+    session: T_Session,
+    token: T_Token,
+    current_user: T_CurrentUser,
+):
+    if current_user.id != user_id:
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN, detail='Not enough permission'
+        )
+
+    await session.execute(revoke_user_query(user_id))
+    await session.execute(delete(User).where(User.id == user_id))
+    await session.commit()
+    invalidate_principal(user_id)
+    invalidate_users(user_id)
+    await revoke_token_async(session, token)
+
+    return {'message': 'User deleted'}
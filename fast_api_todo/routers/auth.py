@@ -3,45 +3,119 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
 from fast_api_todo.database import get_session
 from fast_api_todo.models import User
+from fast_api_todo.ratelimit import login_rate_limit, login_username_limit
 from fast_api_todo.schemas import (
+    Message,
+    RefreshTokenSchema,
     TokenSchema,
 )
 from fast_api_todo.security import (
+    Principal,
     create_access_token,
     get_current_user,
-    verify_password,
+    issue_refresh_token,
+    oauth2_schema,
+    revoke_refresh_token,
+    revoke_token,
+    rotate_refresh_token,
+    verify_and_update_password,
 )
 
 router = APIRouter(prefix='/auth', tags=['auth'])
 T_Session = Annotated[Session, Depends(get_session)]
 T_OAuth2Form = Annotated[OAuth2PasswordRequestForm, Depends()]
+T_Token = Annotated[str, Depends(oauth2_schema)]
 
 
-@router.post('/token', response_model=TokenSchema)
+@router.post(
+    '/token',
+    response_model=TokenSchema,
+    dependencies=[Depends(login_rate_limit)],
+)
 def login_for_acess_token(
     session: T_Session,
     form_data: T_OAuth2Form,
 ):
-    user = session.scalar(select(User).where(User.email == form_data.username))
+    user = session.execute(
+        select(User.id, User.email, User.password).where(
+            User.email == form_data.username
+        )
+    ).one_or_none()
+
+    valid, updated_hash = False, None
+
+    if user:
+        valid, updated_hash = verify_and_update_password(
+            form_data.password, user.password
+        )
 
-    if not user or not verify_password(form_data.password, user.password):
+    if not valid:
+        login_username_limit.hit(form_data.username.lower())
         raise HTTPException(
             status_code=HTTPStatus.BAD_REQUEST,
             detail='Incorrect email or password',
         )
 
+    if updated_hash:
+        session.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(password=updated_hash)
+        )
+
     access_token = create_access_token(data={'sub': user.email})
+    refresh_token = issue_refresh_token(session, user.id)
+
+    return {
+        'access_token': access_token,
+        'token_type': 'Bearer',
+        'refresh_token': refresh_token,
+    }
+
+
+@router.post('/refresh', response_model=TokenSchema)
+def refresh_tokens(session: T_Session, body: RefreshTokenSchema):
+    email, refresh_token = rotate_refresh_token(session, body.refresh_token)
+    access_token = create_access_token(data={'sub': email})
 
-    return {'access_token': access_token, 'token_type': 'Bearer'}
+    return {
+        'access_token': access_token,
+        'token_type': 'Bearer',
+        'refresh_token': refresh_token,
+    }
 
 
-@router.post('/refresh_token', response_model=TokenSchema)
-def refresh_access_token(user: User = Depends(get_current_user)):
+@router.post(
+    '/refresh_token',
+    response_model=TokenSchema,
+    response_model_exclude_none=True,
+)
+def refresh_access_token(
+    session: T_Session,
+    token: T_Token,
+    user: Principal = Depends(get_current_user),
+):
     new_access_token = create_access_token(data={'sub': user.email})
+    revoke_token(session, token)
 
     return {'access_token': new_access_token, 'token_type': 'bearer'}
+
+
+@router.post('/logout', response_model=Message)
+def logout(
+    session: T_Session,
+    token: T_Token,
+    body: RefreshTokenSchema | None = None,
+    user: Principal = Depends(get_current_user),
+):
+    revoke_token(session, token)
+
+    if body:
+        revoke_refresh_token(session, body.refresh_token)
+
+    return {'message': 'Logged out'}
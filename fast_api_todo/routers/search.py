@@ -0,0 +1,51 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from fast_api_todo.database import get_read_session
+from fast_api_todo.pagination import decode_cursor, encode_cursor
+from fast_api_todo.ratelimit import api_rate_limit
+from fast_api_todo.schemas import SearchFilterSchema, SearchResultsSchema
+from fast_api_todo.search import search_query
+from fast_api_todo.security import Principal, get_current_user
+from fast_api_todo.settings import Settings
+
+settings = Settings()  # type: ignore
+router = APIRouter(
+    prefix='/search',
+    tags=['search'],
+    dependencies=[Depends(api_rate_limit('search'))],
+)
+T_ReadSession = Annotated[Session, Depends(get_read_session)]
+T_CurrentUser = Annotated[Principal, Depends(get_current_user)]
+
+
+@router.get(
+    '/',
+    response_model=SearchResultsSchema,
+    response_model_exclude_none=True,
+)
+def search(
+    session: T_ReadSession,
+    user: T_CurrentUser,
+    filters: Annotated[SearchFilterSchema, Depends()],
+    limit: Annotated[int, Query(ge=1, le=settings.MAX_PAGE_SIZE)] = 10,
+    cursor: str | None = None,
+):
+    after = tuple(decode_cursor(cursor, float, int)) if cursor else None
+    query = search_query(
+        session.bind.dialect.name,
+        filters.scope,
+        filters.q,
+        user.id,
+        after,
+    ).limit(limit)
+
+    results = session.execute(query).all()
+    next_cursor = None
+
+    if len(results) == limit:
+        next_cursor = encode_cursor(results[-1].rank, results[-1].id)
+
+    return {filters.scope.value: results, 'next_cursor': next_cursor}
@@ -0,0 +1,170 @@
+from datetime import datetime
+from http import HTTPStatus
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, insert, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from fast_api_todo.database import get_read_session, get_session
+from fast_api_todo.models import Todo
+from fast_api_todo.pagination import decode_cursor, encode_cursor
+from fast_api_todo.ratelimit import api_rate_limit
+from fast_api_todo.schemas import (
+    Message,
+    TodoFilterSchema,
+    TodoListSchema,
+    TodoPublicSchema,
+    TodoSchema,
+    TodoUpdateSchema,
+)
+from fast_api_todo.security import Principal, get_current_user
+from fast_api_todo.settings import Settings
+
+settings = Settings()  # type: ignore
+router = APIRouter(
+    prefix='/todos',
+    tags=['todos'],
+    dependencies=[Depends(api_rate_limit('todos'))],
+)
+T_Session = Annotated[Session, Depends(get_session)]
+T_ReadSession = Annotated[Session, Depends(get_read_session)]
+T_CurrentUser = Annotated[Principal, Depends(get_current_user)]
+
+TODO_COLUMNS = (
+    Todo.id,
+    Todo.title,
+    Todo.description,
+    Todo.state,
+    Todo.created_at,
+)
+
+
+def todo_not_found_exception():
+    return HTTPException(
+        status_code=HTTPStatus.NOT_FOUND, detail='Todo not found'
+    )
+
+
+@router.post(
+    '/', status_code=HTTPStatus.CREATED, response_model=TodoPublicSchema
+)
+def create_todo(todo: TodoSchema, session: T_Session, user: T_CurrentUser):
+    db_todo = session.execute(
+        insert(Todo)
+        .values(**todo.model_dump(), user_id=user.id)
+        .returning(*TODO_COLUMNS)
+    ).one()
+    session.commit()
+
+    return db_todo
+
+
+@router.get(
+    '/',
+    status_code=HTTPStatus.OK,
+    response_model=TodoListSchema,
+    response_model_exclude_none=True,
+)
+def list_todos(
+    session: T_ReadSession,
+    user: T_CurrentUser,
+    filters: Annotated[TodoFilterSchema, Depends()],
+    limit: Annotated[int, Query(ge=1, le=settings.MAX_PAGE_SIZE)] = 10,
+    cursor: str | None = None,
+):
+    query = (
+        select(*TODO_COLUMNS)
+        .where(Todo.user_id == user.id)
+        .order_by(Todo.created_at, Todo.id)
+        .limit(limit)
+    )
+
+    if filters.state:
+        query = query.where(Todo.state == filters.state)
+
+    if filters.title:
+        query = query.where(
+            Todo.title.startswith(filters.title, autoescape=True)
+        )
+
+    if cursor:
+        created_at, last_id = decode_cursor(cursor, str, int)
+
+        try:
+            created_at = datetime.fromisoformat(created_at)
+        except ValueError:
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST, detail='Invalid cursor'
+            )
+
+        query = query.where(
+            tuple_(Todo.created_at, Todo.id) > (created_at, last_id)
+        )
+
+    todos = session.execute(query).all()
+    next_cursor = None
+
+    if len(todos) == limit:
+        next_cursor = encode_cursor(
+            todos[-1].created_at.isoformat(), todos[-1].id
+        )
+
+    return {'todos': todos, 'next_cursor': next_cursor}
+
+
+@router.get('/{todo_id}', response_model=TodoPublicSchema)
+def get_todo(todo_id: int, session: T_ReadSession, user: T_CurrentUser):
+    db_todo = session.execute(
+        select(*TODO_COLUMNS).where(
+            Todo.id == todo_id, Todo.user_id == user.id
+        )
+    ).one_or_none()
+
+    if not db_todo:
+        raise todo_not_found_exception()
+
+    return db_todo
+
+
+@router.patch('/{todo_id}', response_model=TodoPublicSchema)
+def patch_todo(
+    todo_id: int,
+    todo: TodoUpdateSchema,
+    session: T_Session,
+    user: T_CurrentUser,
+):
+    values = todo.model_dump(exclude_unset=True, exclude_none=True)
+
+    if not values:
+        db_todo = session.execute(
+            select(*TODO_COLUMNS).where(
+                Todo.id == todo_id, Todo.user_id == user.id
+            )
+        ).one_or_none()
+    else:
+        db_todo = session.execute(
+            update(Todo)
+            .where(Todo.id == todo_id, Todo.user_id == user.id)
+            .values(**values)
+            .returning(*TODO_COLUMNS)
+        ).one_or_none()
+        session.commit()
+
+    if not db_todo:
+        raise todo_not_found_exception()
+
+    return db_todo
+
+
+@router.delete('/{todo_id}', response_model=Message)
+def delete_todo(todo_id: int, session: T_Session, user: T_CurrentUser):
+    result = session.execute(
+        delete(Todo).where(Todo.id == todo_id, Todo.user_id == user.id)
+    )
+    session.commit()
+
+    if not result.rowcount:
+        raise todo_not_found_exception()
+
+    return {'message': 'Todo deleted'}
@@ -1,84 +1,244 @@
 from http import HTTPStatus
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from fast_api_todo.database import get_session
+from fast_api_todo.bulk import import_users_batch, iter_ndjson_lines
+from fast_api_todo.constraints import (
+    user_conflict_exception,
+    user_conflicts_query,
+)
+from fast_api_todo.database import get_read_session, get_session
+from fast_api_todo.export import (
+    MEDIA_TYPES,
+    ExportFormat,
+    export_header,
+    export_users_query,
+    format_rows,
+)
 from fast_api_todo.models import User
+from fast_api_todo.pagination import decode_cursor, encode_cursor
+from fast_api_todo.ratelimit import api_rate_limit
+from fast_api_todo.refresh import revoke_user_query
+from fast_api_todo.replicas import reads_from_primary
+from fast_api_todo.response_cache import (
+    USERS_TAG,
+    cache_body,
+    cache_ttl,
+    flight,
+    get_cached_body,
+    invalidate_users,
+    user_key,
+    users_generation,
+    users_page_key,
+)
+from fast_api_todo.responses import (
+    USER_PUBLIC_COLUMNS,
+    json_response,
+    model_response,
+    public_user,
+    public_users_page,
+)
 from fast_api_todo.schemas import (
+    BulkUserReportSchema,
     Message,
     UserListSchema,
     UserPublicSchema,
     UserSchema,
+    UserUpdateSchema,
 )
 from fast_api_todo.security import (
+    Principal,
     get_current_user,
     get_password_hash,
+    invalidate_principal,
+    oauth2_schema,
+    revoke_token,
 )
+from fast_api_todo.settings import Settings
 
-router = APIRouter(prefix='/users', tags=['users'])
+settings = Settings()  # type: ignore
+router = APIRouter(
+    prefix='/users',
+    tags=['users'],
+    dependencies=[Depends(api_rate_limit('users'))],
+)
 T_Session = Annotated[Session, Depends(get_session)]
-T_CurrentUser = Annotated[User, Depends(get_current_user)]
+T_ReadSession = Annotated[Session, Depends(get_read_session)]
+T_Token = Annotated[str, Depends(oauth2_schema)]
+T_CurrentUser = Annotated[Principal, Depends(get_current_user)]
 
 
 @router.post(
     '/', status_code=HTTPStatus.CREATED, response_model=UserPublicSchema
 )
 def create_user(user: UserSchema, session: T_Session):
-    db_user = session.scalar(
-        select(User).where(
-            (User.username == user.username) | (User.email == user.email)
-        )
-    )
+    password = get_password_hash(user.password)
 
-    if db_user:
-        if db_user.username == user.username:
-            raise HTTPException(
-                status_code=HTTPStatus.BAD_REQUEST,
-                detail='Username already existis',
+    try:
+        result = session.execute(
+            insert(User)
+            .values(
+                username=user.username, email=user.email, password=password
             )
-        elif db_user.email == user.email:
-            raise HTTPException(
-                status_code=HTTPStatus.BAD_REQUEST,
-                detail='Email already existis',
+            .returning(*USER_PUBLIC_COLUMNS)
+        )
+        db_user = result.one()
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        usernames = session.scalars(
+            user_conflicts_query(user.username, user.email)
+        )
+        raise user_conflict_exception(usernames.all(), user.username)
+
+    invalidate_users()
+
+    return model_response(public_user(db_user), HTTPStatus.CREATED)
+
+
+@router.post(
+    '/bulk',
+    status_code=HTTPStatus.OK,
+    response_model=BulkUserReportSchema,
+    response_model_exclude_none=True,
+    dependencies=[Depends(get_current_user)],
+)
+async def bulk_create_users(request: Request, session: T_Session):
+    results = []
+    batch = []
+
+    async for line in iter_ndjson_lines(request.stream()):
+        batch.append(line)
+
+        if len(batch) >= settings.BULK_BATCH_SIZE:
+            results += await run_in_threadpool(
+                import_users_batch, session, batch
             )
+            batch = []
 
-    db_user = User(
-        username=user.username,
-        email=user.email,
-        password=get_password_hash(user.password),
-    )
+    if batch:
+        results += await run_in_threadpool(import_users_batch, session, batch)
 
-    session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    created = sum(result['status'] == 'created' for result in results)
+
+    if created:
+        invalidate_users()
 
-    return db_user
+    return {
+        'created': created,
+        'failed': len(results) - created,
+        'results': results,
+    }
 
 
-@router.get('/', status_code=HTTPStatus.OK, response_model=UserListSchema)
+@router.get(
+    '/',
+    status_code=HTTPStatus.OK,
+    response_model=UserListSchema,
+    response_model_exclude_none=True,
+)
 def get_users(
-    session: T_Session,
-    limit: int = 10,
-    offset: int = 0,
+    request: Request,
+    session: T_ReadSession,
+    limit: Annotated[int, Query(ge=1, le=settings.MAX_PAGE_SIZE)] = 10,
+    offset: Annotated[int, Query(ge=0)] = 0,
+    cursor: str | None = None,
 ):
-    users = session.scalars(select(User).limit(limit).offset(offset))
+    key = users_page_key(limit, offset, cursor)
+    # Reads pinned to the primary must not see bodies cached from a replica.
+    pinned = reads_from_primary(request.cookies)
+    body = None if pinned else get_cached_body(key)
+
+    def load():
+        generation = users_generation()
+        query = select(*USER_PUBLIC_COLUMNS).order_by(User.id).limit(limit)
+
+        if cursor:
+            (last_id,) = decode_cursor(cursor, int)
+            query = query.where(User.id > last_id)
+        else:
+            query = query.offset(offset)
 
-    return {'users': users}
+        users = session.execute(query).all()
+        next_cursor = (
+            encode_cursor(users[-1].id) if len(users) == limit else None
+        )
+        page = public_users_page(users, next_cursor)
+        body = page.model_dump_json(exclude_none=True).encode()
+
+        if pinned:
+            return body
+
+        return cache_body(
+            key, body, generation, cache_ttl(session), tag=USERS_TAG
+        )
+
+    if body is None:
+        # A pinned read must not join a leader reading from a replica.
+        body = load() if pinned else flight.do(key, load)
+
+    return json_response(request, body)
+
+
+@router.get('/export', response_class=StreamingResponse)
+def export_users(
+    session: T_ReadSession,
+    export_format: Annotated[
+        ExportFormat, Query(alias='format')
+    ] = ExportFormat.ndjson,
+):
+    query = export_users_query()
+    engine = session.get_bind(clause=query)
+
+    def stream():
+        with engine.connect() as connection:
+            result = connection.execute(query)
+
+            yield export_header(export_format)
+
+            for rows in result.partitions():
+                yield format_rows(rows, export_format)
+
+    return StreamingResponse(stream(), media_type=MEDIA_TYPES[export_format])
 
 
 @router.get('/{user_id}', response_model=UserPublicSchema)
-def get_user(user_id: int, session: T_Session):
-    db_user = session.scalar(select(User).where(User.id == user_id))
+def get_user(user_id: int, request: Request, session: T_ReadSession):
+    key = user_key(user_id)
+    pinned = reads_from_primary(request.cookies)
+    body = None if pinned else get_cached_body(key)
 
-    if not db_user:
+    def load():
+        generation = users_generation()
+        db_user = session.execute(
+            select(*USER_PUBLIC_COLUMNS).where(User.id == user_id)
+        ).one_or_none()
+
+        if not db_user:
+            return None
+
+        body = public_user(db_user).model_dump_json().encode()
+
+        if pinned:
+            return body
+
+        return cache_body(key, body, generation, cache_ttl(session))
+
+    if body is None:
+        body = load() if pinned else flight.do(key, load)
+
+    if body is None:
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND, detail='User not found'
         )
 
-    return db_user
+    return json_response(request, body)
 
 
 @router.put(
@@ -97,21 +257,102 @@ def update_user(
             status_code=HTTPStatus.FORBIDDEN, detail='Not enough permission'
         )
 
-    current_user.username = user.username
-    current_user.email = user.email
-    current_user.password = get_password_hash(user.password)
+    password = get_password_hash(user.password)
 
-    session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
+    try:
+        result = session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(
+                username=user.username, email=user.email, password=password
+            )
+            .returning(*USER_PUBLIC_COLUMNS)
+        )
+        db_user = result.one_or_none()
+        # A new password must also end sessions the old one started.
+        session.execute(revoke_user_query(user_id))
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        usernames = session.scalars(
+            user_conflicts_query(user.username, user.email, user_id)
+        )
+        raise user_conflict_exception(usernames.all(), user.username)
+
+    if not db_user:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='User not found'
+        )
+
+    invalidate_principal(user_id)
+    invalidate_users(user_id)
+
+    return model_response(public_user(db_user))
+
+
+@router.patch(
+    '/{user_id}',
+    status_code=HTTPStatus.OK,
+    response_model=UserPublicSchema,
+)
+def patch_user(
+    user_id: int,
+    user: UserUpdateSchema,
+    session: T_Session,
+    current_user: T_CurrentUser,
+):
+    if current_user.id != user_id:
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN, detail='Not enough permission'
+        )
+
+    values = user.model_dump(exclude_unset=True, exclude_none=True)
+
+    if 'password' in values:
+        values['password'] = get_password_hash(values['password'])
+
+    if not values:
+        result = session.execute(
+            select(*USER_PUBLIC_COLUMNS).where(User.id == user_id)
+        )
+        db_user = result.one_or_none()
+    else:
+        try:
+            result = session.execute(
+                update(User)
+                .where(User.id == user_id)
+                .values(**values)
+                .returning(*USER_PUBLIC_COLUMNS)
+            )
+            db_user = result.one_or_none()
+
+            if 'password' in values:
+                session.execute(revoke_user_query(user_id))
+
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            usernames = session.scalars(
+                user_conflicts_query(user.username, user.email, user_id)
+            )
+            raise user_conflict_exception(usernames.all(), user.username)
+
+        invalidate_principal(user_id)
+        invalidate_users(user_id)
+
+    if not db_user:
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND, detail='User not found'
+        )
 
-    return current_user
+    return model_response(public_user(db_user))
 
 
 @router.delete('/{user_id}', response_model=Message)
 def delete_user(
     user_id: int,
     session: T_Session,
+    token: T_Token,
     current_user: T_CurrentUser,
 ):
     if current_user.id != user_id:
@@ -119,7 +360,11 @@ def delete_user(
             status_code=HTTPStatus.FORBIDDEN, detail='Not enough permission'
         )
 
-    session.delete(current_user)
+    session.execute(revoke_user_query(user_id))
+    session.execute(delete(User).where(User.id == user_id))
     session.commit()
+    invalidate_principal(user_id)
+    invalidate_users(user_id)
+    revoke_token(session, token)
 
     return {'message': 'User deleted'}
@@ -1,4 +1,16 @@
-from pydantic import BaseModel, ConfigDict, EmailStr
+from datetime import datetime
+from typing import Annotated
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    StringConstraints,
+)
+
+from fast_api_todo.models import TodoState
+from fast_api_todo.search import SearchScope
 
 
 class Message(BaseModel):
@@ -11,6 +23,12 @@ class UserSchema(BaseModel):
     password: str
 
 
+class UserUpdateSchema(BaseModel):
+    username: str | None = None
+    email: EmailStr | None = None
+    password: str | None = None
+
+
 class UserDB(UserSchema):
     id: int
 
@@ -24,8 +42,70 @@ class UserPublicSchema(BaseModel):
 
 class UserListSchema(BaseModel):
     users: list[UserPublicSchema]
+    next_cursor: str | None = None
+
+
+class BulkUserResultSchema(BaseModel):
+    line: int
+    status: str
+    id: int | None = None
+    username: str | None = None
+    detail: str | None = None
+
+
+class BulkUserReportSchema(BaseModel):
+    created: int
+    failed: int
+    results: list[BulkUserResultSchema]
 
 
 class TokenSchema(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+
+class RefreshTokenSchema(BaseModel):
+    refresh_token: str
+
+
+class TodoSchema(BaseModel):
+    title: str
+    description: str
+    state: TodoState
+
+
+class TodoPublicSchema(TodoSchema):
+    id: int
+    created_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TodoListSchema(BaseModel):
+    todos: list[TodoPublicSchema]
+    next_cursor: str | None = None
+
+
+class TodoUpdateSchema(BaseModel):
+    title: str | None = None
+    description: str | None = None
+    state: TodoState | None = None
+
+
+class TodoFilterSchema(BaseModel):
+    state: TodoState | None = None
+    title: str | None = Field(None, min_length=1)
+
+
+class SearchFilterSchema(BaseModel):
+    q: Annotated[
+        str,
+        StringConstraints(strip_whitespace=True, min_length=1, max_length=256),
+    ]
+    scope: SearchScope = SearchScope.todos
+
+
+class SearchResultsSchema(BaseModel):
+    todos: list[TodoPublicSchema] | None = None
+    users: list[UserPublicSchema] | None = None
+    next_cursor: str | None = None
@@ -0,0 +1,134 @@
+from enum import Enum
+
+from sqlalchemy import (
+    DDL,
+    Double,
+    cast,
+    column,
+    event,
+    func,
+    literal_column,
+    select,
+    table,
+    tuple_,
+)
+
+from fast_api_todo.models import Todo, User, table_registry
+
+todos_fts = table('todos_fts', column('rowid'))
+users_fts = table('users_fts', column('rowid'))
+
+# Postgres only uses the GIN expression indexes below when the query
+# repeats the exact expression, so the separator and config are literals.
+SEPARATOR = literal_column("' '")
+TEXT_SEARCH_CONFIG = literal_column("'simple'")
+TODOS_DOCUMENT = Todo.title.concat(SEPARATOR).concat(Todo.description)
+USERS_DOCUMENT = User.username.concat(SEPARATOR).concat(User.email)
+
+SQLITE_DDL = (
+    'CREATE VIRTUAL TABLE todos_fts USING fts5('
+    "title, description, content='todos', content_rowid='id')",
+    'CREATE TRIGGER todos_fts_insert AFTER INSERT ON todos BEGIN '
+    'INSERT INTO todos_fts(rowid, title, description) '
+    'VALUES (new.id, new.title, new.description); END',
+    'CREATE TRIGGER todos_fts_delete AFTER DELETE ON todos BEGIN '
+    'INSERT INTO todos_fts(todos_fts, rowid, title, description) '
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    'CREATE TRIGGER todos_fts_update '
+    'AFTER UPDATE OF title, description ON todos BEGIN '
+    'INSERT INTO todos_fts(todos_fts, rowid, title, description) '
+    "VALUES ('delete', old.id, old.title, old.description); "
+    'INSERT INTO todos_fts(rowid, title, description) '
+    'VALUES (new.id, new.title, new.description); END',
+    'CREATE VIRTUAL TABLE users_fts USING fts5('
+    "username, email, content='users', content_rowid='id')",
+    'CREATE TRIGGER users_fts_insert AFTER INSERT ON users BEGIN '
+    'INSERT INTO users_fts(rowid, username, email) '
+    'VALUES (new.id, new.username, new.email); END',
+    'CREATE TRIGGER users_fts_delete AFTER DELETE ON users BEGIN '
+    'INSERT INTO users_fts(users_fts, rowid, username, email) '
+    "VALUES ('delete', old.id, old.username, old.email); END",
+    'CREATE TRIGGER users_fts_update '
+    'AFTER UPDATE OF username, email ON users BEGIN '
+    'INSERT INTO users_fts(users_fts, rowid, username, email) '
+    "VALUES ('delete', old.id, old.username, old.email); "
+    'INSERT INTO users_fts(rowid, username, email) '
+    'VALUES (new.id, new.username, new.email); END',
+)
+POSTGRESQL_DDL = (
+    'CREATE INDEX ix_todos_search ON todos USING gin '
+    "(to_tsvector('simple', title || ' ' || description))",
+    'CREATE INDEX ix_users_search ON users USING gin '
+    "(to_tsvector('simple', username || ' ' || email))",
+)
+
+
+class SearchScope(str, Enum):
+    todos = 'todos'
+    users = 'users'
+
+
+for statement in SQLITE_DDL:
+    event.listen(
+        table_registry.metadata,
+        'after_create',
+        DDL(statement).execute_if(dialect='sqlite'),
+    )
+
+for statement in POSTGRESQL_DDL:
+    event.listen(
+        table_registry.metadata,
+        'after_create',
+        DDL(statement).execute_if(dialect='postgresql'),
+    )
+
+
+def fts5_query(terms: str):
+    return ' '.join(
+        '"' + term.replace('"', '""') + '"' for term in terms.split()
+    )
+
+
+def search_query(
+    dialect: str,
+    scope: SearchScope,
+    terms: str,
+    user_id: int,
+    after: tuple[float, int] | None = None,
+):
+    if scope == SearchScope.todos:
+        model, fts, document = Todo, todos_fts, TODOS_DOCUMENT
+        columns = (
+            Todo.id,
+            Todo.title,
+            Todo.description,
+            Todo.state,
+            Todo.created_at,
+        )
+    else:
+        model, fts, document = User, users_fts, USERS_DOCUMENT
+        columns = (User.id, User.username, User.email)
+
+    if dialect == 'postgresql':
+        vector = func.to_tsvector(TEXT_SEARCH_CONFIG, document)
+        tsquery = func.plainto_tsquery(TEXT_SEARCH_CONFIG, terms)
+        rank = -cast(func.ts_rank(vector, tsquery), Double)
+        query = select(*columns, rank.label('rank')).where(
+            vector.op('@@')(tsquery)
+        )
+    else:
+        rank = func.bm25(literal_column(fts.name))
+        query = (
+            select(*columns, rank.label('rank'))
+            .select_from(fts)
+            .join(model, model.id == fts.c.rowid)
+            .where(literal_column(fts.name).op('MATCH')(fts5_query(terms)))
+        )
+
+    if scope == SearchScope.todos:
+        query = query.where(Todo.user_id == user_id)
+
+    if after is not None:
+        query = query.where(tuple_(rank, model.id) > after)
+
+    return query.order_by(rank, model.id)
@@ -1,30 +1,140 @@
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from http import HTTPStatus
+from time import perf_counter
+from uuid import uuid4
 
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from jwt import decode, encode
 from jwt.exceptions import ExpiredSignatureError, PyJWTError
-from pwdlib import PasswordHash
-from sqlalchemy import select
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from zoneinfo import ZoneInfo
 
-from fast_api_todo.database import get_session
-from fast_api_todo.models import User
+from fast_api_todo.cache import TTLCache
+from fast_api_todo.database import get_async_session, get_read_session
+from fast_api_todo.hashing import (
+    HashingPoolSaturatedError,
+    PasswordHashingExecutor,
+    check_and_update_password,
+    check_password,
+    hash_password,
+)
+from fast_api_todo.instrumentation import record
+from fast_api_todo.keys import load_keyring
+from fast_api_todo.metrics import registry
+from fast_api_todo.models import RevokedToken, User
+from fast_api_todo.refresh import (
+    consume_query,
+    issue_query,
+    prune_query,
+    revoke_query,
+)
+from fast_api_todo.revocation import RevocationList
 from fast_api_todo.settings import Settings
 
-pwd_context = PasswordHash.recommended()
 oauth2_schema = OAuth2PasswordBearer(tokenUrl='auth/token')
 settings = Settings()  # type: ignore
+keyring = load_keyring(settings)
+hashing_executor = PasswordHashingExecutor(
+    workers=settings.HASHING_WORKERS,
+    max_pending=settings.HASHING_MAX_PENDING,
+)
+principal_cache = TTLCache(maxsize=settings.PRINCIPAL_CACHE_SIZE)
+revocations = RevocationList(
+    capacity=settings.REVOCATION_BLOOM_CAPACITY,
+    error_rate=settings.REVOCATION_BLOOM_ERROR_RATE,
+    sync_interval=settings.REVOCATION_SYNC_SECONDS,
+    sync_overlap=settings.REVOCATION_SYNC_OVERLAP_SECONDS,
+)
+principal_cache_hits = registry.counter(
+    'principal_cache_hits_total',
+    'Authenticated requests served from the principal cache.',
+)
+principal_cache_misses = registry.counter(
+    'principal_cache_misses_total',
+    'Authenticated requests that decoded the token and queried the user.',
+)
+
+
+PRINCIPAL_COLUMNS = (User.id, User.username, User.email)
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: int
+    username: str
+    email: str
+    jti: str | None = None
+
+
+def hashing_unavailable_exception():
+    return HTTPException(
+        status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+        detail='Too many password operations, try again later',
+        headers={'Retry-After': '1'},
+    )
 
 
 def get_password_hash(password: str):
-    return pwd_context.hash(password)
+    try:
+        return hashing_executor.run(hash_password, password)
+    except HashingPoolSaturatedError:
+        raise hashing_unavailable_exception()
 
 
 def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return hashing_executor.run(
+            check_password, plain_password, hashed_password
+        )
+    except HashingPoolSaturatedError:
+        raise hashing_unavailable_exception()
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str):
+    try:
+        return hashing_executor.run(
+            check_and_update_password, plain_password, hashed_password
+        )
+    except HashingPoolSaturatedError:
+        raise hashing_unavailable_exception()
+
+
+def get_password_hashes(passwords: list[str]):
+    try:
+        return hashing_executor.map(hash_password, passwords)
+    except HashingPoolSaturatedError:
+        raise hashing_unavailable_exception()
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+):
+    try:
+        return await hashing_executor.run_async(
+            check_and_update_password, plain_password, hashed_password
+        )
+    except HashingPoolSaturatedError:
+        raise hashing_unavailable_exception()
+
+
+async def get_password_hash_async(password: str):
+    try:
+        return await hashing_executor.run_async(hash_password, password)
+    except HashingPoolSaturatedError:
+        raise hashing_unavailable_exception()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    try:
+        return await hashing_executor.run_async(
+            check_password, plain_password, hashed_password
+        )
+    except HashingPoolSaturatedError:
+        raise hashing_unavailable_exception()
 
 
 def create_access_token(data: dict):
@@ -34,41 +144,247 @@ def create_access_token(data: dict):
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
 
-    to_encode.update({'exp': expire})
-    encoded_jwt = encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
+    to_encode.update({'exp': expire, 'jti': uuid4().hex})
+    encoded_jwt = keyring.encode(to_encode)
 
     return encoded_jwt
 
 
-def get_current_user(
-    session: Session = Depends(get_session),
-    token: str = Depends(oauth2_schema),
-):
-    credentials_exception = HTTPException(
+def credentials_exception():
+    return HTTPException(
         status_code=HTTPStatus.UNAUTHORIZED,
         detail='Could not validate credentials',
         headers={'WWW-Authenticate': 'Bearer'},
     )
 
+
+def decode_access_token(token: str):
+    start = perf_counter()
+
     try:
-        payload = decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        username: str = payload.get('sub')
+        payload = keyring.decode(token)
 
-        if not username:
-            raise credentials_exception
+        if not payload.get('sub'):
+            raise credentials_exception()
     except ExpiredSignatureError:
-        raise credentials_exception
+        raise credentials_exception()
 
     except PyJWTError:
-        raise credentials_exception
+        raise credentials_exception()
+
+    finally:
+        record('jwt_seconds', perf_counter() - start)
+
+    return payload
+
+
+def get_cached_principal(token: str):
+    principal = principal_cache.get(token)
+
+    if principal is None:
+        principal_cache_misses.inc()
+    else:
+        principal_cache_hits.inc()
+
+    return principal
+
+
+def cache_principal(token: str, payload: dict, user):
+    principal = Principal(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        jti=payload.get('jti'),
+    )
+    principal_cache.set(
+        token, principal, expires_at=payload['exp'], tag=user.id
+    )
+
+    return principal
+
+
+def invalidate_principal(user_id: int):
+    principal_cache.invalidate_tag(user_id)
+
+
+def is_token_revoked(session: Session, jti: str | None):
+    if jti is None:
+        return False
+
+    if revocations.sync_due():
+        query, rebuild = revocations.sync_query()
+        revocations.apply(session.execute(query), rebuild)
+
+    if not revocations.might_contain(jti):
+        return False
+
+    return session.scalar(revocations.lookup_query(jti)) is not None
+
+
+async def is_token_revoked_async(session: AsyncSession, jti: str | None):
+    if jti is None:
+        return False
+
+    if revocations.sync_due():
+        query, rebuild = revocations.sync_query()
+        revocations.apply(await session.execute(query), rebuild)
+
+    if not revocations.might_contain(jti):
+        return False
 
-    user = session.scalar(select(User).where(User.email == username))
+    return await session.scalar(revocations.lookup_query(jti)) is not None
+
+
+def revoked_token_values(payload: dict):
+    return {
+        'jti': payload['jti'],
+        'expires_at': datetime.fromtimestamp(
+            payload['exp'], tz=ZoneInfo('UTC')
+        ),
+    }
+
+
+def revoke_token(session: Session, token: str):
+    payload = decode_access_token(token)
+    principal_cache.delete(token)
+
+    if not payload.get('jti'):
+        return
+
+    try:
+        session.execute(revocations.prune_query())
+        session.execute(
+            insert(RevokedToken).values(**revoked_token_values(payload))
+        )
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+
+    revocations.add(payload['jti'])
+
+
+async def revoke_token_async(session: AsyncSession, token: str):
+    payload = decode_access_token(token)
+    principal_cache.delete(token)
+
+    if not payload.get('jti'):
+        return
+
+    try:
+        await session.execute(revocations.prune_query())
+        await session.execute(
+            insert(RevokedToken).values(**revoked_token_values(payload))
+        )
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+
+    revocations.add(payload['jti'])
+
+
+def issue_refresh_token(session: Session, user_id: int):
+    token, query = issue_query(user_id, settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    session.execute(prune_query())
+    session.execute(query)
+    session.commit()
+
+    return token
+
+
+async def issue_refresh_token_async(session: AsyncSession, user_id: int):
+    token, query = issue_query(user_id, settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    await session.execute(prune_query())
+    await session.execute(query)
+    await session.commit()
+
+    return token
+
+
+def rotate_refresh_token(session: Session, token: str):
+    consumed = session.execute(consume_query(token)).one_or_none()
+
+    if not consumed or not consumed.email:
+        session.rollback()
+        raise credentials_exception()
+
+    return consumed.email, issue_refresh_token(session, consumed.user_id)
+
+
+async def rotate_refresh_token_async(session: AsyncSession, token: str):
+    consumed = (await session.execute(consume_query(token))).one_or_none()
+
+    if not consumed or not consumed.email:
+        await session.rollback()
+        raise credentials_exception()
+
+    return consumed.email, await issue_refresh_token_async(
+        session, consumed.user_id
+    )
+
+
+def revoke_refresh_token(session: Session, token: str):
+    session.execute(revoke_query(token))
+    session.commit()
+
+
+async def revoke_refresh_token_async(session: AsyncSession, token: str):
+    await session.execute(revoke_query(token))
+    await session.commit()
+
+
+def get_current_user(
+    session: Session = Depends(get_read_session),
+    token: str = Depends(oauth2_schema),
+):
+    principal = get_cached_principal(token)
+
+    if principal:
+        if is_token_revoked(session, principal.jti):
+            principal_cache.delete(token)
+            raise credentials_exception()
+
+        return principal
+
+    payload = decode_access_token(token)
+
+    if is_token_revoked(session, payload.get('jti')):
+        raise credentials_exception()
+
+    user = session.execute(
+        select(*PRINCIPAL_COLUMNS).where(User.email == payload['sub'])
+    ).one_or_none()
+
+    if not user:
+        raise credentials_exception()
+
+    return cache_principal(token, payload, user)
+
+
+async def get_current_user_async(
+    session: AsyncSession = Depends(get_async_session),
+    token: str = Depends(oauth2_schema),
+):
+    principal = get_cached_principal(token)
+
+    if principal:
+        if await is_token_revoked_async(session, principal.jti):
+            principal_cache.delete(token)
+            raise credentials_exception()
+
+        return principal
+
+    payload = decode_access_token(token)
+
+    if await is_token_revoked_async(session, payload.get('jti')):
+        raise credentials_exception()
+
+    user = (
+        await session.execute(
+            select(*PRINCIPAL_COLUMNS).where(User.email == payload['sub'])
+        )
+    ).one_or_none()
 
     if not user:
-        raise credentials_exception
+        raise credentials_exception()
 
-    return user
+    return cache_principal(token, payload, user)
@@ -0,0 +1,88 @@
+import logging
+import os
+from time import perf_counter
+
+from fast_api_todo.app import app
+from fast_api_todo.database import engine, primary_engines, replicas
+from fast_api_todo.hashing import hash_password
+from fast_api_todo.replicas import ping
+from fast_api_todo.settings import Settings
+
+try:
+    from gunicorn.app.base import BaseApplication
+except ImportError:  # pragma: no cover
+    BaseApplication = object
+
+logger = logging.getLogger('fast_api_todo.server')
+
+WORKER_CLASS = 'uvicorn_worker.UvicornWorker'
+
+
+def worker_count(settings: Settings, cpus: int | None = None):
+    if settings.SERVER_WORKERS > 0:
+        return settings.SERVER_WORKERS
+
+    return max(1, cpus or os.cpu_count() or 1)
+
+
+def engines():
+    return (*primary_engines, *replicas.engines)
+
+
+def warm_up():
+    start = perf_counter()
+    hash_password('warm-up')
+    ping(engine)
+
+    for warmed in engines():
+        # Connections must not be shared across fork, only the dialect.
+        warmed.dispose()
+
+    logger.info('Warmed up in %.3fs', perf_counter() - start)
+
+    return app
+
+
+def post_fork(server, worker):
+    for forked in engines():
+        forked.dispose(close=False)
+
+
+def gunicorn_options(settings: Settings):
+    return {
+        'bind': settings.SERVER_BIND,
+        'workers': worker_count(settings),
+        'worker_class': WORKER_CLASS,
+        'preload_app': True,
+        'timeout': settings.SERVER_TIMEOUT_SECONDS,
+        'graceful_timeout': settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        'keepalive': settings.SERVER_KEEPALIVE_SECONDS,
+        'max_requests': settings.SERVER_MAX_REQUESTS,
+        'max_requests_jitter': settings.SERVER_MAX_REQUESTS // 10,
+        'post_fork': post_fork,
+    }
+
+
+class Server(BaseApplication):
+    def load_config(self):
+        # Runs again on SIGHUP, so changed settings reach the new workers.
+        for key, value in gunicorn_options(Settings()).items():  # type: ignore
+            self.cfg.set(key, value)
+
+    def load(self):  # noqa: PLR6301
+        return warm_up()
+
+
+def main():
+    if BaseApplication is object:
+        raise SystemExit(
+            'The gunicorn and uvicorn-worker packages are required, '
+            'install the server extra'
+        )
+
+    logging.basicConfig(level=logging.INFO)
+    Server().run()
+
+
+if __name__ == '__main__':
+    main()
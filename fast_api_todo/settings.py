@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,3 +12,70 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    JWT_KEYS: dict[str, str] = {}
+    JWT_SIGNING_KEY_ID: str | None = None
+
+    ASYNC_MODE: bool = False
+    ASYNC_DATABASE_URL: str | None = None
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_POOL_RECYCLE: int = 1800
+
+    # Converts the database file to WAL for good, and synchronous=NORMAL
+    # can lose the last commits on power loss, so it is opt-in.
+    SQLITE_PROFILE: bool = False
+    SQLITE_SYNCHRONOUS: str = 'NORMAL'
+    SQLITE_MMAP_SIZE: int = 268_435_456
+    SQLITE_CACHE_SIZE: int = -65_536
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_TEMP_STORE: str = 'MEMORY'
+    SQLITE_WRITER_TIMEOUT_SECONDS: float = 30
+
+    READ_REPLICA_URLS: list[str] = []
+    READ_REPLICA_STRATEGY: Literal['round_robin', 'least_connections'] = (
+        'round_robin'
+    )
+    READ_REPLICA_HEALTH_CHECK_SECONDS: float = 30
+    READ_YOUR_WRITES_SECONDS: float = 5
+
+    SERVER_BIND: str = '0.0.0.0:8000'
+    SERVER_WORKERS: int = 0
+    SERVER_TIMEOUT_SECONDS: int = 30
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30
+    SERVER_KEEPALIVE_SECONDS: int = 5
+    SERVER_MAX_REQUESTS: int = 0
+
+    ARGON2_TIME_COST: int = 3
+    ARGON2_MEMORY_COST: int = 65536
+    ARGON2_PARALLELISM: int = 4
+
+    HASHING_WORKERS: int = 0
+    HASHING_MAX_PENDING: int = 64
+
+    PRINCIPAL_CACHE_SIZE: int = 10_000
+
+    REVOCATION_BLOOM_CAPACITY: int = 100_000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    REVOCATION_SYNC_SECONDS: float = 5
+    REVOCATION_SYNC_OVERLAP_SECONDS: float = 60
+
+    RATE_LIMIT_URL: str | None = None
+    RATE_LIMIT_STORE_SIZE: int = 100_000
+    LOGIN_RATE_LIMIT_PER_IP: int = 20
+    LOGIN_RATE_LIMIT_PER_USERNAME: int = 5
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: float = 60
+    API_RATE_LIMIT: int = 0
+    API_RATE_LIMIT_WINDOW_SECONDS: float = 60
+
+    RESPONSE_CACHE_URL: str | None = None
+    RESPONSE_CACHE_SIZE: int = 10_000
+    RESPONSE_CACHE_TTL_SECONDS: float = 60
+    SINGLE_FLIGHT: bool = True
+
+    MAX_PAGE_SIZE: int = 100
+
+    BULK_BATCH_SIZE: int = 1000
+
+    SLOW_QUERY_THRESHOLD_MS: float = 200
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+from fast_api_todo.metrics import registry
+
+single_flight_shared = registry.counter(
+    'single_flight_shared_total',
+    'Requests that reused the result of an identical in-flight read.',
+)
+
+
+class Call:
+    __slots__ = ('done', 'error', 'result')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+        self.result = None
+
+
+class SingleFlight:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._calls: dict = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._calls)
+
+    def do(self, key: str, function):
+        if not self.enabled:
+            return function()
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self._calls[key] = Call()
+
+        if not leader:
+            single_flight_shared.inc()
+            call.done.wait()
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = function()
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.done.set()
+
+        return call.result
+
+
+class AsyncSingleFlight:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._calls: dict = {}
+
+    def __len__(self):
+        return len(self._calls)
+
+    async def do(self, key: str, function):
+        if not self.enabled:
+            return await function()
+
+        task = self._calls.get(key)
+
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(function())
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            single_flight_shared.inc()
+
+        # A disconnecting leader must not cancel the read for the others.
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
@@ -0,0 +1,65 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from fast_api_todo.replicas import RoutingSession
+
+
+def is_sqlite_file(url):
+    url = make_url(url)
+
+    return url.get_backend_name() == 'sqlite' and url.database not in {
+        None,
+        '',
+        ':memory:',
+    }
+
+
+def sqlite_pragmas(settings):
+    return {
+        'journal_mode': 'WAL',
+        'synchronous': settings.SQLITE_SYNCHRONOUS,
+        'mmap_size': settings.SQLITE_MMAP_SIZE,
+        'cache_size': settings.SQLITE_CACHE_SIZE,
+        'busy_timeout': settings.SQLITE_BUSY_TIMEOUT_MS,
+        'temp_store': settings.SQLITE_TEMP_STORE,
+    }
+
+
+def apply_pragmas(engine, pragmas: dict):
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+        cursor.close()
+
+    event.listen(engine, 'connect', set_pragmas)
+
+
+def enable_foreign_keys(engine):
+    # SQLite ignores ON DELETE CASCADE unless every connection opts in.
+    def set_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys = ON')
+        cursor.close()
+
+    event.listen(engine, 'connect', set_foreign_keys)
+
+
+def use_immediate_transactions(engine):
+    # Take the write lock when the transaction starts; a deferred one that
+    # upgrades later fails with "database is locked" despite busy_timeout.
+    def disable_implicit_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    def begin_immediate(connection):
+        connection.exec_driver_sql('BEGIN IMMEDIATE')
+
+    event.listen(engine, 'connect', disable_implicit_begin)
+    event.listen(engine, 'begin', begin_immediate)
+
+
+class WriterSession(RoutingSession):
+    # WAL readers see every committed write, only writes need the writer.
+    replica_lag = False
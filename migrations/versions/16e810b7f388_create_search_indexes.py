@@ -0,0 +1,47 @@
+"""create search indexes
+
+Revision ID: 16e810b7f388
+Revises: 08949d592362
+Create Date: 2026-10-17 19:57:21.960306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from fast_api_todo.search import POSTGRESQL_DDL, SQLITE_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = '16e810b7f388'
+down_revision: Union[str, None] = '08949d592362'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+
+        op.execute("INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')")
+        op.execute("INSERT INTO users_fts(users_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        for statement in POSTGRESQL_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        for table in ('todos', 'users'):
+            for action in ('insert', 'delete', 'update'):
+                op.execute(f'DROP TRIGGER {table}_fts_{action}')
+
+            op.execute(f'DROP TABLE {table}_fts')
+    elif dialect == 'postgresql':
+        op.drop_index('ix_users_search', table_name='users')
+        op.drop_index('ix_todos_search', table_name='todos')
@@ -1,14 +1,41 @@
+import shutil
+from contextlib import contextmanager
+
 import factory
+import factory.fuzzy
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
+from fast_api_todo import database
 from fast_api_todo.app import app
-from fast_api_todo.database import get_session
-from fast_api_todo.models import User, table_registry
-from fast_api_todo.security import get_password_hash
+from fast_api_todo.database import (
+    get_async_session,
+    get_async_url,
+    get_session,
+)
+from fast_api_todo.instrumentation import instrument_engine
+from fast_api_todo.models import Todo, TodoState, User, table_registry
+from fast_api_todo.ratelimit import rate_limit_backend
+from fast_api_todo.replicas import ReadYourWritesMiddleware, ReplicaSet
+from fast_api_todo.response_cache import response_cache
+from fast_api_todo.routers import (
+    async_auth,
+    async_users,
+    auth,
+    search,
+    users,
+)
+from fast_api_todo.security import (
+    get_password_hash,
+    principal_cache,
+    revocations,
+)
+from fast_api_todo.sqlite import enable_foreign_keys
 
 
 class UserFactory(factory.Factory):
@@ -20,6 +47,25 @@ class UserFactory(factory.Factory):
     password = factory.LazyAttribute(lambda obj: f'{obj.username}@pass.com')
 
 
+class TodoFactory(factory.Factory):
+    class Meta:
+        model = Todo
+
+    title = factory.Faker('text', max_nb_chars=20)
+    description = factory.Faker('text')
+    state = factory.fuzzy.FuzzyChoice(TodoState)
+    user_id = 1
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    yield
+    principal_cache.clear()
+    response_cache.clear()
+    revocations.clear()
+    rate_limit_backend.clear()
+
+
 @pytest.fixture()
 def client(session: Session):
     def get_session_override():
@@ -32,6 +78,64 @@ def client(session: Session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture()
+def async_client(tmp_path):
+    database_url = f'sqlite:///{tmp_path / "async.db"}'
+    engine = create_engine(database_url)
+    table_registry.metadata.create_all(engine)
+    async_engine = create_async_engine(
+        get_async_url(database_url), poolclass=NullPool
+    )
+    enable_foreign_keys(async_engine.sync_engine)
+
+    async def get_async_session_override():
+        async with AsyncSession(
+            async_engine, expire_on_commit=False
+        ) as session:
+            yield session
+
+    async_app = FastAPI()
+    async_app.include_router(async_users.router)
+    async_app.include_router(async_auth.router)
+    async_app.dependency_overrides[get_async_session] = (
+        get_async_session_override
+    )
+
+    with TestClient(async_app) as client:
+        yield client
+
+    engine.dispose()
+
+
+@pytest.fixture()
+def replica_client(tmp_path, monkeypatch):
+    primary_path = tmp_path / 'primary.db'
+    replica_path = tmp_path / 'replica.db'
+    primary = create_engine(f'sqlite:///{primary_path}', poolclass=NullPool)
+    replica = create_engine(f'sqlite:///{replica_path}', poolclass=NullPool)
+    enable_foreign_keys(primary)
+    table_registry.metadata.create_all(primary)
+    monkeypatch.setattr(database, 'replicas', ReplicaSet([replica]))
+
+    def get_session_override():
+        with Session(primary) as session:
+            yield session
+
+    def sync_replica():
+        shutil.copyfile(primary_path, replica_path)
+
+    replica_app = FastAPI()
+    replica_app.add_middleware(ReadYourWritesMiddleware)
+    replica_app.include_router(users.router)
+    replica_app.include_router(auth.router)
+    replica_app.include_router(search.router)
+    replica_app.dependency_overrides[get_session] = get_session_override
+    sync_replica()
+
+    with TestClient(replica_app) as client:
+        yield client, sync_replica
+
+
 @pytest.fixture()
 def session():
     engine = create_engine(
@@ -39,6 +143,8 @@ def session():
         connect_args={'check_same_thread': False},
         poolclass=StaticPool,
     )
+    instrument_engine(engine)
+    enable_foreign_keys(engine)
     table_registry.metadata.create_all(engine)
 
     with Session(engine) as session:
@@ -47,6 +153,30 @@ def session():
     table_registry.metadata.drop_all(engine)
 
 
+@pytest.fixture()
+def assert_num_queries(session: Session):
+    @contextmanager
+    def assert_num_queries(expected: int):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = session.get_bind()
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+
+        try:
+            yield statements
+        finally:
+            event.remove(
+                engine, 'before_cursor_execute', before_cursor_execute
+            )
+
+        assert len(statements) == expected, statements
+
+    return assert_num_queries
+
+
 @pytest.fixture()
 def user(session: Session):
     password = '123456'
@@ -1,8 +1,34 @@
+import os
 from http import HTTPStatus
 
+from fast_api_todo import app
+
 
 def test_app_should_return_hello_world(client):
     response = client.get('/')
 
     assert response.status_code == HTTPStatus.OK
     assert response.json() == {'message': 'Hello World'}
+
+
+def test_health_reports_the_worker(client, monkeypatch):
+    monkeypatch.setattr(app, 'ping', lambda engine: True)
+
+    response = client.get('/health')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'status': 'ok',
+        'worker': os.getpid(),
+        'database': True,
+        'replicas': 0,
+    }
+
+
+def test_health_fails_without_the_database(client, monkeypatch):
+    monkeypatch.setattr(app, 'ping', lambda engine: False)
+
+    response = client.get('/health')
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.json()['status'] == 'unavailable'
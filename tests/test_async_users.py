@@ -0,0 +1,214 @@
+from http import HTTPStatus
+
+
+def create_user(client, username='test'):
+    return client.post(
+        '/users/',
+        json={
+            'username': username,
+            'email': f'{username}@example.com',
+            'password': 'secret',
+        },
+    )
+
+
+def get_token(client, username='test'):
+    response = client.post(
+        '/auth/token',
+        data={'username': f'{username}@example.com', 'password': 'secret'},
+    )
+
+    return response.json()['access_token']
+
+
+def test_async_create_user(async_client):
+    response = create_user(async_client)
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert response.json() == {
+        'id': 1,
+        'username': 'test',
+        'email': 'test@example.com',
+    }
+
+
+def test_async_create_user_with_a_username_existent(async_client):
+    create_user(async_client)
+
+    response = create_user(async_client)
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Username already existis'}
+
+
+def test_async_get_users(async_client):
+    create_user(async_client, 'test1')
+    create_user(async_client, 'test2')
+
+    response = async_client.get('/users/', params={'limit': 1, 'offset': 1})
+    next_page = async_client.get(
+        '/users/', params={'cursor': response.json()['next_cursor']}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['users'] == [
+        {'id': 2, 'username': 'test2', 'email': 'test2@example.com'}
+    ]
+    assert next_page.json() == {'users': []}
+
+
+def test_async_get_user_not_found(async_client):
+    response = async_client.get('/users/1')
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'User not found'}
+
+
+def test_async_update_user(async_client):
+    user_id = create_user(async_client).json()['id']
+    token = get_token(async_client)
+
+    response = async_client.put(
+        f'/users/{user_id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'username': 'test2',
+            'email': 'test2@example.com',
+            'password': 'test2',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'id': user_id,
+        'username': 'test2',
+        'email': 'test2@example.com',
+    }
+
+
+def test_async_delete_user(async_client):
+    user_id = create_user(async_client).json()['id']
+    token = get_token(async_client)
+
+    response = async_client.delete(
+        f'/users/{user_id}', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'message': 'User deleted'}
+    assert async_client.get(f'/users/{user_id}').status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+def test_async_refresh_token(async_client):
+    create_user(async_client)
+    token = get_token(async_client)
+
+    response = async_client.post(
+        '/auth/refresh_token', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['token_type'] == 'bearer'
+
+
+def test_async_login_with_wrong_password(async_client):
+    create_user(async_client)
+
+    response = async_client.post(
+        '/auth/token',
+        data={'username': 'test@example.com', 'password': 'wrong'},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Incorrect email or password'}
+
+
+def test_async_export_users_as_csv(async_client):
+    create_user(async_client, 'test1')
+    create_user(async_client, 'test2')
+
+    response = async_client.get('/users/export', params={'format': 'csv'})
+
+    assert response.status_code == HTTPStatus.OK
+    assert [line.split(',')[1] for line in response.text.splitlines()] == [
+        'username',
+        'test1',
+        'test2',
+    ]
+
+
+def test_async_patch_user(async_client):
+    user_id = create_user(async_client).json()['id']
+    token = get_token(async_client)
+
+    response = async_client.patch(
+        f'/users/{user_id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'email': 'renamed@example.com'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'id': user_id,
+        'username': 'test',
+        'email': 'renamed@example.com',
+    }
+
+
+def test_async_refresh_rotates_the_refresh_token(async_client):
+    create_user(async_client)
+    refresh_token = async_client.post(
+        '/auth/token',
+        data={'username': 'test@example.com', 'password': 'secret'},
+    ).json()['refresh_token']
+
+    response = async_client.post(
+        '/auth/refresh', json={'refresh_token': refresh_token}
+    )
+    reused = async_client.post(
+        '/auth/refresh', json={'refresh_token': refresh_token}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['refresh_token'] != refresh_token
+    assert reused.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_async_refresh_token_dies_with_its_user(async_client):
+    create_user(async_client)
+    tokens = async_client.post(
+        '/auth/token',
+        data={'username': 'test@example.com', 'password': 'secret'},
+    ).json()
+    async_client.delete(
+        '/users/1',
+        headers={'Authorization': f'Bearer {tokens["access_token"]}'},
+    )
+    create_user(async_client, 'bob')
+
+    response = async_client.post(
+        '/auth/refresh', json={'refresh_token': tokens['refresh_token']}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_async_password_change_revokes_refresh_tokens(async_client):
+    create_user(async_client)
+    tokens = async_client.post(
+        '/auth/token',
+        data={'username': 'test@example.com', 'password': 'secret'},
+    ).json()
+    async_client.patch(
+        '/users/1',
+        headers={'Authorization': f'Bearer {tokens["access_token"]}'},
+        json={'password': 'new'},
+    )
+
+    response = async_client.post(
+        '/auth/refresh', json={'refresh_token': tokens['refresh_token']}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
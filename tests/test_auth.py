@@ -1,6 +1,16 @@
+from datetime import datetime, timedelta
 from http import HTTPStatus
 
+import pytest
 from freezegun import freeze_time
+from jwt import decode
+from sqlalchemy import insert, select
+from zoneinfo import ZoneInfo
+
+from fast_api_todo.models import RefreshToken, RevokedToken
+from fast_api_todo.refresh import hash_refresh_token
+from fast_api_todo.routers import auth
+from fast_api_todo.security import revocations, settings
 
 
 def test_get_token(client, user):
@@ -102,3 +112,195 @@ def test_token_expired_dont_refresh(client, user):
 
         assert response.status_code == HTTPStatus.UNAUTHORIZED
         assert response.json() == {'detail': 'Could not validate credentials'}
+
+
+def test_logout_revokes_the_token(client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/todos/', headers=headers)
+
+    response = client.post('/auth/logout', headers=headers)
+    after_logout = client.get('/todos/', headers=headers)
+
+    assert response.json() == {'message': 'Logged out'}
+    assert after_logout.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_refresh_token_revokes_the_previous_token(client, token):
+    response = client.post(
+        '/auth/refresh_token', headers={'Authorization': f'Bearer {token}'}
+    )
+    new_token = response.json()['access_token']
+
+    old = client.get('/todos/', headers={'Authorization': f'Bearer {token}'})
+    new = client.get(
+        '/todos/', headers={'Authorization': f'Bearer {new_token}'}
+    )
+
+    assert old.status_code == HTTPStatus.UNAUTHORIZED
+    assert new.status_code == HTTPStatus.OK
+
+
+def test_revocations_from_other_workers_are_synced(session, client, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/todos/', headers=headers)
+    jti = decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])[
+        'jti'
+    ]
+    session.execute(
+        insert(RevokedToken).values(
+            jti=jti,
+            expires_at=datetime.now(tz=ZoneInfo('UTC')) + timedelta(hours=1),
+        )
+    )
+    session.commit()
+
+    before_sync = client.get('/todos/', headers=headers)
+    revocations.clear()
+    after_sync = client.get('/todos/', headers=headers)
+
+    assert before_sync.status_code == HTTPStatus.OK
+    assert after_sync.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_logout_prunes_expired_revocations(session, client, token):
+    session.execute(
+        insert(RevokedToken).values(
+            jti='expired',
+            expires_at=datetime.now(tz=ZoneInfo('UTC')) - timedelta(hours=1),
+        )
+    )
+    session.commit()
+
+    client.post('/auth/logout', headers={'Authorization': f'Bearer {token}'})
+
+    assert 'expired' not in session.scalars(select(RevokedToken.jti)).all()
+
+
+def login(client, user):
+    return client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    ).json()
+
+
+def test_login_returns_a_refresh_token(session, client, user):
+    tokens = login(client, user)
+
+    stored = session.scalar(select(RefreshToken.token_hash))
+
+    assert tokens['refresh_token']
+    assert stored == hash_refresh_token(tokens['refresh_token'])
+
+
+def test_refresh_rotates_the_refresh_token(
+    client, user, assert_num_queries, monkeypatch
+):
+    refresh_token = login(client, user)['refresh_token']
+    monkeypatch.setattr(auth, 'verify_and_update_password', None)
+
+    with assert_num_queries(3) as statements:
+        response = client.post(
+            '/auth/refresh', json={'refresh_token': refresh_token}
+        )
+
+    tokens = response.json()
+    reused = client.post(
+        '/auth/refresh', json={'refresh_token': refresh_token}
+    )
+    todos = client.get(
+        '/todos/',
+        headers={'Authorization': f'Bearer {tokens["access_token"]}'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert statements[0].startswith('DELETE FROM refresh_tokens')
+    assert tokens['refresh_token'] != refresh_token
+    assert reused.status_code == HTTPStatus.UNAUTHORIZED
+    assert todos.status_code == HTTPStatus.OK
+
+
+def test_refresh_token_expires(client, user):
+    with freeze_time('2024-07-12 00:00:00'):
+        refresh_token = login(client, user)['refresh_token']
+
+    with freeze_time('2024-08-12 00:00:00'):
+        response = client.post(
+            '/auth/refresh', json={'refresh_token': refresh_token}
+        )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+    assert response.json() == {'detail': 'Could not validate credentials'}
+
+
+def test_logout_revokes_the_refresh_token(client, user):
+    tokens = login(client, user)
+
+    client.post(
+        '/auth/logout',
+        headers={'Authorization': f'Bearer {tokens["access_token"]}'},
+        json={'refresh_token': tokens['refresh_token']},
+    )
+    response = client.post(
+        '/auth/refresh', json={'refresh_token': tokens['refresh_token']}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_refresh_token_dies_with_its_user(client, user):
+    tokens = login(client, user)
+    client.delete(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {tokens["access_token"]}'},
+    )
+    client.post(
+        '/users/',
+        json={'username': 'bob', 'email': 'bob@b.com', 'password': 'secret'},
+    )
+
+    response = client.post(
+        '/auth/refresh', json={'refresh_token': tokens['refresh_token']}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.parametrize(
+    ('method', 'body'),
+    [
+        (
+            'put',
+            {'username': 'alice', 'email': 'a@b.com', 'password': 'new'},
+        ),
+        ('patch', {'password': 'new'}),
+    ],
+)
+def test_password_change_revokes_refresh_tokens(client, user, method, body):
+    tokens = login(client, user)
+    client.request(
+        method,
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {tokens["access_token"]}'},
+        json=body,
+    )
+
+    response = client.post(
+        '/auth/refresh', json={'refresh_token': tokens['refresh_token']}
+    )
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_profile_change_keeps_refresh_tokens(client, user):
+    tokens = login(client, user)
+    client.patch(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {tokens["access_token"]}'},
+        json={'username': 'bob'},
+    )
+
+    response = client.post(
+        '/auth/refresh', json={'refresh_token': tokens['refresh_token']}
+    )
+
+    assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,121 @@
+import json
+from http import HTTPStatus
+
+from fast_api_todo.bulk import insert_users
+from fast_api_todo.routers import users
+
+
+def ndjson(*rows):
+    return '\n'.join(
+        row if isinstance(row, str) else json.dumps(row) for row in rows
+    )
+
+
+def auth(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def new_user(username):
+    return {
+        'username': username,
+        'email': f'{username}@example.com',
+        'password': 'secret',
+    }
+
+
+def test_bulk_create_users(client, token, monkeypatch):
+    monkeypatch.setattr(users.settings, 'BULK_BATCH_SIZE', 2)
+
+    response = client.post(
+        '/users/bulk',
+        headers=auth(token),
+        content=ndjson(
+            new_user('bulk1'), new_user('bulk2'), new_user('bulk3')
+        ),
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'created': 3,
+        'failed': 0,
+        'results': [
+            {'line': 1, 'status': 'created', 'id': 2, 'username': 'bulk1'},
+            {'line': 2, 'status': 'created', 'id': 3, 'username': 'bulk2'},
+            {'line': 3, 'status': 'created', 'id': 4, 'username': 'bulk3'},
+        ],
+    }
+    assert client.get('/users/4').json()['username'] == 'bulk3'
+
+
+def test_bulk_create_users_reports_failures(client, user, token):
+    response = client.post(
+        '/users/bulk',
+        headers=auth(token),
+        content=ndjson(
+            new_user('bulk1'),
+            '',
+            {**new_user('bulk1'), 'email': 'other@example.com'},
+            {**new_user('bulk2'), 'email': 'bulk1@example.com'},
+            {**new_user(user.username), 'email': 'new@example.com'},
+            new_user('bulk3') | {'email': user.email},
+            '{"username": "broken"',
+        ),
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'created': 1,
+        'failed': 5,
+        'results': [
+            {'line': 1, 'status': 'created', 'id': 2, 'username': 'bulk1'},
+            {
+                'line': 3,
+                'status': 'failed',
+                'detail': 'Username already existis',
+            },
+            {'line': 4, 'status': 'failed', 'detail': 'Email already existis'},
+            {
+                'line': 5,
+                'status': 'failed',
+                'detail': 'Username already existis',
+            },
+            {'line': 6, 'status': 'failed', 'detail': 'Email already existis'},
+            {'line': 7, 'status': 'failed', 'detail': 'Invalid user'},
+        ],
+    }
+
+
+def test_bulk_create_users_requires_authentication(client):
+    response = client.post('/users/bulk', content=ndjson(new_user('bulk1')))
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_bulk_rows_rejected_by_the_database_do_not_claim_names(
+    client, user, token
+):
+    response = client.post(
+        '/users/bulk',
+        headers=auth(token),
+        content=ndjson(
+            {**new_user('bulk1'), 'email': user.email},
+            new_user('bulk1'),
+        ),
+    )
+
+    assert response.json()['results'] == [
+        {'line': 1, 'status': 'failed', 'detail': 'Email already existis'},
+        {'line': 2, 'status': 'created', 'id': 2, 'username': 'bulk1'},
+    ]
+
+
+def test_insert_users_falls_back_to_rows_on_conflict(session, user):
+    ids = insert_users(
+        session,
+        [
+            {'username': user.username, 'email': 'x@x.com', 'password': 'x'},
+            {'username': 'new', 'email': 'new@x.com', 'password': 'x'},
+        ],
+    )
+
+    assert ids == [None, user.id + 1]
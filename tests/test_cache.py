@@ -0,0 +1,176 @@
+import time
+from fnmatch import fnmatch
+
+from freezegun import freeze_time
+
+from fast_api_todo.cache import RedisCache, TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2)
+    cache.set('a', 'one')
+    cache.set('b', 'two')
+    cache.get('a')
+
+    cache.set('c', 'three')
+
+    assert cache.get('a') == 'one'
+    assert cache.get('b') is None
+    assert cache.get('c') == 'three'
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache()
+
+    with freeze_time('2024-07-12 00:00:00') as frozen:
+        cache.set('a', 'one', expires_at=frozen().timestamp() + 60)
+        assert cache.get('a') == 'one'
+
+        frozen.tick(61)
+
+        assert cache.get('a') is None
+        assert len(cache) == 0
+
+
+def test_ttl_cache_invalidates_by_tag():
+    cache = TTLCache()
+    cache.set('a', 'one', tag='user:1')
+    cache.set('b', 'two', tag='user:1')
+    cache.set('c', 'three', tag='user:2')
+
+    cache.invalidate_tag('user:1')
+
+    assert cache.get('a') is None
+    assert cache.get('b') is None
+    assert cache.get('c') == 'three'
+
+
+def test_ttl_cache_counts_generations_per_tag():
+    cache = TTLCache()
+    bumps = 2
+
+    for _ in range(bumps):
+        cache.bump_generation('users')
+
+    cache.clear()
+
+    assert cache.generation('users') == bumps
+    assert cache.generation('todos') == 0
+
+
+class InMemoryRedis:
+    def __init__(self):
+        self.values = {}
+        self.expires = {}
+
+    def _alive(self, name):
+        expires_at = self.expires.get(name)
+
+        if expires_at is not None and expires_at <= time.time() * 1000:
+            self.delete(name)
+
+        return name in self.values
+
+    def get(self, name):
+        return self.values[name] if self._alive(name) else None
+
+    def set(self, name, value, pxat=None):
+        self.values[name] = value
+        self.expires[name] = pxat
+
+    def incr(self, name):
+        value = int(self.get(name) or 0) + 1
+        self.values[name] = value
+        self.expires.setdefault(name, None)
+
+        return value
+
+    def decr(self, name):
+        self.values[name] = int(self.get(name) or 0) - 1
+
+        return self.values[name]
+
+    def pexpire(self, name, milliseconds):
+        self.expires[name] = time.time() * 1000 + milliseconds
+
+    def sadd(self, name, *members):
+        self.values.setdefault(name, set()).update(
+            member.encode() for member in members
+        )
+
+    def smembers(self, name):
+        return self.values[name] if self._alive(name) else set()
+
+    def pexpireat(self, name, when):
+        self.expires[name] = when
+
+    def delete(self, *names):
+        for name in names:
+            self.values.pop(name, None)
+            self.expires.pop(name, None)
+
+    def scan_iter(self, match):
+        return [name for name in self.values if fnmatch(name, match)]
+
+    def pipeline(self, transaction=True):
+        return InMemoryPipeline(self)
+
+
+class InMemoryPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.calls.append((getattr(self.client, name), args, kwargs))
+
+        return queue
+
+    def execute(self):
+        return [method(*args, **kwargs) for method, args, kwargs in self.calls]
+
+
+def test_redis_cache_invalidates_by_tag():
+    client = InMemoryRedis()
+    cache = RedisCache(client)
+    cache.set('a', b'one', tag='users')
+    cache.set('b', b'two', tag='users')
+    cache.set('c', b'three')
+
+    cache.invalidate_tag('users')
+
+    assert cache.get('a') is None
+    assert cache.get('b') is None
+    assert cache.get('c') == b'three'
+    assert 'fast_api_todo:tag:users' not in client.values
+
+
+def test_redis_cache_counts_generations_per_tag():
+    cache = RedisCache(InMemoryRedis())
+
+    cache.bump_generation('users')
+
+    assert cache.generation('users') == 1
+    assert cache.generation('todos') == 0
+
+
+def test_redis_cache_expires_entries_and_tags():
+    client = InMemoryRedis()
+    cache = RedisCache(client)
+
+    cache.set('a', b'one', expires_at=time.time() - 1, tag='users')
+
+    assert cache.get('a') is None
+    assert client.smembers('fast_api_todo:tag:users') == set()
+
+
+def test_redis_cache_clear_only_removes_prefixed_keys():
+    client = InMemoryRedis()
+    client.set('other', b'value')
+    cache = RedisCache(client)
+    cache.set('a', b'one', tag='users')
+
+    cache.clear()
+
+    assert client.values == {'other': b'value'}
@@ -0,0 +1,168 @@
+import asyncio
+import os
+from http import HTTPStatus
+
+import pytest
+from pwdlib.hashers.argon2 import Argon2Hasher
+from sqlalchemy import select
+
+from fast_api_todo import security
+from fast_api_todo.calibrate import calibrate, min_time_cost
+from fast_api_todo.hashing import (
+    HashingPoolSaturatedError,
+    PasswordHashingExecutor,
+    check_password,
+    hash_password,
+    hashing_seconds,
+    settings,
+)
+from fast_api_todo.models import User
+from tests.conftest import UserFactory
+
+
+def test_executor_hashes_inline():
+    executor = PasswordHashingExecutor()
+
+    hashed = executor.run(hash_password, 'secret')
+
+    assert executor.run(check_password, 'secret', hashed)
+    assert not executor.run(check_password, 'wrong', hashed)
+    assert executor.pending == 0
+
+
+def test_executor_records_hash_time():
+    executor = PasswordHashingExecutor()
+    count = hashing_seconds.count(operation='hash_password')
+
+    executor.run(hash_password, 'secret')
+
+    assert hashing_seconds.count(operation='hash_password') == count + 1
+
+
+def test_executor_hashes_in_process_pool():
+    executor = PasswordHashingExecutor(workers=1)
+
+    try:
+        hashed = executor.submit(hash_password, 'secret').result()
+        verified = asyncio.run(
+            executor.run_async(check_password, 'secret', hashed)
+        )
+    finally:
+        executor.shutdown()
+
+    assert verified
+    assert executor.pending == 0
+
+
+def test_executor_rejects_when_saturated():
+    executor = PasswordHashingExecutor(max_pending=0)
+
+    with pytest.raises(HashingPoolSaturatedError):
+        executor.run(hash_password, 'secret')
+
+    assert executor.pending == 0
+
+
+def test_executor_map_holds_a_slot_per_job():
+    executor = PasswordHashingExecutor(max_pending=64)
+    jobs = 8
+
+    seen = executor.map(lambda _: executor.pending, range(jobs))
+
+    assert max(seen) == min(os.cpu_count() or 1, jobs)
+    assert executor.pending == 0
+
+
+def test_executor_map_rejects_when_saturated():
+    executor = PasswordHashingExecutor(max_pending=2)
+    executor._acquire('hash_password', 2)
+
+    with pytest.raises(HashingPoolSaturatedError):
+        executor.map(hash_password, ['secret'])
+
+    executor._release(2)
+
+    assert executor.pending == 0
+
+
+def test_create_user_returns_503_when_hashing_is_saturated(
+    client, monkeypatch
+):
+    monkeypatch.setattr(
+        security, 'hashing_executor', PasswordHashingExecutor(max_pending=0)
+    )
+
+    response = client.post(
+        '/users/',
+        json={
+            'username': 'test',
+            'email': 'test@example.com',
+            'password': 'test',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    assert response.headers['Retry-After'] == '1'
+
+
+def test_login_rehashes_outdated_parameters(session, client):
+    outdated = Argon2Hasher(time_cost=1, memory_cost=19_456, parallelism=1)
+    user = UserFactory(password=outdated.hash('secret'))
+    session.add(user)
+    session.commit()
+    email = user.email
+
+    response = client.post(
+        '/auth/token', data={'username': email, 'password': 'secret'}
+    )
+    password = session.scalar(select(User.password).where(User.email == email))
+
+    assert response.status_code == HTTPStatus.OK
+    assert password.startswith(
+        f'$argon2id$v=19$m={settings.ARGON2_MEMORY_COST},'
+        f't={settings.ARGON2_TIME_COST},p={settings.ARGON2_PARALLELISM}$'
+    )
+    assert check_password('secret', password)
+
+
+def test_calibrate_fits_memory_then_time_to_the_target():
+    def measure(time_cost, memory_cost, parallelism):
+        return time_cost * memory_cost / 1_000_000
+
+    target = 0.05
+    parameters, elapsed = calibrate(target, 2, measure=measure)
+
+    assert parameters == {
+        'ARGON2_TIME_COST': 1,
+        'ARGON2_MEMORY_COST': 47_104,
+        'ARGON2_PARALLELISM': 2,
+    }
+    assert elapsed <= target
+
+
+def test_calibrate_never_goes_below_the_owasp_minimums():
+    def measure(time_cost, memory_cost, parallelism):
+        return time_cost * memory_cost * 1.2e-6
+
+    low_memory, _ = calibrate(0.05, 1, measure=measure)
+    capped, _ = calibrate(0.05, 1, max_memory_cost=12_288, measure=measure)
+
+    assert low_memory == {
+        'ARGON2_TIME_COST': min_time_cost(19_456),
+        'ARGON2_MEMORY_COST': 19_456,
+        'ARGON2_PARALLELISM': 1,
+    }
+    assert capped['ARGON2_TIME_COST'] == min_time_cost(12_288)
+
+
+def test_calibrate_adds_passes_when_memory_is_cheap():
+    def measure(time_cost, memory_cost, parallelism):
+        return time_cost * 0.012
+
+    passes, max_memory_cost = 4, 65_536
+    parameters, _ = calibrate(
+        0.05, 1, max_memory_cost=max_memory_cost, measure=measure
+    )
+
+    assert parameters['ARGON2_TIME_COST'] == passes
+    assert parameters['ARGON2_MEMORY_COST'] == max_memory_cost
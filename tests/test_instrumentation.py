@@ -0,0 +1,95 @@
+import logging
+from http import HTTPStatus
+
+from sqlalchemy import create_engine, text
+
+from fast_api_todo.instrumentation import (
+    instrument_engine,
+    request_duration_seconds,
+    request_hash_seconds,
+    request_jwt_seconds,
+    request_statements,
+)
+from fast_api_todo.metrics import MetricsRegistry
+
+
+def test_metrics_are_recorded_per_route(client, user):
+    labels = {'method': 'GET', 'route': '/users/{user_id}'}
+    requests = request_duration_seconds.count(**labels, status='200')
+    statements = request_statements.sum(**labels)
+
+    client.get(f'/users/{user.id}')
+
+    assert request_duration_seconds.count(**labels, status='200') == (
+        requests + 1
+    )
+    assert request_statements.sum(**labels) == statements + 1
+
+
+def test_hash_and_jwt_time_are_recorded(client, user):
+    login = {'method': 'POST', 'route': '/auth/token'}
+    refresh = {'method': 'POST', 'route': '/auth/refresh_token'}
+    hash_seconds = request_hash_seconds.sum(**login)
+    jwt_seconds = request_jwt_seconds.sum(**refresh)
+
+    token = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    ).json()['access_token']
+    client.post(
+        '/auth/refresh_token', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert request_hash_seconds.sum(**login) > hash_seconds
+    assert request_jwt_seconds.sum(**refresh) > jwt_seconds
+
+
+def test_metrics_endpoint_renders_prometheus_format(client):
+    client.get('/')
+
+    response = client.get('/metrics')
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert '# TYPE http_request_duration_seconds histogram' in response.text
+    assert (
+        'http_request_duration_seconds_count'
+        '{method="GET",route="/",status="200"}'
+    ) in response.text
+
+
+def test_unmatched_routes_share_a_label(client):
+    client.get('/does-not-exist')
+
+    assert request_duration_seconds.count(
+        method='GET', route='unmatched', status='404'
+    )
+
+
+def test_slow_queries_are_logged(caplog):
+    engine = instrument_engine(
+        create_engine('sqlite://'), slow_query_threshold=0
+    )
+
+    with caplog.at_level(logging.WARNING), engine.connect() as connection:
+        connection.execute(text('SELECT 1'))
+
+    assert 'Slow query' in caplog.text
+    assert 'SELECT 1' in caplog.text
+
+
+def test_registry_renders_counters_and_histograms():
+    registry = MetricsRegistry()
+    counter = registry.counter('test_events_total', 'Events.', ('kind',))
+    histogram = registry.histogram('test_seconds', 'Timing.', buckets=(1,))
+    counter.inc(kind='a"b')
+    histogram.observe(0.5)
+    histogram.observe(2)
+
+    rendered = registry.render()
+
+    assert 'test_events_total{kind="a\\"b"} 1.0' in rendered
+    assert 'test_seconds_bucket{le="1.0"} 1' in rendered
+    assert 'test_seconds_bucket{le="+Inf"} 2' in rendered
+    assert 'test_seconds_sum 2.5' in rendered
+    assert 'test_seconds_count 2' in rendered
@@ -0,0 +1,145 @@
+from http import HTTPStatus
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+    PublicFormat,
+)
+from jwt import PyJWK, decode, get_unverified_header
+from jwt.exceptions import InvalidTokenError
+
+from fast_api_todo import app, security
+from fast_api_todo.keys import Keyring, load_key
+
+
+def private_pem(private_key):
+    return private_key.private_bytes(
+        Encoding.PEM, PrivateFormat.PKCS8, NoEncryption()
+    ).decode()
+
+
+def public_pem(private_key):
+    return (
+        private_key
+        .public_key()
+        .public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo)
+        .decode()
+    )
+
+
+@pytest.fixture(scope='module')
+def rsa_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture(scope='module')
+def ed25519_key():
+    return ed25519.Ed25519PrivateKey.generate()
+
+
+def test_keyring_signs_with_kid(ed25519_key):
+    keyring = Keyring(
+        [load_key('2024-07', private_pem(ed25519_key))],
+        signing_kid='2024-07',
+    )
+
+    token = keyring.encode({'sub': 'test@test.com'})
+
+    assert get_unverified_header(token) == {
+        'alg': 'EdDSA',
+        'kid': '2024-07',
+        'typ': 'JWT',
+    }
+    assert keyring.decode(token) == {'sub': 'test@test.com'}
+
+
+def test_keyring_verifies_tokens_from_rotated_keys(rsa_key, ed25519_key):
+    old = Keyring([load_key('old', private_pem(rsa_key))], signing_kid='old')
+    token = old.encode({'sub': 'test@test.com'})
+
+    rotated = Keyring(
+        [
+            load_key('old', public_pem(rsa_key)),
+            load_key('new', private_pem(ed25519_key)),
+        ],
+        signing_kid='new',
+    )
+
+    assert rotated.decode(token) == {'sub': 'test@test.com'}
+    assert get_unverified_header(rotated.encode({}))['kid'] == 'new'
+
+
+def test_keyring_rejects_unknown_kid(rsa_key, ed25519_key):
+    other = Keyring(
+        [load_key('other', private_pem(rsa_key))], signing_kid='other'
+    )
+    keyring = Keyring(
+        [load_key('current', private_pem(ed25519_key))],
+        signing_kid='current',
+    )
+
+    with pytest.raises(InvalidTokenError):
+        keyring.decode(other.encode({'sub': 'test@test.com'}))
+
+
+def test_keyring_requires_a_private_signing_key(ed25519_key):
+    with pytest.raises(ValueError, match='No private key'):
+        Keyring(
+            [load_key('public', public_pem(ed25519_key))],
+            signing_kid='public',
+        )
+
+
+def test_load_key_reads_pem_files(tmp_path, ed25519_key):
+    path = tmp_path / 'signing.pem'
+    path.write_text(private_pem(ed25519_key), encoding='utf-8')
+
+    key = load_key('file', str(path))
+
+    assert key.algorithm == 'EdDSA'
+    assert key.signing_key is not None
+
+
+def test_jwks_verifies_tokens(monkeypatch, client, rsa_key, ed25519_key):
+    keyring = Keyring(
+        [
+            load_key('rsa', public_pem(rsa_key)),
+            load_key('ed', private_pem(ed25519_key)),
+        ],
+        signing_kid='ed',
+    )
+    monkeypatch.setattr(app, 'keyring', keyring)
+    token = keyring.encode({'sub': 'test@test.com'})
+
+    response = client.get('/.well-known/jwks.json')
+    jwks = {jwk['kid']: jwk for jwk in response.json()['keys']}
+    jwk = PyJWK(jwks[get_unverified_header(token)['kid']])
+
+    assert response.status_code == HTTPStatus.OK
+    assert set(jwks) == {'rsa', 'ed'}
+    assert 'd' not in jwks['ed']
+    assert decode(token, jwk.key, algorithms=[jwk.algorithm_name]) == {
+        'sub': 'test@test.com'
+    }
+
+
+def test_jwks_never_exposes_the_shared_secret(client):
+    response = client.get('/.well-known/jwks.json')
+
+    assert response.json() == {'keys': []}
+
+
+def test_asymmetric_tokens_authenticate(monkeypatch, client, user, rsa_key):
+    keyring = Keyring([load_key('rsa', private_pem(rsa_key))], 'rsa')
+    monkeypatch.setattr(security, 'keyring', keyring)
+    token = security.create_access_token({'sub': user.email})
+
+    response = client.get(
+        '/todos/', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert get_unverified_header(token)['alg'] == 'RS256'
@@ -0,0 +1,151 @@
+from http import HTTPStatus
+
+import pytest
+from fastapi import HTTPException
+from freezegun import freeze_time
+
+from fast_api_todo.ratelimit import (
+    MemoryRateLimitBackend,
+    RateLimit,
+    RedisRateLimitBackend,
+    login_username_limit,
+)
+from fast_api_todo.routers import auth
+from tests.test_cache import InMemoryRedis
+
+
+@pytest.mark.parametrize(
+    'backend',
+    [MemoryRateLimitBackend(), RedisRateLimitBackend(InMemoryRedis())],
+    ids=['memory', 'redis'],
+)
+def test_sliding_window_weights_the_previous_window(backend):
+    limit = 4
+
+    with freeze_time('2024-07-12 00:00:00') as frozen:
+        for _ in range(limit):
+            assert backend.hit('key', limit, 60) == (True, 0)
+
+        assert backend.hit('key', limit, 60) == (False, 60)
+
+        frozen.tick(90)
+
+        # Half of the previous window still counts: 4 * 0.5 = 2 hits.
+        assert backend.hit('key', limit, 60)[0]
+        assert backend.hit('key', limit, 60)[0]
+        assert backend.hit('key', limit, 60) == (False, 15)
+
+        frozen.tick(60)
+
+        assert backend.hit('key', limit, 60) == (True, 0)
+
+
+@pytest.mark.parametrize(
+    'backend',
+    [MemoryRateLimitBackend(), RedisRateLimitBackend(InMemoryRedis())],
+    ids=['memory', 'redis'],
+)
+def test_peeks_do_not_count_against_the_limit(backend):
+    limit = 1
+
+    assert backend.hit('peek', limit, 60, count=False) == (True, 0)
+    assert backend.hit('peek', limit, 60) == (True, 0)
+    assert not backend.hit('peek', limit, 60, count=False)[0]
+
+
+def test_memory_backend_evicts_least_recently_used_keys():
+    maxsize = 2
+    backend = MemoryRateLimitBackend(maxsize=maxsize)
+    backend.hit('a', 1, 60)
+    backend.hit('b', 1, 60)
+    backend.hit('a', 1, 60)
+
+    backend.hit('c', 1, 60)
+
+    assert len(backend) == maxsize
+    assert backend.hit('b', 1, 60)[0]
+    assert not backend.hit('c', 1, 60)[0]
+
+
+def test_disabled_rate_limit_never_hits_the_backend():
+    backend = MemoryRateLimitBackend()
+    rate_limit = RateLimit('api', 0, 60, backend)
+
+    rate_limit.check('client')
+
+    assert len(backend) == 0
+
+
+def test_rate_limit_rejects_with_retry_after():
+    rate_limit = RateLimit('api', 1, 60, MemoryRateLimitBackend())
+    rate_limit.check('client')
+
+    with pytest.raises(HTTPException) as exc_info:
+        rate_limit.check('client')
+
+    assert exc_info.value.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(exc_info.value.headers['Retry-After']) > 0
+
+
+def test_login_is_throttled_before_hashing(client, user, monkeypatch):
+    calls = []
+
+    def verify_and_update_password(plain_password, hashed_password):
+        calls.append(plain_password)
+
+        return False, None
+
+    monkeypatch.setattr(
+        auth, 'verify_and_update_password', verify_and_update_password
+    )
+    data = {'username': user.email, 'password': 'wrong'}
+
+    for _ in range(login_username_limit.limit):
+        response = client.post('/auth/token', data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    response = client.post('/auth/token', data=data)
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert response.json() == {'detail': 'Too many requests, try again later'}
+    assert 'Retry-After' in response.headers
+    assert len(calls) == login_username_limit.limit
+
+
+def test_login_throttle_is_per_username(client, user):
+    data = {'username': 'other@test.com', 'password': 'wrong'}
+
+    for _ in range(login_username_limit.limit):
+        client.post('/auth/token', data=data)
+
+    response = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': user.clean_password},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_successful_logins_do_not_count_against_the_username(client, user):
+    data = {'username': user.email, 'password': user.clean_password}
+
+    for _ in range(login_username_limit.limit):
+        client.post('/auth/token', data=data)
+
+    response = client.post('/auth/token', data=data)
+
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_failed_logins_still_throttle_the_username(client, user):
+    wrong = {'username': user.email, 'password': 'wrong'}
+    right = {'username': user.email, 'password': user.clean_password}
+
+    for _ in range(login_username_limit.limit - 1):
+        client.post('/auth/token', data=wrong)
+
+    client.post('/auth/token', data=right)
+    client.post('/auth/token', data=wrong)
+    response = client.post('/auth/token', data=right)
+
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS
@@ -0,0 +1,198 @@
+import time
+from http import HTTPStatus
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from fast_api_todo.replicas import PRIMARY_COOKIE, ReplicaSet
+from fast_api_todo.response_cache import (
+    response_cache,
+    settings,
+    user_key,
+    users_page_key,
+)
+from fast_api_todo.routers import users
+from fast_api_todo.security import create_access_token
+
+
+def create_user(client, username='alice'):
+    return client.post(
+        '/users/',
+        json={
+            'username': username,
+            'email': f'{username}@example.com',
+            'password': 'secret',
+        },
+    ).json()
+
+
+def test_reads_are_served_by_the_replica(replica_client):
+    client, sync_replica = replica_client
+    user = create_user(client)
+    client.cookies.clear()
+
+    stale = client.get(f'/users/{user["id"]}')
+    sync_replica()
+    replicated = client.get(f'/users/{user["id"]}')
+
+    assert stale.status_code == HTTPStatus.NOT_FOUND
+    assert replicated.json() == user
+
+
+def test_writes_make_following_reads_use_the_primary(replica_client):
+    client, _ = replica_client
+
+    response = client.post(
+        '/users/',
+        json={
+            'username': 'alice',
+            'email': 'alice@example.com',
+            'password': 'secret',
+        },
+    )
+    read = client.get(f'/users/{response.json()["id"]}')
+
+    assert PRIMARY_COOKIE in response.cookies
+    assert read.status_code == HTTPStatus.OK
+
+
+def test_expired_primary_cookie_reads_from_the_replica(replica_client):
+    client, _ = replica_client
+    user = create_user(client)
+    client.cookies.set(PRIMARY_COOKIE, str(time.time() - 1))
+
+    response = client.get(f'/users/{user["id"]}')
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_writes_after_replica_authentication_use_the_primary(
+    replica_client,
+):
+    client, sync_replica = replica_client
+    user = create_user(client)
+    sync_replica()
+    client.cookies.clear()
+    token = create_access_token({'sub': user['email']})
+
+    response = client.put(
+        f'/users/{user["id"]}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'username': 'bob',
+            'email': 'bob@example.com',
+            'password': 'secret',
+        },
+    )
+    read = client.get(f'/users/{user["id"]}')
+
+    assert response.status_code == HTTPStatus.OK
+    assert read.json()['username'] == 'bob'
+
+
+def test_search_is_served_by_the_replica(replica_client):
+    client, sync_replica = replica_client
+    user = create_user(client)
+    sync_replica()
+    create_user(client, 'bob')
+    client.cookies.clear()
+    token = create_access_token({'sub': user['email']})
+    headers = {'Authorization': f'Bearer {token}'}
+    params = {'q': 'bob', 'scope': 'users'}
+
+    stale = client.get('/search/', headers=headers, params=params)
+    sync_replica()
+    replicated = client.get('/search/', headers=headers, params=params)
+
+    assert stale.json() == {'users': []}
+    assert [found['username'] for found in replicated.json()['users']] == [
+        'bob'
+    ]
+
+
+def test_replica_bodies_in_the_cache_do_not_hide_the_authors_write(
+    replica_client,
+):
+    client, sync_replica = replica_client
+    user = create_user(client)
+    sync_replica()
+    client.cookies.clear()
+    token = create_access_token({'sub': user['email']})
+    url = f'/users/{user["id"]}'
+
+    client.patch(
+        url,
+        headers={'Authorization': f'Bearer {token}'},
+        json={'username': 'bob'},
+    )
+    pinned = dict(client.cookies)
+    client.cookies.clear()
+    stale = client.get(url)
+    client.cookies.update(pinned)
+    own = client.get(url)
+
+    _, expires_at, _ = response_cache._entries[user_key(user['id'])]
+
+    assert stale.json()['username'] == 'alice'
+    assert own.json()['username'] == 'bob'
+    assert expires_at <= time.time() + settings.READ_YOUR_WRITES_SECONDS
+
+
+def test_pinned_reads_do_not_join_a_replica_flight(
+    replica_client, monkeypatch
+):
+    client, _ = replica_client
+    user = create_user(client)
+    flights = []
+    do = users.flight.do
+
+    def spy(key, fn):
+        flights.append(key)
+        return do(key, fn)
+
+    monkeypatch.setattr(users.flight, 'do', spy)
+    pinned = client.get(f'/users/{user["id"]}')
+    client.cookies.clear()
+    client.get('/users/')
+
+    assert pinned.status_code == HTTPStatus.OK
+    assert flights == [users_page_key(10, 0, None)]
+
+
+def test_replicas_round_robin(tmp_path):
+    engines = [
+        create_engine(f'sqlite:///{tmp_path / name}', poolclass=NullPool)
+        for name in ('a.db', 'b.db')
+    ]
+    replicas = ReplicaSet(engines)
+
+    assert [replicas.choose() for _ in range(4)] == engines * 2
+
+
+def test_replicas_least_connections(tmp_path):
+    first, second = (
+        create_engine(f'sqlite:///{tmp_path / name}', poolclass=NullPool)
+        for name in ('a.db', 'b.db')
+    )
+    replicas = ReplicaSet([first, second], strategy='least_connections')
+
+    with first.connect():
+        assert replicas.choose() is second
+
+    assert replicas.choose() is first
+
+
+def test_unhealthy_replicas_are_dropped(tmp_path):
+    healthy = create_engine(f'sqlite:///{tmp_path / "replica.db"}')
+    broken = create_engine(f'sqlite:///{tmp_path / "missing" / "replica.db"}')
+    replicas = ReplicaSet([broken, healthy], health_check_interval=0)
+
+    assert {replicas.choose() for _ in range(4)} == {healthy}
+    assert replicas.healthy == [healthy]
+
+
+def test_no_healthy_replica_falls_back_to_the_primary(tmp_path):
+    broken = create_engine(f'sqlite:///{tmp_path / "missing" / "replica.db"}')
+    replicas = ReplicaSet([broken], health_check_interval=0)
+
+    assert replicas.choose() is None
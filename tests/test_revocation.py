@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import insert
+from zoneinfo import ZoneInfo
+
+from fast_api_todo.models import RevokedToken
+from fast_api_todo.revocation import BloomFilter, RevocationList
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000)
+    keys = [uuid4().hex for _ in range(1000)]
+
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+
+
+def test_bloom_filter_false_positive_rate_is_bounded():
+    max_rate = 0.03
+    trials = 10_000
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+
+    for _ in range(1000):
+        bloom.add(uuid4().hex)
+
+    false_positives = sum(uuid4().hex in bloom for _ in range(trials))
+
+    assert false_positives / trials < max_rate
+
+
+def revoke(session, jti, revoked_at):
+    session.execute(
+        insert(RevokedToken).values(
+            jti=jti,
+            expires_at=datetime.now(tz=ZoneInfo('UTC')) + timedelta(hours=1),
+            revoked_at=revoked_at,
+        )
+    )
+    session.commit()
+
+
+def sync(revocations, session):
+    assert revocations.sync_due()
+    query, rebuild = revocations.sync_query()
+    revocations.apply(session.execute(query), rebuild)
+
+
+def test_revocations_committed_out_of_order_are_synced(session):
+    revocations = RevocationList(sync_interval=0)
+    now = datetime.now(tz=ZoneInfo('UTC'))
+    revoke(session, 'late', now)
+    sync(revocations, session)
+    revoke(session, 'early', now - timedelta(seconds=1))
+    sync(revocations, session)
+
+    assert revocations.might_contain('late')
+    assert revocations.might_contain('early')
+
+
+def test_full_filter_is_rebuilt_without_dropping_entries(session):
+    capacity = 4
+    revocations = RevocationList(capacity=capacity, sync_interval=0)
+    now = datetime.now(tz=ZoneInfo('UTC'))
+
+    for index in range(capacity):
+        revoke(session, f'jti-{index}', now)
+
+    sync(revocations, session)
+    assert revocations.sync_due()
+    query, rebuild = revocations.sync_query()
+    revocations.add('local')
+    rows = session.execute(query).all()
+
+    assert all(revocations.might_contain(f'jti-{i}') for i in range(capacity))
+
+    revocations.apply(rows, rebuild)
+
+    assert revocations.bloom.capacity > capacity
+    assert all(revocations.might_contain(f'jti-{i}') for i in range(capacity))
+    assert revocations.might_contain('local')
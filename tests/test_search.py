@@ -0,0 +1,138 @@
+from http import HTTPStatus
+
+from tests.conftest import TodoFactory
+
+
+def auth(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_search_todos_ranks_best_match_first(session, client, user, token):
+    session.add_all([
+        TodoFactory.build(
+            user_id=user.id, title='buy milk', description='and bread'
+        ),
+        TodoFactory.build(
+            user_id=user.id,
+            title='pay invoice',
+            description='send the invoice to accounting',
+        ),
+        TodoFactory.build(
+            user_id=user.id, title='call bank', description='about invoice'
+        ),
+    ])
+    session.commit()
+
+    response = client.get(
+        '/search/', headers=auth(token), params={'q': 'invoice'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert [todo['title'] for todo in response.json()['todos']] == [
+        'pay invoice',
+        'call bank',
+    ]
+
+
+def test_search_todos_only_returns_own_todos(
+    session, client, user, other_user, token
+):
+    session.add(
+        TodoFactory.build(
+            user_id=other_user.id, title='invoice', description=''
+        )
+    )
+    session.commit()
+
+    response = client.get(
+        '/search/', headers=auth(token), params={'q': 'invoice'}
+    )
+
+    assert response.json() == {'todos': []}
+
+
+def test_search_todos_follows_updates_and_deletes(
+    session, client, user, token
+):
+    todo = TodoFactory(user_id=user.id, title='pay invoice', description='')
+    session.add(todo)
+    session.commit()
+
+    client.patch(
+        f'/todos/{todo.id}', headers=auth(token), json={'title': 'pay rent'}
+    )
+    renamed = client.get('/search/', headers=auth(token), params={'q': 'rent'})
+    stale = client.get(
+        '/search/', headers=auth(token), params={'q': 'invoice'}
+    )
+    client.delete(f'/todos/{todo.id}', headers=auth(token))
+    deleted = client.get('/search/', headers=auth(token), params={'q': 'rent'})
+
+    assert [todo['id'] for todo in renamed.json()['todos']] == [todo.id]
+    assert stale.json() == {'todos': []}
+    assert deleted.json() == {'todos': []}
+
+
+def test_search_todos_pagination_with_cursor(session, client, user, token):
+    session.add_all(
+        TodoFactory.build_batch(
+            5, user_id=user.id, title='invoice', description=''
+        )
+    )
+    session.commit()
+
+    first_page = client.get(
+        '/search/', headers=auth(token), params={'q': 'invoice', 'limit': 3}
+    ).json()
+    second_page = client.get(
+        '/search/',
+        headers=auth(token),
+        params={
+            'q': 'invoice',
+            'limit': 3,
+            'cursor': first_page['next_cursor'],
+        },
+    ).json()
+
+    assert [todo['id'] for todo in first_page['todos']] == [1, 2, 3]
+    assert [todo['id'] for todo in second_page['todos']] == [4, 5]
+    assert 'next_cursor' not in second_page
+
+
+def test_search_treats_query_syntax_as_text(client, token):
+    response = client.get(
+        '/search/', headers=auth(token), params={'q': 'invoice" OR NEAR('}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'todos': []}
+
+
+def test_search_rejects_blank_queries(client, token):
+    response = client.get('/search/', headers=auth(token), params={'q': ' '})
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_search_users(client, user, other_user, token):
+    response = client.get(
+        '/search/',
+        headers=auth(token),
+        params={'q': other_user.username, 'scope': 'users'},
+    )
+
+    assert response.json() == {
+        'users': [
+            {
+                'id': other_user.id,
+                'username': other_user.username,
+                'email': other_user.email,
+            }
+        ]
+    }
+
+
+def test_search_requires_authentication(client):
+    response = client.get('/search/', params={'q': 'invoice'})
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
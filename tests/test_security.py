@@ -2,7 +2,12 @@ from http import HTTPStatus
 
 from jwt import decode
 
-from fast_api_todo.security import create_access_token, settings
+from fast_api_todo.security import (
+    create_access_token,
+    principal_cache_hits,
+    principal_cache_misses,
+    settings,
+)
 
 
 def test_jwt():
@@ -24,3 +29,61 @@ def test_jwt_invalid_token(client):
 
     assert response.status_code == HTTPStatus.UNAUTHORIZED
     assert response.json() == {'detail': 'Could not validate credentials'}
+
+
+def test_current_user_is_served_from_cache(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    hits = principal_cache_hits.value()
+    misses = principal_cache_misses.value()
+
+    client.get('/todos/', headers=headers)
+    client.get('/todos/', headers=headers)
+
+    assert principal_cache_misses.value() == misses + 1
+    assert principal_cache_hits.value() == hits + 1
+
+
+def test_cached_principal_is_invalidated_on_update(client, user, token):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.put(
+        f'/users/{user.id}',
+        headers=headers,
+        json={
+            'username': 'test2',
+            'email': 'test2@example.com',
+            'password': 'test2',
+        },
+    )
+
+    response = client.post('/auth/refresh_token', headers=headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_cached_principal_is_invalidated_on_delete(client, user, token):
+    # A second token is not revoked by the delete, so only the principal
+    # cache stands between it and the deleted user.
+    other_token = create_access_token({'sub': user.email})
+    other_headers = {'Authorization': f'Bearer {other_token}'}
+    client.get('/todos/', headers=other_headers)
+    client.delete(
+        f'/users/{user.id}', headers={'Authorization': f'Bearer {token}'}
+    )
+
+    response = client.get('/todos/', headers=other_headers)
+
+    assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_current_user_lookup_does_not_load_the_password_hash(
+    client, user, assert_num_queries
+):
+    token = create_access_token({'sub': user.email})
+
+    with assert_num_queries(3) as statements:
+        response = client.get(
+            '/todos/', headers={'Authorization': f'Bearer {token}'}
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert all('password' not in statement for statement in statements)
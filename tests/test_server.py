@@ -0,0 +1,35 @@
+from fast_api_todo import server
+from fast_api_todo.settings import Settings
+
+
+def test_worker_count_defaults_to_the_cores():
+    settings = Settings(SERVER_WORKERS=0)  # type: ignore
+    cores = 8
+
+    assert server.worker_count(settings, cpus=cores) == cores
+
+
+def test_worker_count_can_be_configured():
+    workers = 3
+    settings = Settings(SERVER_WORKERS=workers)  # type: ignore
+
+    assert server.worker_count(settings, cpus=8) == workers
+
+
+def test_gunicorn_preloads_the_app():
+    options = server.gunicorn_options(Settings())  # type: ignore
+
+    assert options['preload_app'] is True
+    assert options['worker_class'] == server.WORKER_CLASS
+    assert options['post_fork'] is server.post_fork
+
+
+def test_post_fork_replaces_inherited_pools():
+    pools = [engine.pool for engine in server.engines()]
+
+    server.post_fork(None, None)
+
+    assert all(
+        engine.pool is not pool
+        for engine, pool in zip(server.engines(), pools, strict=True)
+    )
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from starlette.requests import Request
+
+from fast_api_todo.database import get_async_url
+from fast_api_todo.models import table_registry
+from fast_api_todo.response_cache import users_page_key
+from fast_api_todo.routers import async_users
+from fast_api_todo.singleflight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    single_flight_shared,
+)
+from tests.conftest import UserFactory
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    callers = 8
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    shared = single_flight_shared.value()
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return b'body'
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        leader = pool.submit(flight.do, 'user:1', load)
+        started.wait()
+        followers = [
+            pool.submit(flight.do, 'user:1', load) for _ in range(callers - 1)
+        ]
+
+        while single_flight_shared.value() - shared < callers - 1:
+            pass
+
+        release.set()
+        results = [leader.result(), *(f.result() for f in followers)]
+
+    assert calls == [1]
+    assert results == [b'body'] * callers
+    assert not len(flight)
+
+
+def test_calls_after_completion_run_again():
+    flight = SingleFlight()
+    calls = []
+
+    def load():
+        calls.append(1)
+        return len(calls)
+
+    assert flight.do('user:1', load) == 1
+    assert flight.do('user:1', load) == len(calls)
+    assert flight.do('user:2', load) == len(calls)
+
+
+def test_errors_are_raised_and_not_remembered():
+    flight = SingleFlight()
+
+    def fail():
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        flight.do('user:1', fail)
+
+    assert flight.do('user:1', lambda: b'body') == b'body'
+
+
+def test_disabled_flight_calls_through():
+    flight = SingleFlight(enabled=False)
+
+    assert flight.do('user:1', lambda: b'body') == b'body'
+    assert not len(flight)
+
+
+def test_async_concurrent_calls_share_one_execution():
+    flight = AsyncSingleFlight()
+    callers = 8
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return b'body'
+
+    async def burst():
+        return await asyncio.gather(
+            *(flight.do('user:1', load) for _ in range(callers))
+        )
+
+    assert asyncio.run(burst()) == [b'body'] * callers
+    assert calls == [1]
+    assert not len(flight)
+
+
+def test_async_cancelled_leader_does_not_cancel_followers():
+    flight = AsyncSingleFlight()
+
+    async def load():
+        await asyncio.sleep(0.01)
+        return b'body'
+
+    async def burst():
+        leader = asyncio.ensure_future(flight.do('user:1', load))
+        follower = asyncio.ensure_future(flight.do('user:1', load))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        return await follower, leader.cancelled()
+
+    assert asyncio.run(burst()) == (b'body', True)
+
+
+def test_cursor_pages_ignore_the_offset():
+    assert users_page_key(10, 5, 'abc') == users_page_key(10, 0, 'abc')
+    assert users_page_key(10, 5, None) != users_page_key(10, 0, None)
+
+
+class ClosedSession:
+    # Stands in for a request session that its teardown already closed.
+    def __init__(self, bind):
+        self.bind = bind
+
+    @staticmethod
+    async def execute(*args, **kwargs):
+        raise RuntimeError('The leader session is closed')
+
+
+def test_async_followers_survive_a_cancelled_leader(tmp_path):
+    database_url = f'sqlite:///{tmp_path / "flight.db"}'
+    engine = create_engine(database_url)
+    table_registry.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.add(UserFactory())
+        session.commit()
+
+    async_engine = create_async_engine(
+        get_async_url(database_url), poolclass=NullPool
+    )
+    request = Request({'type': 'http', 'method': 'GET', 'headers': []})
+
+    async def burst():
+        leader = asyncio.ensure_future(
+            async_users.get_user(1, request, ClosedSession(async_engine))
+        )
+        follower = asyncio.ensure_future(
+            async_users.get_user(1, request, ClosedSession(async_engine))
+        )
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        return await follower
+
+    response = asyncio.run(burst())
+
+    assert response.status_code == HTTPStatus.OK
+    assert json.loads(response.body)['id'] == 1
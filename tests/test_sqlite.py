@@ -0,0 +1,102 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine, func, insert, select
+
+from fast_api_todo.models import User, table_registry
+from fast_api_todo.settings import Settings
+from fast_api_todo.sqlite import (
+    WriterSession,
+    apply_pragmas,
+    is_sqlite_file,
+    sqlite_pragmas,
+    use_immediate_transactions,
+)
+
+
+def profiled_engines(path):
+    url = f'sqlite:///{path}'
+    pragmas = sqlite_pragmas(Settings())  # type: ignore
+    reader = create_engine(url)
+    writer = create_engine(url, pool_size=1, max_overflow=0)
+    use_immediate_transactions(writer)
+
+    for engine in (reader, writer):
+        apply_pragmas(engine, pragmas)
+
+    table_registry.metadata.create_all(writer)
+
+    return reader, writer
+
+
+def test_is_sqlite_file():
+    assert is_sqlite_file('sqlite:///database.db')
+    assert not is_sqlite_file('sqlite://')
+    assert not is_sqlite_file('sqlite:///:memory:')
+    assert not is_sqlite_file('postgresql://localhost/todo')
+
+
+def test_pragmas_are_applied_on_connect(tmp_path):
+    reader, _ = profiled_engines(tmp_path / 'profile.db')
+
+    with reader.connect() as connection:
+        journal_mode = connection.exec_driver_sql('PRAGMA journal_mode')
+        busy_timeout = connection.exec_driver_sql('PRAGMA busy_timeout')
+
+        assert journal_mode.scalar() == 'wal'
+        assert busy_timeout.scalar() == Settings().SQLITE_BUSY_TIMEOUT_MS  # type: ignore
+
+
+def test_writer_session_reads_from_the_pool_until_it_writes(tmp_path):
+    reader, writer = profiled_engines(tmp_path / 'profile.db')
+
+    with WriterSession(writer, reader) as session:
+        assert session.get_bind(clause=select(User.id)) is reader
+
+        session.execute(
+            insert(User).values(username='a', email='a@a.com', password='x')
+        )
+        own_write = session.scalar(select(func.count(User.id)))
+        session.commit()
+
+        assert own_write == 1
+        assert session.get_bind(clause=select(User.id)) is reader
+
+
+def test_bind_lookups_do_not_count_as_writes(tmp_path):
+    reader, writer = profiled_engines(tmp_path / 'profile.db')
+
+    with WriterSession(writer, reader) as session:
+        assert session.get_bind() is writer
+        assert session.get_bind(clause=select(User.id)) is reader
+        assert session.get_bind(clause=select(User.id).with_for_update()) is (
+            writer
+        )
+        assert session.get_bind(clause=select(User.id)) is writer
+
+
+def test_primary_reads_use_the_pool(tmp_path):
+    reader, writer = profiled_engines(tmp_path / 'profile.db')
+    query = select(User.id).execution_options(primary=True)
+
+    with WriterSession(writer, reader) as session:
+        assert session.get_bind(clause=query) is reader
+
+
+def test_concurrent_writes_are_serialized(tmp_path):
+    reader, writer = profiled_engines(tmp_path / 'profile.db')
+    writes = 200
+
+    def create(n):
+        with WriterSession(writer, reader) as session:
+            session.execute(
+                insert(User).values(
+                    username=f'user{n}', email=f'user{n}@a.com', password='x'
+                )
+            )
+            session.commit()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(create, range(writes)))
+
+    with WriterSession(writer, reader) as session:
+        assert session.scalar(select(func.count(User.id))) == writes
@@ -0,0 +1,251 @@
+from http import HTTPStatus
+
+from sqlalchemy import select
+
+from fast_api_todo.models import Todo, TodoState
+from fast_api_todo.routers.todos import TODO_COLUMNS
+from tests.conftest import TodoFactory
+
+
+def auth(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_create_todo(client, token):
+    response = client.post(
+        '/todos/',
+        headers=auth(token),
+        json={
+            'title': 'Test todo',
+            'description': 'Test todo description',
+            'state': 'draft',
+        },
+    )
+
+    data = response.json()
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert data['id'] == 1
+    assert data['title'] == 'Test todo'
+    assert data['state'] == 'draft'
+    assert 'created_at' in data
+
+
+def test_list_todos_should_return_5_todos(session, client, user, token):
+    expected_todos = 5
+    session.add_all(TodoFactory.build_batch(5, user_id=user.id))
+    session.commit()
+
+    response = client.get('/todos/', headers=auth(token))
+
+    assert len(response.json()['todos']) == expected_todos
+    assert 'next_cursor' not in response.json()
+
+
+def test_list_todos_only_returns_own_todos(
+    session, client, user, other_user, token
+):
+    session.add_all(TodoFactory.build_batch(2, user_id=other_user.id))
+    session.commit()
+
+    response = client.get('/todos/', headers=auth(token))
+
+    assert response.json() == {'todos': []}
+
+
+def test_list_todos_pagination_with_cursor(session, client, user, token):
+    session.add_all(TodoFactory.build_batch(5, user_id=user.id))
+    session.commit()
+
+    first_page = client.get(
+        '/todos/', headers=auth(token), params={'limit': 3}
+    ).json()
+    second_page = client.get(
+        '/todos/',
+        headers=auth(token),
+        params={'limit': 3, 'cursor': first_page['next_cursor']},
+    ).json()
+
+    assert [todo['id'] for todo in first_page['todos']] == [1, 2, 3]
+    assert [todo['id'] for todo in second_page['todos']] == [4, 5]
+    assert 'next_cursor' not in second_page
+
+
+def test_list_todos_filter_state(session, client, user, token):
+    expected_todos = 3
+    session.add_all(
+        TodoFactory.build_batch(3, user_id=user.id, state=TodoState.draft)
+    )
+    session.add_all(
+        TodoFactory.build_batch(2, user_id=user.id, state=TodoState.done)
+    )
+    session.commit()
+
+    response = client.get(
+        '/todos/', headers=auth(token), params={'state': 'draft'}
+    )
+
+    assert len(response.json()['todos']) == expected_todos
+
+
+def test_list_todos_filter_title_prefix(session, client, user, token):
+    session.add_all([
+        TodoFactory.build(user_id=user.id, title='invoice march'),
+        TodoFactory.build(user_id=user.id, title='Invoice april'),
+        TodoFactory.build(user_id=user.id, title='pay the invoice'),
+        TodoFactory.build(user_id=user.id, title='invoice_%'),
+    ])
+    session.commit()
+
+    response = client.get(
+        '/todos/', headers=auth(token), params={'title': 'invoice_'}
+    )
+
+    assert [todo['title'] for todo in response.json()['todos']] == [
+        'invoice_%'
+    ]
+
+
+def test_list_todos_with_invalid_cursor(client, token):
+    response = client.get(
+        '/todos/', headers=auth(token), params={'cursor': 'invalid'}
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor'}
+
+
+def test_list_todos_query_is_an_index_range_scan(session):
+    query = (
+        select(*TODO_COLUMNS)
+        .where(Todo.user_id == 1, Todo.state == TodoState.todo)
+        .order_by(Todo.created_at, Todo.id)
+        .limit(10)
+    )
+    compiled = query.compile(
+        session.get_bind(), compile_kwargs={'literal_binds': True}
+    )
+
+    plan = session.connection().exec_driver_sql(
+        f'EXPLAIN QUERY PLAN {compiled}'
+    )
+    details = [row[-1] for row in plan]
+
+    assert details == [
+        'SEARCH todos USING INDEX ix_todos_user_id_state '
+        '(user_id=? AND state=?)'
+    ]
+
+
+def test_get_todo(session, client, user, token):
+    todo = TodoFactory(user_id=user.id)
+    session.add(todo)
+    session.commit()
+
+    response = client.get(f'/todos/{todo.id}', headers=auth(token))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['id'] == todo.id
+    assert response.json()['title'] == todo.title
+
+
+def test_get_todo_error(client, token):
+    response = client.get('/todos/10', headers=auth(token))
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Todo not found'}
+
+
+def test_get_other_user_todo(session, client, other_user, token):
+    todo = TodoFactory(user_id=other_user.id)
+    session.add(todo)
+    session.commit()
+
+    response = client.get(f'/todos/{todo.id}', headers=auth(token))
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_patch_todo(session, client, user, token):
+    todo = TodoFactory(user_id=user.id)
+    session.add(todo)
+    session.commit()
+
+    response = client.patch(
+        f'/todos/{todo.id}', headers=auth(token), json={'title': 'test!'}
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['title'] == 'test!'
+    assert response.json()['description'] == todo.description
+
+
+def test_patch_todo_ignores_nulls(session, client, user, token):
+    todo = TodoFactory(user_id=user.id)
+    session.add(todo)
+    session.commit()
+
+    response = client.patch(
+        f'/todos/{todo.id}',
+        headers=auth(token),
+        json={'title': None, 'state': 'done'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['title'] == todo.title
+    assert response.json()['state'] == 'done'
+
+
+def test_patch_todo_error(client, token):
+    response = client.patch('/todos/10', headers=auth(token), json={})
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Todo not found'}
+
+
+def test_patch_other_user_todo(session, client, other_user, token):
+    todo = TodoFactory(user_id=other_user.id)
+    session.add(todo)
+    session.commit()
+
+    response = client.patch(
+        f'/todos/{todo.id}', headers=auth(token), json={'title': 'test!'}
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_delete_todo(session, client, user, token):
+    todo = TodoFactory(user_id=user.id)
+    session.add(todo)
+    session.commit()
+
+    response = client.delete(f'/todos/{todo.id}', headers=auth(token))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'message': 'Todo deleted'}
+
+
+def test_delete_todo_error(client, token):
+    response = client.delete('/todos/10', headers=auth(token))
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json() == {'detail': 'Todo not found'}
+
+
+def test_deleting_a_user_deletes_their_todos(session, client, user, token):
+    session.add(TodoFactory(title='secret', user_id=user.id))
+    session.commit()
+    client.delete(f'/users/{user.id}', headers=auth(token))
+    client.post(
+        '/users/',
+        json={'username': 'bob', 'email': 'bob@b.com', 'password': 'secret'},
+    )
+    bob_token = client.post(
+        '/auth/token', data={'username': 'bob@b.com', 'password': 'secret'}
+    ).json()['access_token']
+
+    response = client.get('/todos/', headers=auth(bob_token))
+
+    assert session.scalars(select(Todo)).all() == []
+    assert response.json()['todos'] == []
@@ -1,6 +1,20 @@
+import csv
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPStatus
 
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.orm import Session
+
+from fast_api_todo.app import app
+from fast_api_todo.database import get_session
+from fast_api_todo.models import User, table_registry
+from fast_api_todo.response_cache import invalidate_users
+from fast_api_todo.routers import users
 from fast_api_todo.schemas import UserPublicSchema
+from tests.conftest import UserFactory
 
 
 def test_create_user(client):
@@ -187,3 +201,343 @@ def test_delete_another_user(client, user, token):
 
     assert response.status_code == HTTPStatus.FORBIDDEN
     assert response.json() == {'detail': 'Not enough permission'}
+
+
+def test_get_users_with_cursor(client, session):
+    session.add_all(UserFactory.build_batch(3))
+    session.commit()
+
+    first_page = client.get('/users/', params={'limit': 2}).json()
+    second_page = client.get(
+        '/users/', params={'limit': 2, 'cursor': first_page['next_cursor']}
+    ).json()
+
+    assert [user['id'] for user in first_page['users']] == [1, 2]
+    assert [user['id'] for user in second_page['users']] == [3]
+    assert 'next_cursor' not in second_page
+
+
+def test_get_users_with_invalid_cursor(client):
+    response = client.get('/users/', params={'cursor': 'invalid'})
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Invalid cursor'}
+
+
+def test_get_users_limit_is_bounded(client):
+    response = client.get('/users/', params={'limit': 1000})
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_export_users_as_ndjson(client, user, other_user):
+    response = client.get('/users/export')
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert [(line['id'], line['email']) for line in lines] == [
+        (user.id, user.email),
+        (other_user.id, other_user.email),
+    ]
+    assert set(lines[0]) == {'id', 'username', 'email', 'created_at'}
+
+
+def test_export_users_as_csv(client, user):
+    response = client.get('/users/export', params={'format': 'csv'})
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/csv')
+    assert rows[0] == ['id', 'username', 'email', 'created_at']
+    assert rows[1][:3] == [str(user.id), user.username, user.email]
+
+
+def test_update_user_with_a_username_existent(client, user, other_user, token):
+    response = client.put(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'username': other_user.username,
+            'email': 'new@example.com',
+            'password': 'test2',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Username already existis'}
+
+
+def test_update_user_with_a_email_existent(client, user, other_user, token):
+    response = client.put(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'username': user.username,
+            'email': other_user.email,
+            'password': 'test2',
+        },
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Email already existis'}
+
+
+def test_concurrent_signups_are_rejected_without_errors(tmp_path):
+    signups = 8
+    engine = create_engine(
+        f'sqlite:///{tmp_path / "signups.db"}',
+        connect_args={'check_same_thread': False},
+    )
+    table_registry.metadata.create_all(engine)
+    statements = []
+    event.listen(
+        engine,
+        'before_cursor_execute',
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    def get_session_override():
+        with Session(engine) as session:
+            yield session
+
+    def signup(n):
+        return client.post(
+            '/users/',
+            json={
+                'username': 'race',
+                'email': f'race{n}@example.com',
+                'password': 'race',
+            },
+        )
+
+    app.dependency_overrides[get_session] = get_session_override
+
+    with TestClient(app) as client, ThreadPoolExecutor(signups) as pool:
+        responses = list(pool.map(signup, range(signups)))
+
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+    assert sorted(response.status_code for response in responses) == [
+        HTTPStatus.CREATED
+    ] + [HTTPStatus.BAD_REQUEST] * (signups - 1)
+    assert sum(s.startswith('INSERT') for s in statements) == signups
+
+
+def test_create_user_issues_a_single_statement(client, assert_num_queries):
+    with assert_num_queries(1) as statements:
+        response = client.post(
+            '/users/',
+            json={
+                'username': 'test',
+                'email': 'test@example.com',
+                'password': 'test',
+            },
+        )
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert 'RETURNING' in statements[0]
+
+
+def test_update_user_issues_a_single_update_statement(
+    client, user, token, assert_num_queries
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/todos/', headers=headers)
+    url = f'/users/{user.id}'
+    writes = 2
+
+    with assert_num_queries(writes) as statements:
+        response = client.put(
+            url,
+            headers=headers,
+            json={
+                'username': 'test2',
+                'email': 'test2@example.com',
+                'password': 'test2',
+            },
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert statements[0].startswith('UPDATE')
+    assert statements[1].startswith('DELETE FROM refresh_tokens')
+
+
+def test_get_user_is_served_from_the_response_cache(
+    client, user, assert_num_queries
+):
+    first = client.get(f'/users/{user.id}')
+
+    with assert_num_queries(0):
+        second = client.get(f'/users/{user.id}')
+
+    assert second.json() == first.json()
+    assert second.headers['etag'] == first.headers['etag']
+
+
+def test_get_user_with_matching_etag_returns_not_modified(client, user):
+    etag = client.get(f'/users/{user.id}').headers['etag']
+
+    response = client.get(
+        f'/users/{user.id}', headers={'If-None-Match': f'"other", W/{etag}'}
+    )
+
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.headers['etag'] == etag
+    assert not response.content
+
+
+def test_get_users_with_stale_etag_returns_the_page(client, user):
+    response = client.get('/users/', headers={'If-None-Match': '"stale"'})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['users'][0]['id'] == user.id
+
+
+def test_create_user_invalidates_cached_pages(client, user):
+    client.get('/users/')
+
+    client.post(
+        '/users/',
+        json={
+            'username': 'new',
+            'email': 'new@example.com',
+            'password': 'secret',
+        },
+    )
+    response = client.get('/users/')
+
+    assert [user['username'] for user in response.json()['users']] == [
+        user.username,
+        'new',
+    ]
+
+
+def test_update_user_invalidates_cached_user(client, user, token):
+    etag = client.get(f'/users/{user.id}').headers['etag']
+    client.get('/users/')
+
+    client.put(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={
+            'username': 'renamed',
+            'email': 'renamed@example.com',
+            'password': 'secret',
+        },
+    )
+    detail = client.get(f'/users/{user.id}', headers={'If-None-Match': etag})
+    page = client.get('/users/')
+
+    assert detail.status_code == HTTPStatus.OK
+    assert detail.json()['username'] == 'renamed'
+    assert page.json()['users'][0]['username'] == 'renamed'
+
+
+def test_update_during_a_read_does_not_leave_a_stale_cache(
+    session, client, user, monkeypatch
+):
+    user_id, username = user.id, user.username
+    render = users.public_user
+
+    def render_while_an_update_commits(row):
+        session.execute(
+            update(User).where(User.id == user_id).values(username='renamed')
+        )
+        session.commit()
+        invalidate_users(user_id)
+
+        return render(row)
+
+    monkeypatch.setattr(users, 'public_user', render_while_an_update_commits)
+    raced = client.get(f'/users/{user_id}')
+    monkeypatch.setattr(users, 'public_user', render)
+    response = client.get(f'/users/{user_id}')
+
+    assert raced.json()['username'] == username
+    assert response.json()['username'] == 'renamed'
+
+
+def test_delete_user_invalidates_cached_user(client, user, token):
+    client.get(f'/users/{user.id}')
+
+    client.delete(
+        f'/users/{user.id}', headers={'Authorization': f'Bearer {token}'}
+    )
+    response = client.get(f'/users/{user.id}')
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_patch_user_skips_hashing_without_a_password(
+    client, user, token, assert_num_queries, monkeypatch
+):
+    headers = {'Authorization': f'Bearer {token}'}
+    client.get('/todos/', headers=headers)
+    monkeypatch.setattr(users, 'get_password_hash', None)
+    url = f'/users/{user.id}'
+
+    with assert_num_queries(1) as statements:
+        response = client.patch(
+            url, headers=headers, json={'username': 'renamed'}
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'id': user.id,
+        'username': 'renamed',
+        'email': user.email,
+    }
+    assert statements[0].startswith('UPDATE users SET username=')
+    assert 'password' not in statements[0].split('RETURNING')[0]
+
+
+def test_patch_user_hashes_a_new_password(client, user, token):
+    response = client.patch(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'password': 'new-password'},
+    )
+
+    login = client.post(
+        '/auth/token',
+        data={'username': user.email, 'password': 'new-password'},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert login.status_code == HTTPStatus.OK
+
+
+def test_patch_user_without_changes_returns_the_user(client, user, token):
+    response = client.patch(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'username': None},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['username'] == user.username
+
+
+def test_patch_another_user(client, other_user, token):
+    response = client.patch(
+        f'/users/{other_user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'username': 'renamed'},
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_patch_user_with_a_email_existent(client, user, other_user, token):
+    response = client.patch(
+        f'/users/{user.id}',
+        headers={'Authorization': f'Bearer {token}'},
+        json={'email': other_user.email},
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == {'detail': 'Email already existis'}